@@ -0,0 +1,165 @@
+"""
+@package base
+
+Trio facade over the blocking page objects.
+
+A WebDriver session executes one command at a time, so real concurrency comes
+from separate sessions (one per actor, e.g. teacher and admin) or from the
+browser itself loading several tabs in parallel. Every blocking call runs in a
+worker thread; calls on the same session are serialized by a per-session lock
+and always run against the tab the page object was opened in.
+
+Example:
+    teacher = AsyncBrowser(self.driver, self.base_url).page(TeacherSignPage)
+    admin = AsyncBrowser(admin_driver, self.base_url).page(AdminLoginPage)
+    run_concurrently(lambda: teacher.teacher_join(...),
+                     lambda: admin.admin_login("admin", "admin"))
+"""
+import functools
+import time
+import logging
+import trio
+from selenium.webdriver.support import expected_conditions as EC
+
+log = logging.getLogger(__name__)
+
+class AsyncBrowser:
+    """One WebDriver session. Hands out AsyncPage objects bound to a tab of this session."""
+
+    def __init__(self, driver, base_url):
+        self.driver = driver
+        self.base_url = base_url
+        self._lock = trio.Lock()
+        self._current_handle = None
+
+    def page(self, page_class, window_handle=None):
+        """Wraps a new page object of page_class. Defaults to the tab that is active right now."""
+        handle = window_handle or self.driver.current_window_handle
+        if self._current_handle is None:
+            self._current_handle = self.driver.current_window_handle
+        return AsyncPage(self, page_class(self.driver, self.base_url), handle)
+
+    async def run(self, func, *args, window_handle=None, **kwargs):
+        """Runs a blocking call in a worker thread while holding this session's lock."""
+        async with self._lock:
+            return await trio.to_thread.run_sync(
+                functools.partial(self._run_in_tab, func, window_handle, *args, **kwargs))
+
+    def _run_in_tab(self, func, window_handle, *args, **kwargs):
+        if window_handle and window_handle != self._current_handle:
+            self.driver.switch_to.window(window_handle)
+            self._current_handle = window_handle
+        return func(*args, **kwargs)
+
+    async def open_tab(self, url):
+        """Opens url in a new tab without waiting for it to load. Returns the tab's window handle."""
+        def _open():
+            known = set(self.driver.window_handles)
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            return next(h for h in self.driver.window_handles if h not in known)
+        return await self.run(_open)
+
+    async def close_tab(self, window_handle):
+        def _close():
+            self.driver.switch_to.window(window_handle)
+            self.driver.close()
+            remaining = self.driver.window_handles
+            if remaining:
+                self.driver.switch_to.window(remaining[0])
+                self._current_handle = remaining[0]
+        await self.run(_close)
+
+    async def fan_out(self, paths, check, page_class=None):
+        """
+        Read-only checks across tabs. All paths are opened at once so the browser
+        loads them in parallel; then check(page) runs in each tab in turn.
+
+        Args:
+            paths (list): Paths relative to base_url.
+            check (callable): Blocking function taking the page object for that tab.
+            page_class: Page object class to wrap each tab with (default: SeleniumDriver).
+
+        Returns:
+            dict: {path: result of check}
+        """
+        if page_class is None:
+            from base.selenium_driver import SeleniumDriver
+            page_class = SeleniumDriver
+
+        start_time = time.time()
+        handles = {}
+        for path in paths:
+            handles[path] = await self.open_tab(self.base_url + path)
+
+        results = {}
+        try:
+            for path, handle in handles.items():
+                tab = AsyncPage(self, page_class(self.driver, self.base_url), handle)
+                await tab.wait_for_page_load()
+                results[path] = await tab.run(check, tab.page)
+        finally:
+            for handle in handles.values():
+                await self.close_tab(handle)
+        log.info(f"Fan-out of {len(paths)} read-only checks finished in {time.time() - start_time:.2f} seconds.")
+        return results
+
+
+class AsyncPage:
+    """
+    Async view of one page object in one tab. The common actions are explicit;
+    any other page-object method is available as an awaitable with the same name,
+    e.g. await page.teacher_join(...).
+    """
+
+    def __init__(self, browser, page, window_handle):
+        self.browser = browser
+        self.page = page
+        self.window_handle = window_handle
+
+    async def run(self, func, *args, **kwargs):
+        return await self.browser.run(func, *args, window_handle=self.window_handle, **kwargs)
+
+    async def goto(self, path=""):
+        await self.run(self.page.driver.get, self.page.base_url + path)
+
+    async def click(self, locator, locatorType="id", **kwargs):
+        return await self.run(self.page.click_element, locator, locatorType, **kwargs)
+
+    async def fill(self, data, locator, locatorType="id", **kwargs):
+        return await self.run(self.page.send_keys_element, data, locator, locatorType, **kwargs)
+
+    async def wait_for(self, locator, locatorType="id", timeout=10, condition=EC.visibility_of_element_located):
+        return await self.run(self.page.get_element, locator, locatorType, timeout=timeout, condition=condition)
+
+    async def wait_for_page_load(self, timeout=30):
+        return await self.run(self.page.wait_for_page_load, timeout)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.page, name)
+        if not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+        return call
+
+
+def run_concurrently(*actors):
+    """
+    Blocking entry point for tests: runs each actor (a zero-argument callable returning
+    a coroutine) concurrently and returns their results in the same order.
+    """
+    results = [None] * len(actors)
+
+    async def _actor(index, actor):
+        start_time = time.time()
+        results[index] = await actor()
+        log.info(f"Actor {index} finished in {time.time() - start_time:.2f} seconds.")
+
+    async def _main():
+        async with trio.open_nursery() as nursery:
+            for index, actor in enumerate(actors):
+                nursery.start_soon(_actor, index, actor)
+
+    trio.run(_main)
+    return results
@@ -0,0 +1,271 @@
+"""
+@package base
+
+WebDriver BiDi wait backend (--wait-backend bidi).
+
+Classic waits poll: WebDriverWait re-checks the condition every pollFrequency
+(0.5 s) over HTTP, so a condition is seen on average a quarter of a second
+after the page got there. The BiDi backend re-checks it when the browser says
+something changed instead. For each session it opens the BiDi websocket
+(the "webSocketUrl" capability, requested by WebDriverFactory) and subscribes to:
+
+  browsingContext.navigationStarted / domContentLoaded / load   navigation completion
+  browsingContext.fragmentNavigated / navigationAborted /
+      navigationFailed / contextDestroyed                        navigations that never load
+  network.beforeRequestSent / responseCompleted / fetchError     in-flight requests
+  log.entryAdded                                                 console and JS errors
+  script.message                                                 DOM changes (BIDI_DOM_CHANNEL_JS)
+
+A preload script posts to a channel after every DOM mutation, input event or
+finished transition. Each event bumps a version counter, and waiting threads
+wake up and re-evaluate their expected condition at once. A wait still re-checks
+every pollFrequency when nothing arrives, so a missed event cannot make it
+slower than polling.
+
+Console errors go to the log, and to the ConsoleCollector when --console-errors
+is on and the session has no DevTools listener of its own (Firefox), so no
+error is counted twice. The session is closed when its driver quits.
+
+Example:
+    pytest src/tests --wait-backend bidi
+    python src/benchmarks/run_benchmarks.py --label bidi --wait-backend bidi
+"""
+import itertools
+import json
+import logging
+import threading
+import time
+import websocket
+from selenium.common.exceptions import TimeoutException
+from base.js_locators import BIDI_DOM_CHANNEL_JS
+from utilities.console_collector import page_key
+
+log = logging.getLogger(__name__)
+
+DOM_CHANNEL = "qa-dom"
+
+_EVENTS = [
+    "browsingContext.navigationStarted",
+    "browsingContext.domContentLoaded",
+    "browsingContext.load",
+    "browsingContext.fragmentNavigated",
+    "browsingContext.navigationAborted",
+    "browsingContext.navigationFailed",
+    "browsingContext.contextDestroyed",
+    "network.beforeRequestSent",
+    "network.responseCompleted",
+    "network.fetchError",
+    "log.entryAdded",
+    "script.message",
+]
+
+
+class BidiSession:
+
+    # WebDriver session id -> BidiSession, or False when the session has no usable BiDi endpoint
+    _sessions = {}
+    _sessions_lock = threading.Lock()
+
+    # Called with a ConsoleCollector record for every console/JS error (set by conftest with --console-errors)
+    console_sink = None
+
+    def __init__(self, url, session_id, command_timeout=10):
+        self.url = url
+        self.session_id = session_id
+        self.command_timeout = command_timeout
+        self.connected = False
+        self.version = 0
+        self.navigations = {}       # context -> URL of the navigation that has not loaded yet
+        self.inflight = {}          # request id -> start time
+        self.last_network_activity = time.monotonic()
+        self.context_urls = {}
+        self.console_errors = []
+        self.stats = {"events": 0, "dom_messages": 0, "wakeups": 0, "checks": 0}
+        self._changed = threading.Condition()
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._send_lock = threading.Lock()
+        self._socket = None
+
+    @classmethod
+    def for_driver(cls, driver):
+        """The driver's BiDi session, opened on first use. None if the session was started without BiDi."""
+        with cls._sessions_lock:
+            session = cls._sessions.get(driver.session_id)
+            if session is False:
+                return None
+            if session is not None and session.connected:
+                return session
+            url = (driver.capabilities or {}).get("webSocketUrl")
+            if not isinstance(url, str):
+                log.warning(f"Session {driver.session_id} has no BiDi websocket; waits fall back to polling.")
+                cls._sessions[driver.session_id] = False
+                return None
+            session = cls(url, driver.session_id)
+            try:
+                session.start()
+            except Exception as e:
+                log.warning(f"Could not open BiDi session on {url}, waits fall back to polling: {e}")
+                cls._sessions[driver.session_id] = False
+                return None
+            cls._sessions[driver.session_id] = session
+            return session
+
+    @classmethod
+    def release(cls, session_id):
+        """Closes and forgets the BiDi session of a WebDriver session. Call it before the driver quits."""
+        with cls._sessions_lock:
+            session = cls._sessions.pop(session_id, None)
+        if session:
+            session.close()
+            log.debug(f"BiDi session of {session_id} closed: {session.stats}")
+
+    def start(self):
+        self._socket = websocket.create_connection(self.url, timeout=self.command_timeout, suppress_origin=True)
+        self._socket.settimeout(None)
+        self.connected = True
+        threading.Thread(target=self._read, name=f"bidi-{self.session_id[:8]}", daemon=True).start()
+        self.send("session.subscribe", {"events": _EVENTS})
+        channel = {"type": "channel", "value": {"channel": DOM_CHANNEL}}
+        self.send("script.addPreloadScript", {"functionDeclaration": BIDI_DOM_CHANNEL_JS, "arguments": [channel]})
+        # The preload script only runs in new documents; start the channel in the open ones too
+        for context in self.send("browsingContext.getTree", {}).get("contexts", []):
+            self.context_urls[context["context"]] = context.get("url")
+            self.send("script.callFunction", {"functionDeclaration": BIDI_DOM_CHANNEL_JS, "awaitPromise": False,
+                                              "target": {"context": context["context"]}, "arguments": [channel]})
+        log.info(f"BiDi wait backend connected for session {self.session_id}")
+
+    def send(self, method, params):
+        """Sends a BiDi command and returns its result. Raises RuntimeError on an error response."""
+        command_id = next(self._ids)
+        waiter = [threading.Event(), None]
+        self._pending[command_id] = waiter
+        with self._send_lock:
+            self._socket.send(json.dumps({"id": command_id, "method": method, "params": params}))
+        if not waiter[0].wait(self.command_timeout):
+            self._pending.pop(command_id, None)
+            raise RuntimeError(f"BiDi command {method} got no response within {self.command_timeout} seconds")
+        message = waiter[1]
+        if message.get("type") == "error":
+            raise RuntimeError(f"BiDi command {method} failed: {message.get('error')}: {message.get('message')}")
+        return message.get("result") or {}
+
+    def _read(self):
+        try:
+            while True:
+                message = json.loads(self._socket.recv())
+                if "id" in message and message.get("type") in ("success", "error"):
+                    waiter = self._pending.pop(message["id"], None)
+                    if waiter:
+                        waiter[1] = message
+                        waiter[0].set()
+                elif message.get("type") == "event":
+                    self._on_event(message["method"], message.get("params", {}))
+        except Exception as e:
+            log.debug(f"BiDi connection of session {self.session_id} closed: {e}")
+        finally:
+            self.connected = False
+            with self._changed:
+                self.version += 1
+                self._changed.notify_all()
+
+    def _on_event(self, method, params):
+        context = params.get("context") or (params.get("source") or {}).get("context")
+        if method == "browsingContext.navigationStarted":
+            self.navigations[context] = params.get("url")
+        elif method in ("browsingContext.load", "browsingContext.fragmentNavigated"):
+            self.navigations.pop(context, None)
+            self.context_urls[context] = params.get("url")
+        elif method in ("browsingContext.navigationAborted", "browsingContext.navigationFailed"):
+            # Downloads, 204 responses and interrupted navigations never fire load
+            self.navigations.pop(context, None)
+        elif method == "browsingContext.contextDestroyed":
+            self._forget_context(params)
+        elif method == "browsingContext.domContentLoaded":
+            self.context_urls[context] = params.get("url")
+        elif method == "network.beforeRequestSent":
+            self.inflight[params["request"]["request"]] = time.monotonic()
+            self.last_network_activity = time.monotonic()
+        elif method in ("network.responseCompleted", "network.fetchError"):
+            self.inflight.pop(params["request"]["request"], None)
+            self.last_network_activity = time.monotonic()
+        elif method == "script.message":
+            if params.get("channel") != DOM_CHANNEL:
+                return
+            self.stats["dom_messages"] += 1
+        elif method == "log.entryAdded":
+            self._on_log_entry(params, context)
+        with self._changed:
+            self.stats["events"] += 1
+            self.version += 1
+            self._changed.notify_all()
+
+    def _forget_context(self, info):
+        """Drops a closed context (tab, window, frame) and its children from the navigation bookkeeping."""
+        self.navigations.pop(info.get("context"), None)
+        self.context_urls.pop(info.get("context"), None)
+        for child in info.get("children") or []:
+            self._forget_context(child)
+
+    def _on_log_entry(self, params, context):
+        level = params.get("level")
+        if level not in ("error", "warn"):
+            return
+        page_url = self.context_urls.get(context)
+        frames = (params.get("stackTrace") or {}).get("callFrames") or [{}]
+        record = {"ts": round(time.time(), 3), "kind": "exception" if params.get("type") == "javascript" else "console",
+                  "level": "warning" if level == "warn" else level, "text": (params.get("text") or "")[:500],
+                  "page": page_key(page_url), "url": page_url, "source_url": frames[0].get("url"),
+                  "line": frames[0].get("lineNumber"), "source": params.get("type"), "session": self.session_id}
+        if level == "error":
+            self.console_errors.append(record)
+            del self.console_errors[:-100]
+            log.debug(f"Console error on {record['page']}: {record['text']}")
+        if self.console_sink is not None:
+            self.console_sink(record)
+
+    def wait_until(self, check, timeout, poll_interval=0.5, message=""):
+        """
+        Evaluates check() now and again after every browser event (or every poll_interval
+        if none arrives) until it returns something truthy, which is returned.
+        Raises TimeoutException like WebDriverWait.until.
+        """
+        end_time = time.monotonic() + timeout
+        while True:
+            with self._changed:
+                seen_version = self.version
+            self.stats["checks"] += 1
+            value = check()
+            if value:
+                return value
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message or f"Condition not met after {timeout} seconds (BiDi wait).")
+            with self._changed:
+                if self.version == seen_version:
+                    self._changed.wait(min(remaining, poll_interval))
+                if self.version != seen_version:
+                    self.stats["wakeups"] += 1
+
+    def wait_for_load(self, driver, timeout):
+        """True once no navigation is pending and the document is complete; False on timeout."""
+        try:
+            return self.wait_until(lambda: not self.navigations and
+                                   driver.execute_script("return document.readyState") == "complete", timeout)
+        except TimeoutException:
+            return False
+
+    def wait_for_network_idle(self, idle_time, timeout):
+        """True once no request has been in flight for idle_time seconds; False on timeout."""
+        def idle():
+            return not self.inflight and time.monotonic() - self.last_network_activity >= idle_time
+        try:
+            return self.wait_until(idle, timeout, poll_interval=max(idle_time / 2, 0.05))
+        except TimeoutException:
+            return False
+
+    def close(self):
+        try:
+            self._socket.close()
+        except Exception:
+            pass
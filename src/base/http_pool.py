@@ -0,0 +1,111 @@
+"""
+@package base
+
+HTTP connection pool for the WebDriver link (test process -> chromedriver or grid).
+
+Selenium gives every driver its own urllib3 PoolManager. It keeps one
+connection per host (urllib3's default maxsize=1), so concurrent commands open
+extra connections and then discard them ("Connection pool is full"). It uses
+a 120 s timeout for both connecting and reading. Every driver created by
+WebDriverFactory can share one tuned pool instead. With the grid, all
+sessions talk to the same host.
+
+  default  Selenium's own pool (nothing is changed)
+  tuned    one shared pool: keep-alive with TCP keepalive probes, maxsize matched to
+           the number of concurrent sessions (threads wait for a free connection
+           instead of opening and discarding extra ones), a short connect timeout
+           and a read timeout of its own, longer than set_page_load_timeout(30)
+           so the browser's page load error is seen before the client gives up
+
+stats() reports requests, connections opened and reuse per host.
+
+Example:
+    pool = SharedHttpPool(maxsize=4)
+    pool.attach(driver)
+    log.info(pool.stats())
+"""
+import logging
+import socket
+import threading
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry, Timeout
+
+log = logging.getLogger(__name__)
+
+HTTP_POOL_PROFILES = {
+    "default": None,
+    "tuned": {"connect_timeout": 5, "read_timeout": 60},
+}
+
+# TCP keepalive probes so a connection dropped by a grid/load balancer is noticed before it is reused
+_KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _SharedPoolManager(urllib3.PoolManager):
+    """Ignores the clear() each driver's quit() sends; only SharedHttpPool.close() empties it."""
+
+    def clear(self):
+        pass
+
+    def close(self):
+        super().clear()
+
+
+class SharedHttpPool:
+
+    def __init__(self, maxsize=4, connect_timeout=5, read_timeout=60):
+        """
+        Args:
+            maxsize (int): Connections kept per host, i.e. how many sessions may send commands at once.
+            connect_timeout (float): Seconds to open a connection to the driver or grid.
+            read_timeout (float): Seconds to wait for a command's response. Keep it above the
+                page load timeout (30 s), which the browser enforces and reports itself.
+        """
+        self.maxsize = maxsize
+        self.timeout = Timeout(connect=connect_timeout, read=read_timeout)
+        self.manager = _SharedPoolManager(
+            num_pools=16, maxsize=maxsize, block=True, timeout=self.timeout,
+            retries=Retry(total=2, connect=2, read=0, status=0, redirect=3),
+            socket_options=_KEEPALIVE_SOCKET_OPTIONS)
+        self._lock = threading.Lock()
+        self.attached = 0
+
+    @classmethod
+    def from_profile(cls, name, maxsize):
+        """SharedHttpPool for a HTTP_POOL_PROFILES entry, or None for "default"."""
+        settings = HTTP_POOL_PROFILES[name]
+        return None if settings is None else cls(maxsize=maxsize, **settings)
+
+    def attach(self, driver):
+        """Sends the driver's commands through the shared pool from now on."""
+        connection = driver.command_executor
+        own_pool = getattr(connection, "_conn", None)
+        connection._conn = self.manager
+        connection.client_config.keep_alive = True
+        # Passed with every request, so it overrides the 120 s Selenium puts there
+        connection.client_config.timeout = self.timeout
+        if own_pool is not None and own_pool is not self.manager:
+            own_pool.clear()
+        with self._lock:
+            self.attached += 1
+        return driver
+
+    def stats(self):
+        """{host:port: {"requests", "connections", "idle", "reuse_pct"}} over the pool's lifetime."""
+        stats = {}
+        for key in list(self.manager.pools.keys()):
+            pool = self.manager.pools.get(key)
+            if pool is None:
+                continue
+            requests = pool.num_requests
+            stats[f"{pool.host}:{pool.port}"] = {
+                "requests": requests,
+                "connections": pool.num_connections,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+                "reuse_pct": round((1 - pool.num_connections / requests) * 100, 1) if requests else 0.0,
+            }
+        return stats
+
+    def close(self):
+        self.manager.close()
@@ -0,0 +1,207 @@
+"""
+@package base
+
+Journeys: multi-step flows (wizards, sign-up and add forms) described as data and
+run with as few WebDriver round trips as possible.
+
+Each step is a list of actions plus the locator that shows the step is over
+(the next step's first field, a success message). A step runs as:
+  1. file uploads, each through send_keys_element (a file input cannot be set from script)
+  2. every fill/select/click in one execute_script call (JOURNEY_STEP_JS)
+  3. one transition wait for the step's wait_for locator
+If the batched script cannot find or use an element, or the transition does not
+happen while the step is still on screen, the step is replayed element by element
+through the usual SeleniumDriver calls, with their waits, retries and screenshots.
+
+Commands and time are recorded per step (journey.report, the event log and the log).
+
+Example:
+    journey = Journey(page, "teacher_join", [
+        Step("basic info", [fill(page._email_input, "xpath", email),
+                            click(page._next_teacher_info_butt, "xpath")],
+             wait_for=(page._year_of_experince_input, "xpath")),
+        ...
+    ])
+    journey.run()            # False when a step fails
+    journey.run_or_raise()   # TimeoutException naming the failed step, for page methods
+"""
+import logging
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
+from base.js_locators import JOURNEY_STEP_JS
+import utilities.event_log as event_log
+
+log = logging.getLogger(__name__)
+
+
+def fill(locator, locatorType, value):
+    return ("fill", locator, locatorType, value)
+
+
+def select(locator, locatorType, visible_text):
+    return ("select", locator, locatorType, visible_text)
+
+
+def click(locator, locatorType):
+    return ("click", locator, locatorType, None)
+
+
+def upload(locator, locatorType, path):
+    return ("upload", locator, locatorType, path)
+
+
+class Step:
+
+    def __init__(self, name, actions, wait_for=None, timeout=10):
+        """
+        Args:
+            name (str): Shown in the report.
+            actions (list): fill/select/click/upload tuples, performed in order (uploads first).
+            wait_for (tuple): (locator, locatorType) that becomes visible once the step is done.
+            timeout (int): Seconds to wait for wait_for.
+        """
+        self.name = name
+        self.actions = actions
+        self.wait_for = wait_for
+        self.timeout = timeout
+
+
+class _CommandCounter:
+    """Counts driver.execute calls while active (WebElement calls go through it too)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+
+    def __enter__(self):
+        self._execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return self._execute(driver_command, params)
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, *exc_info):
+        self.driver.execute = self._execute
+        return False
+
+
+class Journey:
+
+    def __init__(self, page, name, steps):
+        self.page = page
+        self.name = name
+        self.steps = steps
+        self.report = []
+
+    def run(self, per_element=False):
+        """
+        Runs every step in order and stops at the first one that fails.
+        per_element=True skips the batched script (used to compare both ways in the benchmarks).
+
+        Returns:
+            bool: True if all steps completed (and their transitions happened).
+        """
+        self.report = []
+        journey_start = time.perf_counter()
+        ok = True
+        for step in self.steps:
+            start_time = time.perf_counter()
+            with _CommandCounter(self.page.driver) as counter:
+                if per_element:
+                    ok, mode = self._run_per_element(step, step.actions), "per-element"
+                else:
+                    ok, mode = self._run_step(step)
+            duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            entry = {"step": step.name, "mode": mode, "commands": counter.count,
+                     "duration_ms": duration_ms, "outcome": "ok" if ok else "fail"}
+            self.report.append(entry)
+            log.info(f"Journey '{self.name}' step '{step.name}': {mode}, {counter.count} commands, "
+                     f"{duration_ms:.0f} ms, {entry['outcome']}")
+            event_log.emit(dict(entry, ts=round(time.time(), 3), test=event_log.current_test_id(),
+                                page=type(self.page).__name__, method=self.name, action="journey_step"))
+            if not ok:
+                break
+
+        total_commands = sum(entry["commands"] for entry in self.report)
+        fallbacks = sum(1 for entry in self.report if entry["mode"] != "batched")
+        log.info(f"Journey '{self.name}': {len(self.report)}/{len(self.steps)} steps, {total_commands} commands, "
+                 f"{time.perf_counter() - journey_start:.2f}s, {fallbacks} step(s) replayed per element")
+        return ok
+
+    def run_or_raise(self, per_element=False):
+        """
+        Runs the journey like run(), but raises TimeoutException naming the step that failed, so
+        page methods surface a broken step where the element-by-element path would raise too.
+        """
+        if not self.run(per_element):
+            failed_step = self.report[-1]["step"] if self.report else None
+            raise TimeoutException(f"Journey '{self.name}' failed at step '{failed_step}'.")
+
+    def _run_step(self, step):
+        """Returns (ok, mode) where mode is "batched" or "per-element"."""
+        for kind, locator, locatorType, data in step.actions:
+            if kind == "upload":
+                self.page.send_keys_element(data, locator, locatorType)
+
+        batched = [action for action in step.actions if action[0] != "upload"]
+        if not self._run_batched(step, batched):
+            return self._run_per_element(step, batched), "per-element"
+        if self._transition_done(step):
+            return True, "batched"
+
+        # The script ran but the page did not move on (e.g. a handler ignored scripted input).
+        # Replay the step only if it is still on screen, so nothing is submitted twice.
+        if batched and self.page.is_element_visible(batched[0][1], batched[0][2], timeout=1):
+            log.warning(f"Journey '{self.name}' step '{step.name}': no transition after the batched run, "
+                        f"replaying it element by element.")
+            return self._run_per_element(step, batched), "per-element"
+        return False, "batched"
+
+    def _run_batched(self, step, actions):
+        if not actions:
+            return True
+        checks = []
+        for kind, locator, locatorType, data in actions:
+            byType = self.page._get_by_type(locatorType)
+            if not byType:
+                return False
+            checks.append([kind, byType, locator, "" if data is None else str(data)])
+        try:
+            result = self.page.driver.execute_script(JOURNEY_STEP_JS, checks)
+        except Exception as e:
+            log.warning(f"Journey '{self.name}' step '{step.name}': batched script failed: {e}")
+            return False
+        if not result or not result.get("ok"):
+            failed = ", ".join(f"{actions[f['index']][1]} ({f['reason']})" for f in (result or {}).get("failed", []))
+            log.info(f"Journey '{self.name}' step '{step.name}': falling back to per-element calls: {failed}")
+            return False
+        return True
+
+    def _transition_done(self, step):
+        if step.wait_for is None:
+            return True
+        return self.page.wait_for_any({"next": step.wait_for}, timeout=step.timeout, visible=True) is not None
+
+    def _run_per_element(self, step, actions):
+        for kind, locator, locatorType, data in actions:
+            if kind in ("fill", "upload"):
+                done = self.page.send_keys_element(str(data), locator, locatorType)
+            elif kind == "click":
+                done = self.page.click_element(locator, locatorType)
+            else:
+                element = self.page.get_element(locator, locatorType, condition=EC.visibility_of_element_located)
+                done = False
+                if element:
+                    try:
+                        Select(element).select_by_visible_text(str(data))
+                        done = True
+                    except Exception as e:
+                        log.error(f"Could not select '{data}' in '{locator}' ({locatorType}): {e}")
+            if not done:
+                log.error(f"Journey '{self.name}' step '{step.name}' failed at {kind} '{locator}' ({locatorType}).")
+                return False
+        return self._transition_done(step)
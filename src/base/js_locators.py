@@ -0,0 +1,447 @@
+"""
+@package base
+
+JavaScript helpers shared by the in-browser checks (locator audit, waits).
+They resolve a Selenium (By, value) pair inside the page so that several
+locators can be evaluated with a single execute_script round trip.
+"""
+from selenium.webdriver.common.by import By
+
+# Defines __qaLocate(by, value) -> Array<Element> and __qaIsVisible(element).
+# The "by" values are the Selenium By constants ("id", "xpath", "css selector", ...).
+LOCATE_JS = """
+function __qaLocate(by, value) {
+    var doc = document;
+    switch (by) {
+        case "%(id)s":
+            return Array.prototype.slice.call(doc.querySelectorAll('[id="' + value.replace(/"/g, '\\\\"') + '"]'));
+        case "%(name)s":
+            return Array.prototype.slice.call(doc.querySelectorAll('[name="' + value.replace(/"/g, '\\\\"') + '"]'));
+        case "%(css)s":
+            return Array.prototype.slice.call(doc.querySelectorAll(value));
+        case "%(classname)s":
+            return Array.prototype.slice.call(doc.getElementsByClassName(value));
+        case "%(xpath)s":
+            var snapshot = doc.evaluate(value, doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case "%(linktext)s":
+        case "%(partiallinktext)s":
+            var links = Array.prototype.slice.call(doc.getElementsByTagName("a"));
+            return links.filter(function (a) {
+                var text = (a.innerText || a.textContent || "").trim();
+                return by === "%(linktext)s" ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+function __qaIsVisible(element) {
+    if (!element || !element.isConnected) { return false; }
+    var style = window.getComputedStyle(element);
+    if (style.visibility === "hidden" || style.display === "none") { return false; }
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+}
+""" % {
+    "id": By.ID,
+    "name": By.NAME,
+    "css": By.CSS_SELECTOR,
+    "classname": By.CLASS_NAME,
+    "xpath": By.XPATH,
+    "linktext": By.LINK_TEXT,
+    "partiallinktext": By.PARTIAL_LINK_TEXT,
+}
+
+# arguments[0]: list of [key, by, value]
+# Returns {key: {count, visible, error}} for every locator in one round trip.
+BATCH_LOCATOR_CHECK_JS = LOCATE_JS + """
+var checks = arguments[0];
+var results = {};
+for (var i = 0; i < checks.length; i++) {
+    var key = checks[i][0];
+    try {
+        var found = __qaLocate(checks[i][1], checks[i][2]);
+        results[key] = {count: found.length, visible: found.filter(__qaIsVisible).length, error: null};
+    } catch (e) {
+        results[key] = {count: 0, visible: 0, error: String(e && e.message || e)};
+    }
+}
+return results;
+"""
+
+# Shared tail for the observer-based waits. The script before it defines check(), timeoutMs
+# and pollMs; check() runs now, on every DOM mutation and on an in-browser interval (for
+# CSS-only changes), and the script resolves with its first non-null result or null at the deadline.
+_OBSERVE_UNTIL_JS = """
+var done = arguments[arguments.length - 1];
+var finished = false, observer = null, timer = null, deadline = null;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(timer);
+    clearTimeout(deadline);
+    done(result);
+}
+function onChange() { var hit = check(); if (hit !== null) { finish(hit); } }
+var first = check();
+if (first !== null) {
+    finish(first);
+} else {
+    observer = new MutationObserver(onChange);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setInterval(onChange, pollMs);
+    deadline = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+# The wait scripts below always take their time budget (ms) as the last argument before the callback.
+
+# arguments: list of [key, by, value], poll interval (ms), require visibility, timeout (ms).
+# Resolves with the key of the first locator that matches, or null.
+WAIT_FOR_ANY_JS = LOCATE_JS + """
+var outcomes = arguments[0], pollMs = arguments[1], requireVisible = arguments[2], timeoutMs = arguments[3];
+function check() {
+    for (var i = 0; i < outcomes.length; i++) {
+        try {
+            var found = __qaLocate(outcomes[i][1], outcomes[i][2]);
+            if (found.length && (!requireVisible || found.some(__qaIsVisible))) { return outcomes[i][0]; }
+        } catch (e) { /* an invalid locator simply never matches */ }
+    }
+    return null;
+}
+""" + _OBSERVE_UNTIL_JS
+
+# arguments: by, value, state ("present" | "visible" | "clickable" | "invisible" | "text"),
+# expected text, poll interval (ms), timeout (ms). Mirrors the expected_conditions semantics:
+# only the first matching element is considered. Resolves with the element (or true for
+# "invisible"), or null when the deadline passes.
+WAIT_FOR_CONDITION_JS = LOCATE_JS + """
+var by = arguments[0], value = arguments[1], state = arguments[2], expectedText = arguments[3];
+var pollMs = arguments[4], timeoutMs = arguments[5];
+function check() {
+    var found;
+    try { found = __qaLocate(by, value); } catch (e) { return null; }
+    var element = found.length ? found[0] : null;
+    switch (state) {
+        case "present":
+            return element;
+        case "visible":
+            return __qaIsVisible(element) ? element : null;
+        case "clickable":
+            return (__qaIsVisible(element) && !element.disabled) ? element : null;
+        case "invisible":
+            return (!element || !__qaIsVisible(element)) ? true : null;
+        case "text":
+            return (element && (element.innerText || element.textContent || "").indexOf(expectedText) !== -1) ? element : null;
+    }
+    return null;
+}
+""" + _OBSERVE_UNTIL_JS
+
+# arguments: timeout (ms). Resolves with true once document.readyState is "complete", or null.
+WAIT_FOR_PAGE_LOAD_JS = """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+if (document.readyState === "complete") {
+    done(true);
+} else {
+    var timer = setTimeout(function () { done(null); }, timeoutMs);
+    window.addEventListener("load", function () { clearTimeout(timer); done(true); });
+}
+"""
+
+# arguments: element, state ("present" | "visible" | "clickable").
+# Returns "detached" when the element left the DOM, otherwise whether it still meets the state.
+CACHED_ELEMENT_STATE_JS = LOCATE_JS + """
+var element = arguments[0], state = arguments[1];
+if (!element || !element.isConnected) { return "detached"; }
+if (state === "present") { return true; }
+if (state === "visible") { return __qaIsVisible(element); }
+if (state === "clickable") { return __qaIsVisible(element) && !element.disabled; }
+return false;
+"""
+
+# Injected into every new document with --no-animations (Page.addScriptToEvaluateOnNewDocument).
+# Turns off CSS transitions/animations and smooth scrolling so elements are at their final
+# position as soon as they are in the DOM, and turns off jQuery effects when the page uses them.
+NO_ANIMATIONS_JS = """
+(function () {
+    var css = "*, *::before, *::after {" +
+        " transition: none !important; transition-duration: 0s !important; transition-delay: 0s !important;" +
+        " animation: none !important; animation-duration: 0s !important; animation-delay: 0s !important;" +
+        " scroll-behavior: auto !important; }" +
+        " html, body { scroll-behavior: auto !important; }";
+    function install() {
+        if (document.getElementById("__qa-no-animations")) { return; }
+        var style = document.createElement("style");
+        style.id = "__qa-no-animations";
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    }
+    if (document.documentElement) { install(); }
+    document.addEventListener("DOMContentLoaded", install);
+    document.addEventListener("DOMContentLoaded", function () {
+        if (window.jQuery && window.jQuery.fx) { window.jQuery.fx.off = true; }
+    });
+})();
+"""
+
+# arguments[0]: list of [kind ("fill" | "select" | "click"), by, value, data].
+# Runs one journey step in a single round trip. Every element is located and checked first
+# (present, visible, enabled, option exists); if any check fails nothing is touched and the
+# failures are returned so the step can be replayed element by element. Fields are set through
+# the native value setter and get input/change events, as typing would produce.
+# Returns {ok, performed, failed: [{index, reason}]}.
+JOURNEY_STEP_JS = LOCATE_JS + """
+var actions = arguments[0];
+var targets = [], failed = [];
+for (var i = 0; i < actions.length; i++) {
+    var kind = actions[i][0], found;
+    try { found = __qaLocate(actions[i][1], actions[i][2]); } catch (e) { found = []; }
+    var element = found.length ? found[0] : null;
+    var reason = null;
+    if (!element) { reason = "not found"; }
+    else if (!__qaIsVisible(element)) { reason = "not visible"; }
+    else if (element.disabled || element.readOnly) { reason = "not interactable"; }
+    else if (kind === "select") {
+        var wanted = String(actions[i][3]), option = null;
+        for (var j = 0; j < element.options.length; j++) {
+            if ((element.options[j].text || "").trim() === wanted) { option = element.options[j]; break; }
+        }
+        if (!option) { reason = "no option '" + wanted + "'"; }
+        element = option ? [element, option] : element;
+    }
+    if (reason) { failed.push({index: i, reason: reason}); }
+    targets.push(element);
+}
+if (failed.length) { return {ok: false, performed: 0, failed: failed}; }
+
+function fire(element, type) { element.dispatchEvent(new Event(type, {bubbles: true})); }
+for (var k = 0; k < actions.length; k++) {
+    var target = targets[k];
+    switch (actions[k][0]) {
+        case "fill":
+            var proto = target instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            target.focus();
+            Object.getOwnPropertyDescriptor(proto, "value").set.call(target, String(actions[k][3]));
+            fire(target, "input");
+            fire(target, "change");
+            break;
+        case "select":
+            target[1].selected = true;
+            fire(target[0], "input");
+            fire(target[0], "change");
+            break;
+        case "click":
+            target.scrollIntoView({block: "center", inline: "center"});
+            target.click();
+            break;
+    }
+}
+return {ok: true, performed: actions.length, failed: []};
+"""
+
+# arguments: change list URL (may carry ?q= / filters / ?all=), callback.
+# Fetches a Django admin change list with the browser's session cookie and parses it
+# off-screen, so the rows of the whole list come back in one round trip without
+# navigating. Resolves with {rows: [{pk, url, link, fields}], paginated, error}: link is the text of
+# the row's change link, fields maps each list_display column (Django's "field-<name>" cell class)
+# to its text.
+ADMIN_CHANGE_LIST_JS = """
+var listUrl = arguments[0];
+var done = arguments[arguments.length - 1];
+fetch(listUrl, {credentials: "same-origin"}).then(function (response) {
+    if (!response.ok) { throw new Error("HTTP " + response.status + " for " + listUrl); }
+    return response.text();
+}).then(function (html) {
+    var doc = new DOMParser().parseFromString(html, "text/html");
+    var rows = [];
+    doc.querySelectorAll("#result_list tbody tr").forEach(function (row) {
+        var checkbox = row.querySelector("input[name='_selected_action']");
+        var link = row.querySelector("th a[href], td a[href]");
+        var fields = {};
+        row.querySelectorAll("th, td").forEach(function (cell) {
+            Array.prototype.forEach.call(cell.classList, function (name) {
+                if (name.indexOf("field-") === 0) { fields[name.slice(6)] = (cell.textContent || "").trim(); }
+            });
+        });
+        rows.push({
+            pk: checkbox ? checkbox.value : null,
+            url: link ? new URL(link.getAttribute("href"), listUrl).href : null,
+            link: link ? (link.textContent || "").trim() : null,
+            fields: fields
+        });
+    });
+    var paginated = doc.querySelectorAll(".paginator a, .pagination a").length > 0;
+    done({rows: rows, paginated: paginated, error: null});
+}).catch(function (e) {
+    done({rows: [], paginated: false, error: String(e && e.message || e)});
+});
+"""
+
+# Reads the POST fields of the first form with a CSRF token in a parsed document, the way the
+# browser would submit it (no file inputs, unchecked boxes or unselected options).
+_SERIALIZE_ADMIN_FORM_JS = """
+function __qaAdminForm(doc) {
+    var forms = doc.querySelectorAll("form");
+    for (var i = 0; i < forms.length; i++) {
+        if (forms[i].querySelector("input[name='csrfmiddlewaretoken']")) { return forms[i]; }
+    }
+    return null;
+}
+function __qaSerializeForm(form) {
+    var body = new URLSearchParams();
+    Array.prototype.forEach.call(form.elements, function (field) {
+        if (!field.name || field.disabled || field.type === "file" || field.type === "submit" || field.type === "button") { return; }
+        if ((field.type === "checkbox" || field.type === "radio") && !field.checked) { return; }
+        if (field.tagName === "SELECT") {
+            Array.prototype.forEach.call(field.options, function (option) {
+                if (option.selected) { body.append(field.name, option.value); }
+            });
+            return;
+        }
+        body.append(field.name, field.value);
+    });
+    return body;
+}
+function __qaMessages(doc) {
+    return Array.prototype.map.call(doc.querySelectorAll(".messagelist li, .alert, .errornote"), function (m) {
+        return (m.textContent || "").trim();
+    }).filter(function (text) { return text; });
+}
+"""
+
+# arguments: change list URL (its query string carries the filters), action text, list of pks,
+# select across (bool), callback. Runs a Django admin action with one POST, the request the
+# change list's Go button sends: either on the given pks or, with select across, on every record
+# matching the filters. Django ignores a POST without any pk even with select across, so the
+# caller sends the pks of the first page then too, as the admin's own JS does. Actions that answer with a confirmation page (e.g. delete) are not confirmed.
+# Resolves with {ok, status, messages, error}.
+ADMIN_BULK_ACTION_JS = _SERIALIZE_ADMIN_FORM_JS + """
+var listUrl = arguments[0], actionText = arguments[1], pks = arguments[2], selectAcross = arguments[3];
+var done = arguments[arguments.length - 1];
+function fail(message) { done({ok: false, status: null, messages: [], error: message}); }
+fetch(listUrl, {credentials: "same-origin"}).then(function (response) { return response.text(); }).then(function (html) {
+    var doc = new DOMParser().parseFromString(html, "text/html");
+    var form = __qaAdminForm(doc);
+    var select = doc.querySelector("select[name='action']");
+    if (!form || !select) { return fail("No action form on " + listUrl); }
+    var action = null, available = [];
+    Array.prototype.forEach.call(select.options, function (option) {
+        var text = (option.textContent || "").trim();
+        available.push(text);
+        if (text === actionText) { action = option.value; }
+    });
+    if (action === null) { return fail("Action '" + actionText + "' not found. Available: " + available.join(", ")); }
+    var body = new URLSearchParams();
+    body.append("csrfmiddlewaretoken", form.querySelector("input[name='csrfmiddlewaretoken']").value);
+    body.append("action", action);
+    body.append("index", "0");
+    body.append("select_across", selectAcross ? "1" : "0");
+    pks.forEach(function (pk) { body.append("_selected_action", pk); });
+    return fetch(listUrl, {method: "POST", credentials: "same-origin", body: body}).then(function (response) {
+        return response.text().then(function (text) {
+            var result = new DOMParser().parseFromString(text, "text/html");
+            var messages = __qaMessages(result);
+            // "Items must be selected ..." comes back as a warning: nothing was changed
+            var error = result.querySelector(".errornote, .messagelist .error, .messagelist .warning") ? messages.join(" ") : null;
+            done({ok: response.ok && !error, status: response.status, messages: messages, error: error});
+        });
+    });
+}).catch(function (e) { fail(String(e && e.message || e)); });
+"""
+
+# arguments: list of change URLs, {field name: value} overrides, name of the submit button, callback.
+# Submits each admin change form in turn, as if the button had been pressed after editing the
+# overridden fields. Resolves with [{url, ok, status, messages}] in the same order.
+ADMIN_CHANGE_FORMS_SUBMIT_JS = _SERIALIZE_ADMIN_FORM_JS + """
+var urls = arguments[0], overrides = arguments[1], submitName = arguments[2];
+var done = arguments[arguments.length - 1];
+var results = [];
+function submitOne(url) {
+    return fetch(url, {credentials: "same-origin"}).then(function (response) { return response.text(); }).then(function (html) {
+        var form = __qaAdminForm(new DOMParser().parseFromString(html, "text/html"));
+        if (!form) { throw new Error("No change form on " + url); }
+        var body = __qaSerializeForm(form);
+        Object.keys(overrides).forEach(function (name) { body.set(name, overrides[name]); });
+        if (submitName) { body.append(submitName, ""); }
+        return fetch(url, {method: "POST", credentials: "same-origin", body: body});
+    }).then(function (response) {
+        return response.text().then(function (text) {
+            var doc = new DOMParser().parseFromString(text, "text/html");
+            var invalid = !!doc.querySelector(".errornote, .errorlist");
+            results.push({url: url, ok: response.ok && !invalid, status: response.status, messages: __qaMessages(doc)});
+        });
+    }).catch(function (e) {
+        results.push({url: url, ok: false, status: null, messages: [String(e && e.message || e)]});
+    });
+}
+urls.reduce(function (chain, url) { return chain.then(function () { return submitOne(url); }); }, Promise.resolve())
+    .then(function () { done(results); });
+"""
+
+# Returns {url, title, html, console} for the failure trace recorder. html is null when the
+# document is unchanged since the previous call: a MutationObserver sets a dirty flag, so outerHTML
+# is only serialized after the DOM actually changed. The first call on a document installs the
+# observer and a console hook (log/info/warn/error/debug, uncaught errors and rejections); console
+# drains what it caught.
+TRACE_SNAPSHOT_JS = """
+var w = window;
+if (!w.__qaTraceConsole) {
+    w.__qaTraceConsole = [];
+    var push = function (level, text) {
+        w.__qaTraceConsole.push({level: level, text: text, ts: Date.now()});
+        if (w.__qaTraceConsole.length > 200) { w.__qaTraceConsole.shift(); }
+    };
+    ["log", "info", "warn", "error", "debug"].forEach(function (level) {
+        var original = console[level];
+        console[level] = function () {
+            try {
+                push(level, Array.prototype.map.call(arguments, function (a) {
+                    if (typeof a === "string") { return a; }
+                    try { return JSON.stringify(a); } catch (e) { return String(a); }
+                }).join(" "));
+            } catch (e) {}
+            return original.apply(console, arguments);
+        };
+    });
+    w.addEventListener("error", function (e) {
+        push("exception", String(e.message) + " (" + e.filename + ":" + e.lineno + ")");
+    });
+    w.addEventListener("unhandledrejection", function (e) {
+        push("exception", "Unhandled rejection: " + String(e.reason && e.reason.message || e.reason));
+    });
+}
+if (!w.__qaTraceObserver) {
+    w.__qaTraceDirty = true;
+    w.__qaTraceObserver = new MutationObserver(function () { w.__qaTraceDirty = true; });
+    w.__qaTraceObserver.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+// Mutations made in this task have not reached the callback yet
+var changed = w.__qaTraceDirty || w.__qaTraceObserver.takeRecords().length > 0;
+w.__qaTraceDirty = false;
+var html = null;
+if (changed) { html = document.documentElement ? document.documentElement.outerHTML : ""; }
+return {url: location.href, title: document.title, html: html, console: w.__qaTraceConsole.splice(0)};
+"""
+
+# BiDi preload script (also run once in documents that already exist). Sends "dom" on its channel
+# after any DOM mutation, input/change, or finished transition/animation, at most once per task,
+# so BiDi waits re-check their condition only when something changed.
+BIDI_DOM_CHANNEL_JS = """
+(channel) => {
+    if (window.__qaBidiChannel) { return; }
+    window.__qaBidiChannel = true;
+    var pending = false;
+    var notify = function () {
+        if (pending) { return; }
+        pending = true;
+        setTimeout(function () { pending = false; channel("dom"); }, 0);
+    };
+    new MutationObserver(notify).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    ["input", "change", "transitionend", "animationend"].forEach(function (type) {
+        document.addEventListener(type, notify, true);
+    });
+}
+"""
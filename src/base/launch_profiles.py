@@ -0,0 +1,170 @@
+"""
+@package base
+
+Named browser launch profiles. This is the one place ChromeOptions and
+FirefoxOptions are built; conftest, the golden profile builder and the
+benchmarks all go through it. A profile means the same thing in both browsers.
+
+  ci-fast        new headless mode, fixed viewport, reduced motion, no background work
+  debug-visible  visible window (maximized) for local debugging
+  perf-measure   like ci-fast but with motion left on, for timing real page behaviour
+
+Example:
+    options = build_chrome_options("ci-fast", user_data_dir="/tmp/profile")
+    driver = WebDriverFactory("chrome-headless").getWebDriverInstance(driver_options=options)
+    options = build_options("firefox-headless", "ci-fast")
+"""
+import logging
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from base.js_locators import NO_ANIMATIONS_JS
+
+log = logging.getLogger(__name__)
+
+VIEWPORT = (1920, 1080)
+
+# Flags that only cost time in an automated session
+_QUIET_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-features=Translate,OptimizationHints,MediaRouter',
+    '--disable-sync',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-default-apps',
+]
+
+# Firefox equivalents of _QUIET_ARGS (and --mute-audio): no update checks, telemetry, first-run pages or prefetching
+_QUIET_FIREFOX_PREFS = {
+    "app.update.auto": False,
+    "app.update.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.aboutwelcome.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+    "extensions.update.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "media.autoplay.default": 5,
+    "media.volume_scale": "0.0",
+}
+
+LAUNCH_PROFILES = {
+    "ci-fast": {
+        "headless": True,
+        "args": _QUIET_ARGS + ['--disable-gpu', '--hide-scrollbars', '--mute-audio'],
+        # Sites honouring prefers-reduced-motion skip their transitions
+        "reduced_motion": True,
+        "firefox_prefs": _QUIET_FIREFOX_PREFS,
+    },
+    "debug-visible": {
+        "headless": False,
+        "args": ['--no-sandbox', '--disable-dev-shm-usage', '--no-first-run', '--no-default-browser-check'],
+        "reduced_motion": False,
+        "firefox_prefs": {"browser.shell.checkDefaultBrowser": False, "browser.aboutwelcome.enabled": False},
+    },
+    "perf-measure": {
+        "headless": True,
+        "args": _QUIET_ARGS + ['--disable-gpu', '--mute-audio'],
+        "reduced_motion": False,
+        "firefox_prefs": _QUIET_FIREFOX_PREFS,
+    },
+}
+
+# Profile used when --launch-profile is not given
+DEFAULT_PROFILE_FOR_BROWSER = {
+    "chrome": "debug-visible",
+    "chrome-headless": "ci-fast",
+    "firefox": "debug-visible",
+    "firefox-headless": "ci-fast",
+}
+
+FIREFOX_BROWSERS = ("firefox", "firefox-headless")
+
+
+def resolve_profile_name(browser, profile_name=None):
+    name = profile_name or DEFAULT_PROFILE_FOR_BROWSER.get(browser, "ci-fast")
+    if name not in LAUNCH_PROFILES:
+        raise ValueError(f"Unknown launch profile: {name}. Choose one of {list(LAUNCH_PROFILES)}.")
+    return name
+
+
+def build_chrome_options(profile_name, user_data_dir=None):
+    """Builds ChromeOptions for a named launch profile."""
+    profile = LAUNCH_PROFILES[profile_name]
+    options = Options()
+    for arg in profile["args"]:
+        options.add_argument(arg)
+    # Headless windows cannot be maximized, so the viewport is always fixed explicitly
+    options.add_argument(f'--window-size={VIEWPORT[0]},{VIEWPORT[1]}')
+    if profile["headless"]:
+        options.add_argument('--headless=new')
+    if profile["reduced_motion"]:
+        options.add_argument('--force-prefers-reduced-motion')
+    if user_data_dir:
+        options.add_argument(f'--user-data-dir={user_data_dir}')
+    log.info(f"Launch profile '{profile_name}': {options.arguments}")
+    return options
+
+
+def build_firefox_options(profile_name, profile_dir=None):
+    """Builds FirefoxOptions for a named launch profile."""
+    profile = LAUNCH_PROFILES[profile_name]
+    options = FirefoxOptions()
+    for name, value in profile["firefox_prefs"].items():
+        options.set_preference(name, value)
+    # Headless windows cannot be maximized, so the viewport is always fixed explicitly
+    options.add_argument(f'-width={VIEWPORT[0]}')
+    options.add_argument(f'-height={VIEWPORT[1]}')
+    if profile["headless"]:
+        options.add_argument('-headless')
+    if profile["reduced_motion"]:
+        # 1 = reduce: the prefers-reduced-motion media query matches, like --force-prefers-reduced-motion
+        options.set_preference("ui.prefersReducedMotion", 1)
+        options.set_preference("general.smoothScroll", False)
+    if profile_dir:
+        options.add_argument('-profile')
+        options.add_argument(profile_dir)
+    log.info(f"Launch profile '{profile_name}' (Firefox): {options.arguments}")
+    return options
+
+
+def build_options(browser, profile_name, user_data_dir=None):
+    """Options for the browser (--browser value) and launch profile."""
+    if browser in FIREFOX_BROWSERS:
+        return build_firefox_options(profile_name, user_data_dir)
+    return build_chrome_options(profile_name, user_data_dir)
+
+
+def is_headless(options):
+    # Chrome takes --headless=new, Firefox -headless
+    return any(arg.lstrip('-').startswith('headless') for arg in getattr(options, "arguments", []))
+
+
+def install_no_animations(driver):
+    """
+    Disables CSS transitions/animations and smooth scrolling on every document this
+    driver loads from now on (and the current one). Chrome only: uses the CDP command
+    Page.addScriptToEvaluateOnNewDocument. Firefox launch profiles with reduced motion
+    get the closest preferences instead (ui.prefersReducedMotion, no smooth scrolling).
+
+    Returns:
+        bool: True if the script was installed.
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        log.warning("--no-animations needs a Chromium driver with CDP support; animations stay on.")
+        return False
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NO_ANIMATIONS_JS})
+        driver.execute_script(NO_ANIMATIONS_JS)
+    except Exception as e:
+        log.error(f"Could not install the no-animations script: {e}")
+        return False
+    log.info("Animations, transitions and smooth scrolling disabled for this browser session.")
+    return True
@@ -0,0 +1,212 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+import logging
+
+log = logging.getLogger(__name__)
+
+DEFAULT_ROOT_DIR = os.path.join(tempfile.gettempdir(), "qa_profile_snapshots")
+
+# Credentials used when the golden profile should already be logged in.
+# These are the same accounts the test classes use.
+ROLE_CREDENTIALS = {
+    "admin": ("admin", "admin"),
+    "teacher": ("asdfs", "Dinamo12@"),
+}
+
+def run_id():
+    """
+    Id of the current run, shared by the xdist controller and its workers. The controller
+    sets QA_PROFILE_RUN_ID before the workers start, so they inherit it.
+    """
+    return (os.environ.get("QA_PROFILE_RUN_ID") or os.environ.get("PYTEST_XDIST_TESTRUNUID")
+            or os.environ.setdefault("QA_PROFILE_RUN_ID", uuid.uuid4().hex[:12]))
+
+def remove_run_dir(root_dir=None):
+    """Removes the golden profiles and clones of the current run. Called once, when the whole run ends."""
+    run_dir = os.path.join(root_dir or DEFAULT_ROOT_DIR, run_id())
+    if os.path.exists(run_dir):
+        shutil.rmtree(run_dir, ignore_errors=True)
+        log.info(f"Removed profile snapshot directory of this run: {run_dir}")
+
+class ProfileSnapshot:
+    """
+    Builds a warmed-up Chrome user-data-dir ("golden" profile) once per run and
+    hands out cheap copies of it, so every browser starts with a hot HTTP cache,
+    compiled JS and (optionally) a logged-in session cookie.
+    """
+
+    # Chrome refuses to start from a profile that still has these lock files.
+    LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+    # Crash dumps and shader caches are not worth copying.
+    SKIP_DIRS = ("Crashpad", "ShaderCache", "GrShaderCache")
+
+    def __init__(self, base_url, role=None, root_dir=None, warm_paths=None, build_timeout=300):
+        if role and role not in ROLE_CREDENTIALS:
+            raise ValueError(f"Unsupported profile role: {role}. Choose one of {list(ROLE_CREDENTIALS)}.")
+        self.base_url = base_url.rstrip('/')
+        self.role = role
+        self.warm_paths = warm_paths or ["/"]
+        self.build_timeout = build_timeout
+
+        # One golden profile per run; xdist workers share the run id through the environment.
+        self.run_dir = os.path.join(root_dir or DEFAULT_ROOT_DIR, run_id())
+        self.golden_dir = os.path.join(self.run_dir, f"golden-{role or 'anonymous'}")
+        self._ready_marker = self.golden_dir + ".ready"
+        self._lock_dir = self.golden_dir + ".lock"
+        self._lock_owner_file = os.path.join(self._lock_dir, "pid")
+        self.clones = []
+
+    def is_ready(self):
+        return os.path.exists(self._ready_marker)
+
+    def ensure_golden(self, launch_driver):
+        """
+        Builds the golden profile if no other worker has done it yet.
+
+        Args:
+            launch_driver (callable): Takes a user-data-dir path and returns a started WebDriver.
+
+        Returns:
+            str: Path to the golden user-data-dir.
+        """
+        if self.is_ready():
+            return self.golden_dir
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        while True:
+            try:
+                os.mkdir(self._lock_dir) # Atomic: only one worker builds the profile
+                break
+            except FileExistsError:
+                if self._wait_for_golden():
+                    return self.golden_dir
+                # The builder was killed and its lock broken: build the profile here instead
+
+        try:
+            with open(self._lock_owner_file, "w") as owner:
+                owner.write(str(os.getpid()))
+            self._build(launch_driver)
+        finally:
+            shutil.rmtree(self._lock_dir, ignore_errors=True)
+        return self.golden_dir
+
+    def _wait_for_golden(self):
+        """True once another worker has built the profile, False if its lock was stale and has been removed."""
+        log.info(f"Waiting for another worker to build golden profile: {self.golden_dir}")
+        deadline = time.time() + self.build_timeout
+        while time.time() < deadline:
+            if self.is_ready():
+                return True
+            if not os.path.exists(self._lock_dir):
+                break # Builder gave up without producing a profile
+            if not self._lock_owner_alive():
+                log.warning(f"Builder of {self.golden_dir} is gone, breaking its lock.")
+                shutil.rmtree(self._lock_dir, ignore_errors=True)
+                return False
+            time.sleep(0.5)
+        raise RuntimeError(f"Golden profile was not built within {self.build_timeout} seconds: {self.golden_dir}")
+
+    def _lock_owner_alive(self):
+        try:
+            with open(self._lock_owner_file) as owner:
+                pid = int(owner.read().strip())
+        except (OSError, ValueError):
+            # The builder has created the lock but not written its pid yet
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass # Alive, owned by another user
+        return True
+
+    def _build(self, launch_driver):
+        log.info(f"Building golden Chrome profile (role: {self.role or 'anonymous'}) in {self.golden_dir}")
+        start_time = time.time()
+        shutil.rmtree(self.golden_dir, ignore_errors=True)
+        os.makedirs(self.golden_dir)
+
+        driver = launch_driver(self.golden_dir)
+        try:
+            for path in self.warm_paths:
+                driver.get(self.base_url + path)
+            if self.role:
+                # Imported here to keep base/ free of page-object imports at module load.
+                from pages.home.login_page import LoginPage
+                username, password = ROLE_CREDENTIALS[self.role]
+                login_page = LoginPage(driver, self.base_url)
+                login_page.login(username, password)
+                if not login_page.verify_login_success():
+                    raise RuntimeError(f"Could not log in as '{self.role}' while building the golden profile.")
+        finally:
+            # Quitting flushes the cookie store and HTTP cache index to disk.
+            driver.quit()
+
+        self._remove_lock_files(self.golden_dir)
+        with open(self._ready_marker, "w") as marker:
+            marker.write(str(time.time()))
+        log.info(f"Golden Chrome profile built in {time.time() - start_time:.2f} seconds.")
+
+    def clone(self, name=None):
+        """
+        Copies the golden profile for one browser instance. Uses a reflink
+        (copy-on-write) copy where the filesystem supports it.
+        """
+        if not self.is_ready():
+            raise RuntimeError("Golden profile has not been built yet. Call ensure_golden() first.")
+
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        target = os.path.join(self.run_dir, f"{name or 'profile'}-{worker}-{uuid.uuid4().hex[:8]}")
+        start_time = time.time()
+        if not self._reflink_copy(self.golden_dir, target):
+            shutil.copytree(self.golden_dir, target, ignore=shutil.ignore_patterns(*self.LOCK_FILES, *self.SKIP_DIRS))
+        self._remove_lock_files(target)
+        self.clones.append(target)
+        log.info(f"Cloned golden profile to {target} in {time.time() - start_time:.3f} seconds.")
+        return target
+
+    def _reflink_copy(self, source, target):
+        if not shutil.which("cp") or os.name != "posix":
+            return False
+        try:
+            result = subprocess.run(["cp", "-a", "--reflink=auto", source, target],
+                                    capture_output=True, text=True)
+        except OSError as e:
+            log.warning(f"cp failed, falling back to a plain copy: {e}")
+            return False
+        if result.returncode != 0:
+            log.warning(f"cp --reflink failed, falling back to a plain copy: {result.stderr.strip()}")
+            shutil.rmtree(target, ignore_errors=True)
+            return False
+        return True
+
+    def _remove_lock_files(self, profile_dir):
+        for lock_file in self.LOCK_FILES:
+            path = os.path.join(profile_dir, lock_file)
+            if os.path.lexists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    log.warning(f"Could not remove profile lock file {path}: {e}")
+
+    def remove_clone(self, profile_dir):
+        if profile_dir in self.clones:
+            self.clones.remove(profile_dir)
+        try:
+            shutil.rmtree(profile_dir)
+            log.info(f"Successfully cleaned up: {profile_dir}")
+        except OSError as e:
+            log.error(f"Error cleaning up temporary directory {profile_dir}: {e}")
+
+    def cleanup(self):
+        """
+        Removes every clone handed out by this instance. The golden profile is kept for other
+        workers; remove_run_dir() deletes it when the whole run ends.
+        """
+        for profile_dir in list(self.clones):
+            self.remove_clone(profile_dir)
@@ -0,0 +1,129 @@
+"""
+@package base
+
+Pool of remote (grid) WebDriver sessions shared by the whole test run.
+
+Starting a session on a grid costs seconds, so a test class borrows an idle
+session instead of creating one, and gives it back afterwards. A returned session
+is reset (extra tabs closed, cookies and storage cleared, blank page) before the
+next class gets it. max_sessions caps how many sessions this run holds on the
+grid at once; acquire() blocks until one is free.
+
+Example:
+    pool = RemoteSessionPool(lambda: WebDriverFactory("remote", grid_url=url).getWebDriverInstance(), max_sessions=4)
+    driver = pool.acquire()
+    ...
+    pool.release(driver)
+    pool.close_all()
+"""
+import logging
+import threading
+import time
+
+from base.bidi_backend import BidiSession
+
+log = logging.getLogger(__name__)
+
+
+class RemoteSessionPool:
+
+    def __init__(self, create_driver, max_sessions=4, acquire_timeout=300):
+        self.create_driver = create_driver
+        self.max_sessions = max_sessions
+        self.acquire_timeout = acquire_timeout
+        self._idle = []
+        self._all = []
+        self._condition = threading.Condition()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def acquire(self):
+        """Returns an idle session, a new one if below max_sessions, or waits for one to be released."""
+        deadline = time.time() + self.acquire_timeout
+        with self._condition:
+            while True:
+                while self._idle:
+                    driver = self._idle.pop()
+                    if self._is_alive(driver):
+                        self.stats["reused"] += 1
+                        log.info(f"Reusing remote session {driver.session_id}")
+                        return driver
+                    self._discard_locked(driver)
+                if len(self._all) < self.max_sessions:
+                    # Reserve the slot before creating the session outside the lock
+                    self._all.append(None)
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"No remote session became free within {self.acquire_timeout} seconds "
+                                       f"({self.max_sessions} in use).")
+                self._condition.wait(remaining)
+
+        try:
+            driver = self.create_driver()
+        except Exception:
+            with self._condition:
+                self._all.remove(None)
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._all[self._all.index(None)] = driver
+            self.stats["created"] += 1
+        return driver
+
+    def release(self, driver):
+        """Resets the session and makes it available to the next class. Broken sessions are quit."""
+        if driver is None:
+            return
+        healthy = self._reset(driver)
+        with self._condition:
+            if healthy:
+                self._idle.append(driver)
+            else:
+                self._discard_locked(driver)
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            drivers = [d for d in self._all if d is not None]
+            self._idle, self._all = [], []
+        for driver in drivers:
+            try:
+                BidiSession.release(driver.session_id)
+                driver.quit()
+            except Exception as e:
+                log.error(f"Error quitting remote session: {e}")
+        log.info(f"Remote session pool closed: {self.stats}")
+
+    def _discard_locked(self, driver):
+        self.stats["discarded"] += 1
+        if driver in self._all:
+            self._all.remove(driver)
+        try:
+            BidiSession.release(driver.session_id)
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            log.warning(f"Could not reset remote session, discarding it: {e}")
+            return False
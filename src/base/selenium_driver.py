@@ -4,20 +4,67 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     NoSuchElementException, TimeoutException, ElementClickInterceptedException,
-    StaleElementReferenceException, ElementNotInteractableException
+    StaleElementReferenceException, ElementNotInteractableException, JavascriptException
 )
 import time
 import logging
 import os
 import utilities.custome_logger as cl
+from utilities.event_log import logged_action
 from selenium.webdriver.remote.webelement import WebElement # Import WebElement for type hinting
+from base.js_locators import (
+    WAIT_FOR_ANY_JS, WAIT_FOR_CONDITION_JS, WAIT_FOR_PAGE_LOAD_JS, CACHED_ELEMENT_STATE_JS
+)
+from base.bidi_backend import BidiSession
 
 class SeleniumDriver():
 
+    # "poll": WebDriverWait polling over HTTP (default).
+    # "observer": one execute_async_script per wait that resolves from a MutationObserver in the page.
+    # "bidi": the expected condition is re-checked when a WebDriver BiDi event says the page changed.
+    # Set once per session from conftest (--wait-backend).
+    wait_backend = "poll"
+
+    # Re-use WebElements found earlier by the same page object while they are still attached
+    # to the document. Set once per session from conftest (--element-cache).
+    element_cache_enabled = False
+    # Hit/miss counters summed over every page object in the session
+    element_cache_totals = {"hits": 0, "misses": 0, "stale": 0}
+
+    # True when every browser of the session runs with transitions, animations and smooth
+    # scrolling disabled (--no-animations). Elements are then at rest as soon as they are
+    # clickable, so click_element skips the post-scroll pause and intercepted-click retries.
+    animations_disabled = False
+
+    # SutHealthMonitor shared by the session (--sut-health). While its breaker is open
+    # actions fail immediately instead of waiting, retrying and taking screenshots.
+    health_monitor = None
+
+    # Run the multi-step flows that have a journey definition (teacher wizard, student
+    # sign-up, course add) as batched steps instead of one call per field (--journeys).
+    journeys_enabled = False
+
+    # expected_conditions that can be evaluated in the browser (observer waits, element cache).
+    # Any other condition passed to get_element keeps using WebDriverWait.
+    _IN_BROWSER_STATES = {
+        EC.presence_of_element_located: "present",
+        EC.visibility_of_element_located: "visible",
+        EC.element_to_be_clickable: "clickable",
+        EC.invisibility_of_element_located: "invisible",
+    }
+
     def __init__(self, driver, base_url):
         self.driver = driver
         self.base_url = base_url
         self.log = cl.CustomLogger(logging.DEBUG)
+        self._element_cache = {}
+        self.element_cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    def _sut_unavailable(self, locator, locatorType):
+        if self.health_monitor is not None and self.health_monitor.is_open:
+            self.log.error(f"Skipping action on '{locator}' ({locatorType}): {self.health_monitor.open_reason}")
+            return True
+        return False
 
     def _get_by_type(self, locatorType):
 
@@ -40,21 +87,37 @@ class SeleniumDriver():
             self.log.error(f"Locator type '{locatorType}' not correct/supported.")
             return False
 
+    @logged_action
     def get_element(self, locator, locatorType="id", timeout=10, pollFrequency=0.5, condition=EC.presence_of_element_located) -> WebElement:
        
         element = None
+        if self._sut_unavailable(locator, locatorType):
+            return None
         try:
             byType = self._get_by_type(locatorType)
             if not byType:
                 self.log.error(f"Invalid locator type provided for '{locator}'. Cannot get element.")
                 return None
 
+            cache_state = self._IN_BROWSER_STATES.get(condition) if self.element_cache_enabled else None
+            if cache_state:
+                element = self._get_cached_element((byType, locator), cache_state)
+                if element is not None:
+                    self.log.info(f"Element cache hit for '{locator}' with type '{locatorType}'")
+                    return element
+
             self.log.info(f"Waiting for '{condition.__name__}' of element with locator: '{locator}' "
                           f"and type: '{locatorType}' for {timeout} seconds.")
 
-            wait = WebDriverWait(self.driver, timeout, poll_frequency=pollFrequency)
-            element = wait.until(condition((byType, locator)))
+            state = self._observer_state(condition)
+            if state:
+                element = self._observer_wait(byType, locator, state, timeout, pollFrequency,
+                                              fallback=condition((byType, locator)))
+            else:
+                element = self._wait_until(condition((byType, locator)), timeout, pollFrequency)
             self.log.info(f"Element Found and condition met: '{locator}' with type '{locatorType}'")
+            if cache_state and isinstance(element, WebElement):
+                self._element_cache[(byType, locator)] = element
         except TimeoutException:
             self.log.error(f"Element NOT found or condition '{condition.__name__}' not met: '{locator}' ({locatorType}) "
                            f"after {timeout} seconds. TimeoutException occurred.")
@@ -70,6 +133,138 @@ class SeleniumDriver():
             self.take_screenshot_on_failure(locator, locatorType, "unexpected_get_error")
         return element
 
+    def _count_cache(self, event):
+        self.element_cache_stats[event] += 1
+        SeleniumDriver.element_cache_totals[event] += 1
+
+    def _get_cached_element(self, key, state):
+        """
+        Returns the cached element for key if it is still attached and meets state, else None.
+        One execute_script call replaces the wait + find (+ is_displayed/is_enabled) round trips.
+        """
+        element = self._element_cache.get(key)
+        if element is None:
+            self._count_cache("misses")
+            return None
+        try:
+            result = self.driver.execute_script(CACHED_ELEMENT_STATE_JS, element, state)
+        except StaleElementReferenceException:
+            # The element belongs to a previous document: the page navigated, so nothing cached is valid
+            self.log.debug("Cached element is stale after navigation. Clearing the element cache.")
+            self.invalidate_element_cache()
+            self._count_cache("stale")
+            return None
+        except Exception as e:
+            self.log.debug(f"Could not revalidate cached element {key}: {e}")
+            self._element_cache.pop(key, None)
+            self._count_cache("misses")
+            return None
+
+        if result is True:
+            self._count_cache("hits")
+            return element
+        if result == "detached":
+            # Re-rendered in the same document
+            self._element_cache.pop(key, None)
+            self._count_cache("stale")
+        else:
+            # Still attached but not (yet) in the wanted state: let the normal wait handle it
+            self._count_cache("misses")
+        return None
+
+    def invalidate_element_cache(self):
+        self._element_cache.clear()
+
+    def get_element_cache_stats(self):
+        """Returns this page object's cache counters plus the hit rate (0.0 - 1.0)."""
+        stats = dict(self.element_cache_stats)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _observer_state(self, condition):
+        if self.wait_backend != "observer":
+            return None
+        return self._IN_BROWSER_STATES.get(condition)
+
+    def _execute_async_wait(self, script, args, timeout):
+        """
+        Runs one of the in-browser wait scripts until it resolves with a value or the timeout passes.
+        The script receives *args followed by the time budget (ms) for this call. Returns None on timeout.
+        """
+        end_time = time.time() + timeout
+        while True:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return None
+            # Stay well inside the driver's default 30s script timeout
+            chunk = min(remaining, 20)
+            try:
+                result = self.driver.execute_async_script(script, *args, int(chunk * 1000))
+            except JavascriptException as e:
+                if "unloaded" not in str(e).lower():
+                    raise
+                # The page navigated while the script was waiting: check again on the new document
+                self.log.debug(f"In-browser wait interrupted by navigation, retrying: {e}")
+                time.sleep(0.05)
+                continue
+            if result is not None:
+                return result
+
+    def _observer_wait(self, byType, locator, state, timeout, pollFrequency=0.1, text="", fallback=None):
+        """
+        Waits for an element state inside the browser. Raises TimeoutException like WebDriverWait.until,
+        so callers keep their existing error handling. If the script itself fails, the wait is
+        repeated with WebDriverWait and the given expected condition.
+        """
+        # In-browser polling is cheap; the interval only covers changes the observer cannot see.
+        poll_ms = int(min(pollFrequency, 0.1) * 1000)
+        start_time = time.time()
+        try:
+            result = self._execute_async_wait(WAIT_FOR_CONDITION_JS, [byType, locator, state, text, poll_ms], timeout)
+        except JavascriptException as e:
+            if fallback is None:
+                raise
+            self.log.warning(f"Observer wait failed for '{locator}' ({byType}), falling back to polling: {e}")
+            remaining = max(timeout - (time.time() - start_time), 0)
+            return WebDriverWait(self.driver, remaining, poll_frequency=pollFrequency).until(fallback)
+        if result is None:
+            raise TimeoutException(f"Condition '{state}' not met for '{locator}' ({byType}) after {timeout} seconds.")
+        return result
+
+    def _bidi_session(self):
+        return BidiSession.for_driver(self.driver)
+
+    def _wait_until(self, condition, timeout, pollFrequency=0.5):
+        """
+        WebDriverWait(...).until(condition), or with the bidi backend the same condition
+        re-checked on every browser event. Raises TimeoutException either way.
+        """
+        session = self._bidi_session() if self.wait_backend == "bidi" else None
+        if session is None:
+            return WebDriverWait(self.driver, timeout, poll_frequency=pollFrequency).until(condition)
+
+        def check():
+            try:
+                return condition(self.driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                # Ignored by WebDriverWait too: the element is not there (yet)
+                return False
+        return session.wait_until(check, timeout, poll_interval=pollFrequency)
+
+    def wait_for_network_idle(self, idle_time=0.5, timeout=10):
+        """
+        Waits until no request has been in flight for idle_time seconds (bidi backend).
+        The other backends cannot see requests and wait for the page load instead.
+        """
+        session = self._bidi_session() if self.wait_backend == "bidi" else None
+        if session is None:
+            return self.wait_for_page_load(timeout)
+        if session.wait_for_network_idle(idle_time, timeout):
+            return True
+        self.log.warning(f"Network not idle within {timeout} seconds: {len(session.inflight)} requests in flight.")
+        return False
+
     def take_screenshot_on_failure(self, locator, locatorType, event_type="failure"):
         
         try:
@@ -86,11 +281,14 @@ class SeleniumDriver():
         except Exception as screenshot_e:
             self.log.error(f"Failed to take screenshot: {screenshot_e}")
 
+    @logged_action
     def click_element(self, locator, locatorType="id", timeout=3, pollFrequency=0.5, retry_attempts=2):
         """
         Clicks on an element after waiting for it to be clickable.
         Includes robust error handling, scrolling, and a retry mechanism for flakiness.
         """
+        if self._sut_unavailable(locator, locatorType):
+            return False
         attempts = 0
         while attempts <= retry_attempts:
             try:
@@ -102,7 +300,8 @@ class SeleniumDriver():
                     # 2. Scroll the element into view explicitly
                     # Using 'center' for block and inline makes it more robust for various layouts
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", element)
-                    time.sleep(0.1) # Small pause after scrolling to let browser render
+                    if not self.animations_disabled:
+                        time.sleep(0.1) # Small pause after scrolling to let browser render
 
                     # 3. Attempt the click
                     element.click()
@@ -113,12 +312,22 @@ class SeleniumDriver():
                     # If get_element returns None, it already logged the reason and took a screenshot.
                     break # Exit loop if element itself wasn't found/clickable after initial wait
             
-            except (ElementClickInterceptedException, StaleElementReferenceException) as e:
-                self.log.warning(f"Click intercepted or stale element for '{locator}' ({locatorType}). "
+            except ElementClickInterceptedException as e:
+                if self.animations_disabled:
+                    # Nothing is still moving into place, so another element really covers this one
+                    self.log.error(f"Click on '{locator}' ({locatorType}) intercepted by another element: {e}")
+                    break
+                self.log.warning(f"Click intercepted for '{locator}' ({locatorType}). "
                                  f"Attempt {attempts + 1} failed. Retrying... Error: {e}")
                 self.take_screenshot_on_failure(locator, locatorType, f"retry_{attempts + 1}_intercepted")
                 attempts += 1
                 time.sleep(0.5) # Small pause before retrying
+            except StaleElementReferenceException as e:
+                self.log.warning(f"Stale element for '{locator}' ({locatorType}). "
+                                 f"Attempt {attempts + 1} failed. Retrying... Error: {e}")
+                self.take_screenshot_on_failure(locator, locatorType, f"retry_{attempts + 1}_stale")
+                attempts += 1
+                time.sleep(0.5) # Small pause before retrying
             except Exception as e:
                 self.log.error(f"An unexpected error occurred while clicking element '{locator}' ({locatorType}). "
                                f"Error: {e}. Attempt {attempts + 1} failed.")
@@ -134,6 +343,7 @@ class SeleniumDriver():
         # in AdminDashboardPage might not return False correctly.
         return False # Return False if click failed after all attempts
 
+    @logged_action
     def send_keys_element(self, data: str, locator: str, locatorType: str = "id",
                       timeout: int = 10, pollFrequency: float = 0.5) -> bool:
         """
@@ -149,6 +359,8 @@ class SeleniumDriver():
         Returns:
             bool: True if data was successfully sent, False otherwise.
         """
+        if self._sut_unavailable(locator, locatorType):
+            return False
         try:
             # 1. Wait for element to be visible AND interactable
             # Using element_to_be_clickable is often better for send_keys too,
@@ -220,6 +432,7 @@ class SeleniumDriver():
 
     
     
+    @logged_action
     def is_element_present(self, locator, locatorType="id", timeout=5, pollFrequency=0.5):
         
         element = self.get_element(locator, locatorType, timeout=timeout,
@@ -231,6 +444,7 @@ class SeleniumDriver():
             self.log.info(f"Element NOT found present in DOM: '{locator}' ({locatorType}) after {timeout} seconds.")
             return False
 
+    @logged_action
     def is_element_visible(self, locator, locatorType="id", timeout=10, pollFrequency=0.5):
        
         element = self.get_element(locator, locatorType, timeout=timeout,
@@ -242,6 +456,46 @@ class SeleniumDriver():
             self.log.info(f"Element NOT visible: '{locator}' ({locatorType}) after {timeout} seconds.")
             return False
 
+    @logged_action
+    def wait_for_any(self, outcomes, timeout=10, pollFrequency=0.1, visible=False):
+        """
+        Waits until the first of several possible outcomes shows up on the page.
+        The polling runs inside the browser (one execute_async_script call), so the
+        answer comes back as soon as the page responds instead of after a full timeout.
+        No screenshot is taken on timeout: for negative checks absence is a valid answer.
+
+        Args:
+            outcomes (dict): {outcome_key: (locator, locatorType)}. Checked in insertion order.
+            timeout (int): Maximum time to wait for any outcome.
+            pollFrequency (float): In-browser fallback polling interval, in seconds.
+            visible (bool): Require the matched element to be visible, not just present.
+
+        Returns:
+            The key of the first outcome whose locator matched, or None on timeout.
+        """
+        checks = []
+        for key, (locator, locatorType) in outcomes.items():
+            byType = self._get_by_type(locatorType)
+            if not byType:
+                self.log.error(f"Invalid locator type provided for outcome '{key}': '{locator}'.")
+                return None
+            checks.append([key, byType, locator])
+
+        self.log.info(f"Waiting up to {timeout} seconds for any of: {list(outcomes)}")
+        start_time = time.time()
+        try:
+            outcome = self._execute_async_wait(WAIT_FOR_ANY_JS, [checks, int(pollFrequency * 1000), visible], timeout)
+        except Exception as e:
+            self.log.error(f"An unexpected error occurred while waiting for outcomes {list(outcomes)}: {e}")
+            return None
+        if outcome is not None:
+            self.log.info(f"Outcome '{outcome}' detected after {time.time() - start_time:.2f} seconds.")
+            return outcome
+
+        self.log.info(f"None of the outcomes {list(outcomes)} appeared within {timeout} seconds.")
+        return None
+
+    @logged_action
     def elementPresenceCheck(self, locator, locatorType="id"):
         """
         Checks if ANY elements match the locator using find_elements, without explicit waits.
@@ -275,6 +529,7 @@ class SeleniumDriver():
             self.driver.execute_script("window.scrollBy(0, 800);")
             self.log.info("Scrolled page down by 800 pixels.")
 
+    @logged_action
     def wait_for_element_to_be_invisible(self, locator, locatorType="id", timeout=10, pollFrequency=0.5):
         """
         Waits for an element to become invisible. Useful for loading spinners or modals.
@@ -287,8 +542,11 @@ class SeleniumDriver():
             
             self.log.info(f"Waiting for invisibility of element with locator: '{locator}' "
                           f"and type: '{locatorType}' for {timeout} seconds.")
-            wait = WebDriverWait(self.driver, timeout, poll_frequency=pollFrequency)
-            invisible = wait.until(EC.invisibility_of_element_located((byType, locator)))
+            condition = EC.invisibility_of_element_located((byType, locator))
+            if self.wait_backend == "observer":
+                invisible = self._observer_wait(byType, locator, "invisible", timeout, pollFrequency, fallback=condition)
+            else:
+                invisible = self._wait_until(condition, timeout, pollFrequency)
             if invisible:
                 self.log.info(f"Element '{locator}' ({locatorType}) is now invisible.")
                 return True
@@ -305,15 +563,27 @@ class SeleniumDriver():
             self.take_screenshot_on_failure(locator, locatorType, "invisibility_error")
             return False
             
+    @logged_action
     def wait_for_page_load(self, timeout=30):
         """
         Waits for the page to fully load by checking document.readyState.
         """
         self.log.info(f"Waiting for page to load (document.readyState == 'complete') for up to {timeout} seconds.")
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            loaded = None
+            if self.wait_backend == "observer":
+                # Resolved by the page's own load event instead of polling readyState
+                loaded = self._execute_async_wait(WAIT_FOR_PAGE_LOAD_JS, [], timeout)
+                if loaded is None:
+                    raise TimeoutException(f"Load event not fired within {timeout} seconds.")
+            elif self.wait_backend == "bidi" and self._bidi_session() is not None:
+                # Resolved by the browsingContext.load event of the pending navigation
+                if not self._bidi_session().wait_for_load(self.driver, timeout):
+                    raise TimeoutException(f"Load event not received within {timeout} seconds.")
+            else:
+                WebDriverWait(self.driver, timeout).until(
+                    lambda driver: driver.execute_script("return document.readyState") == "complete"
+                )
             self.log.info("Page loaded successfully.")
             return True # Indicate success
         except TimeoutException:
@@ -327,6 +597,38 @@ class SeleniumDriver():
             # Don't re-raise immediately, allow calling method to handle
             return False
 
+    @logged_action
+    def wait_for_text(self, text, locator, locatorType="id", timeout=10, pollFrequency=0.5):
+        """
+        Waits for the element's text to contain the given text.
+        Returns the element, or None if the text did not appear within the timeout.
+        """
+        byType = self._get_by_type(locatorType)
+        if not byType:
+            self.log.error(f"Invalid locator type provided for '{locator}'. Cannot wait for text.")
+            return None
+
+        self.log.info(f"Waiting for text '{text}' in element with locator: '{locator}' "
+                      f"and type: '{locatorType}' for {timeout} seconds.")
+        condition = EC.text_to_be_present_in_element((byType, locator), text)
+        try:
+            if self.wait_backend == "observer":
+                element = self._observer_wait(byType, locator, "text", timeout, pollFrequency, text=text,
+                                              fallback=condition)
+            else:
+                self._wait_until(condition, timeout, pollFrequency)
+                element = self.driver.find_element(byType, locator)
+            self.log.info(f"Text '{text}' found in element: '{locator}' ({locatorType})")
+            return element
+        except TimeoutException:
+            self.log.error(f"Text '{text}' did not appear in element '{locator}' ({locatorType}) after {timeout} seconds.")
+            self.take_screenshot_on_failure(locator, locatorType, "text_timeout")
+        except Exception as e:
+            self.log.error(f"An error occurred while waiting for text in '{locator}' ({locatorType}): {e}")
+            self.take_screenshot_on_failure(locator, locatorType, "text_wait_error")
+        return None
+
+    @logged_action
     def get_text_of_element(self, locator, locatorType="id", timeout=10, pollFrequency=0.5) -> str:
         """
         Gets the text of an element after waiting for it to be visible.
@@ -0,0 +1,176 @@
+"""
+@package base
+
+Command-level tracing of the WebDriver HTTP link.
+
+CommandTracer.instrument(driver) turns the driver's RemoteConnection (a
+ChromiumRemoteConnection for local Chrome, a plain RemoteConnection for the
+grid) into a traced subclass of its own class. From then on every command
+records its name, latency, request and response sizes, and the page-object
+method that sent it. That method is the nearest frame in pages/; if there is
+none, it is the outermost SeleniumDriver/journey frame. Commands are grouped
+per test into LatencyHistograms, so chatty methods stand out, e.g. how many
+findElement calls AdminDashboardPage.get_user_status_from_list makes.
+
+Drivers are only instrumented when WebDriverFactory.command_tracer is set
+(--command-trace), so an untraced run keeps Selenium's own class untouched.
+
+Example:
+    pytest src/tests --command-trace test-results/commands.json
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from utilities.event_log import LatencyHistogram, current_test_id
+
+log = logging.getLogger(__name__)
+
+_PAGES_DIR = f"{os.sep}pages{os.sep}"
+_BASE_DIR = f"{os.sep}base{os.sep}"
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _calling_method():
+    """'PageClass.method' of the page object (or SeleniumDriver) code that sent the command."""
+    frame = sys._getframe(2)
+    base_frame = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _PAGES_DIR in filename:
+            break
+        if _BASE_DIR in filename and filename != _THIS_FILE and "self" in frame.f_code.co_varnames:
+            base_frame = frame
+        frame = frame.f_back
+    frame = frame or base_frame
+    if frame is None:
+        return "(test code)"
+    owner = frame.f_locals.get("self")
+    return f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+
+
+class _TracedConnection:
+    """Mixed in front of the driver's own RemoteConnection class by CommandTracer.instrument()."""
+
+    _command_tracer = None
+
+    def execute(self, command, params):
+        tracer = self._command_tracer
+        method = _calling_method()
+        sizes = tracer._sizes
+        sizes.sent = sizes.received = 0
+        ok = False
+        start_time = time.perf_counter()
+        try:
+            response = super().execute(command, params)
+            ok = isinstance(response, dict) and response.get("status", 0) in (0, None, 200)
+            return response
+        finally:
+            tracer.record(method, command, (time.perf_counter() - start_time) * 1000,
+                          sizes.sent, sizes.received, ok)
+
+    def _request(self, method, url, body=None):
+        self._command_tracer._sizes.sent += len(body) if body and method in ("POST", "PUT") else 0
+        return super()._request(method, url, body=body)
+
+
+class CommandTracer:
+
+    def __init__(self):
+        self._traced_classes = {}
+        self._lock = threading.Lock()
+        # Request/response bytes of the command in flight, per thread (the trio facade uses worker threads)
+        self._sizes = threading.local()
+        self._tests = {}    # test id -> {(page method, command): LatencyHistogram}
+        self._bytes = {}    # test id -> {page method: [sent, received]}
+
+    def instrument(self, driver):
+        """Switches the driver's connection to a traced subclass of its own class."""
+        connection = driver.command_executor
+        if isinstance(connection, _TracedConnection):
+            return driver
+        base_class = type(connection)
+        traced_class = self._traced_classes.get(base_class)
+        if traced_class is None:
+            traced_class = type(f"Traced{base_class.__name__}", (_TracedConnection, base_class),
+                                {"_command_tracer": self})
+            self._traced_classes[base_class] = traced_class
+        connection.__class__ = traced_class
+        self._count_response_bytes(connection)
+        log.info(f"Tracing WebDriver commands of session {driver.session_id} ({base_class.__name__})")
+        return driver
+
+    def _count_response_bytes(self, connection):
+        # The keep-alive pool manager returns preloaded responses, so reading .data costs nothing extra
+        pool = getattr(connection, "_conn", None)
+        if pool is None or getattr(pool, "_counted_by_tracer", False):
+            # Drivers sharing one pool (--http-pool tuned) wrap it once
+            return
+        sizes = self._sizes
+        pool_request = pool.request
+
+        def counting_request(*args, **kwargs):
+            response = pool_request(*args, **kwargs)
+            sizes.received = getattr(sizes, "received", 0) + len(response.data or b"")
+            return response
+        pool.request = counting_request
+        pool._counted_by_tracer = True
+
+    def record(self, method, command, duration_ms, sent, received, ok):
+        test_id = current_test_id() or "(outside tests)"
+        with self._lock:
+            histograms = self._tests.setdefault(test_id, {})
+            histogram = histograms.get((method, command))
+            if histogram is None:
+                histogram = histograms[(method, command)] = LatencyHistogram()
+            histogram.add(duration_ms, not ok)
+            totals = self._bytes.setdefault(test_id, {}).setdefault(method, [0, 0])
+            totals[0] += sent
+            totals[1] += received
+
+    def test_report(self, test_id):
+        """{page method: {"commands": {command: histogram summary}, "count", "total_ms", "sent", "received"}}"""
+        with self._lock:
+            histograms = dict(self._tests.get(test_id, {}))
+            byte_totals = dict(self._bytes.get(test_id, {}))
+        report = {}
+        for (method, command), histogram in histograms.items():
+            entry = report.setdefault(method, {"commands": {}, "count": 0, "total_ms": 0.0,
+                                               "sent": byte_totals.get(method, [0, 0])[0],
+                                               "received": byte_totals.get(method, [0, 0])[1]})
+            entry["commands"][command] = histogram.summary()
+            entry["count"] += histogram.count
+            entry["total_ms"] = round(entry["total_ms"] + histogram.total, 1)
+        return report
+
+    def format_test(self, test_id, top=15):
+        report = self.test_report(test_id)
+        lines = []
+        for method, entry in sorted(report.items(), key=lambda item: item[1]["count"], reverse=True)[:top]:
+            commands = ", ".join(f"{command} x{summary['count']}" for command, summary in
+                                 sorted(entry["commands"].items(), key=lambda item: item[1]["count"], reverse=True))
+            lines.append(f"{entry['count']:>5} cmds {entry['total_ms']:>9.1f} ms  {method}: {commands}")
+        return "\n".join(lines)
+
+    def chattiest(self, top=10):
+        """[(page method, commands, total ms)] summed over every test, most commands first."""
+        totals = {}
+        with self._lock:
+            for histograms in self._tests.values():
+                for (method, _), histogram in histograms.items():
+                    count, total = totals.get(method, (0, 0.0))
+                    totals[method] = (count + histogram.count, total + histogram.total)
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return [(method, count, round(total, 1)) for method, (count, total) in ranked]
+
+    def save(self, path):
+        with self._lock:
+            test_ids = list(self._tests)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({test_id: self.test_report(test_id) for test_id in test_ids}, f, indent=2)
+        log.info(f"WebDriver command trace of {len(test_ids)} tests written to {path}")
@@ -1,39 +1,53 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions # Keep if you plan to support Firefox
 from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.common.exceptions import SessionNotCreatedException
 # Import webdriver_manager for automatic driver management
 from webdriver_manager.chrome import ChromeDriverManager
-# If you support Firefox
-# from webdriver_manager.firefox import GeckoDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
 
 import logging
+from base.launch_profiles import build_chrome_options, build_firefox_options, resolve_profile_name, is_headless
 
 log = logging.getLogger(__name__)
 
 class WebDriverFactory:
 
-    def __init__(self, browser):
+    # Capabilities a grid may relax, in this order, when no node matches the full request
+    OPTIONAL_REMOTE_CAPABILITIES = ("browserVersion", "platformName")
+
+    # ConsoleCollector shared by the session (--console-errors). Every driver created here
+    # gets a DevTools connection that collects its JS errors and browser log entries.
+    console_collector = None
+
+    # Ask for a WebDriver BiDi websocket with every session (--wait-backend bidi)
+    bidi_enabled = False
+
+    # SharedHttpPool used by every driver created here (--http-pool tuned), None for Selenium's own pools
+    http_pool = None
+
+    # CommandTracer shared by the session (--command-trace). Every driver created here sends
+    # its commands through a traced connection (name, latency, sizes, calling page method).
+    command_tracer = None
+
+    def __init__(self, browser, grid_url=None, capabilities=None):
         self.browser = browser.lower() # Normalize to lowercase for consistency
+        self.grid_url = grid_url
+        self.capabilities = capabilities or {}
 
-    def getWebDriverInstance(self, driver_options=None):
+    def getWebDriverInstance(self, driver_options=None, launch_profile=None):
         driver = None
 
         if self.browser in ["chrome", "chrome-headless"]:
-            # If no options are provided from conftest, create a default set
+            # If no options are provided from conftest, use the default launch profile for this browser
             if driver_options is None:
-                chrome_options = ChromeOptions()
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--window-size=1920,1080')
-                # Add headless if it's explicitly chrome-headless
-                if self.browser == "chrome-headless":
-                    chrome_options.add_argument('--headless')
-                    chrome_options.add_argument('--disable-gpu') # Recommended for headless
-                driver_options = chrome_options
-                log.info("WebDriverFactory: No Chrome options provided, using default set.")
+                driver_options = build_chrome_options(resolve_profile_name(self.browser, launch_profile))
+                log.info("WebDriverFactory: No Chrome options provided, using default launch profile.")
             else:
                 log.info("WebDriverFactory: Using Chrome options provided from conftest.")
+            if self.bidi_enabled:
+                driver_options.web_socket_url = True
 
             # --- CRITICAL IMPROVEMENT: Use ChromeDriverManager ---
             # This automatically downloads and manages the correct chromedriver executable.
@@ -47,35 +61,82 @@ class WebDriverFactory:
                 # but conftest.py already has a skip for this.
                 raise # Re-raise to let conftest handle the skip
 
-        elif self.browser == "firefox":
-            # If no options are provided from conftest, create a default set
+        elif self.browser in ["firefox", "firefox-headless"]:
+            # If no options are provided from conftest, use the default launch profile for this browser
             if driver_options is None:
-                firefox_options = FirefoxOptions()
-                # Add any default Firefox options here if needed
-                driver_options = firefox_options
-                log.info("WebDriverFactory: No Firefox options provided, using default set.")
+                driver_options = build_firefox_options(resolve_profile_name(self.browser, launch_profile))
+                log.info("WebDriverFactory: No Firefox options provided, using default launch profile.")
             else:
                 log.info("WebDriverFactory: Using Firefox options provided from conftest.")
+            if self.bidi_enabled:
+                driver_options.web_socket_url = True
 
-            # --- For Firefox, you'd use GeckoDriverManager ---
+            # GeckoDriverManager downloads and caches geckodriver like ChromeDriverManager does chromedriver
             try:
-                # service = FirefoxService(GeckoDriverManager().install()) # Uncomment if supporting Firefox
-                # driver = webdriver.Firefox(service=service, options=driver_options) # Uncomment if supporting Firefox
-                # Placeholder if you haven't implemented Firefox fully:
-                log.warning("WebDriverFactory: Firefox browser selected, but driver initialization not fully implemented yet.")
-                raise NotImplementedError("Firefox WebDriver initialization is not fully implemented.")
+                service = FirefoxService(GeckoDriverManager().install())
+                driver = webdriver.Firefox(service=service, options=driver_options)
+                log.info("WebDriverFactory: GeckoDriver initialized using GeckoDriverManager.")
             except Exception as e:
                 log.error(f"WebDriverFactory: Failed to initialize FirefoxDriver with webdriver_manager: {e}")
                 raise # Re-raise to let conftest handle the skip
 
+        elif self.browser == "remote":
+            if not self.grid_url:
+                raise ValueError("Remote browser selected but no grid URL given (--grid-url).")
+            if driver_options is None:
+                driver_options = build_chrome_options(resolve_profile_name(self.browser, launch_profile))
+            if self.bidi_enabled:
+                driver_options.web_socket_url = True
+            driver = self._start_remote_session(driver_options)
+
         else:
             log.error(f"WebDriverFactory: Unsupported browser type specified: {self.browser}")
-            raise ValueError(f"Unsupported browser type: {self.browser}. Please choose 'chrome', 'chrome-headless', or 'firefox'.")
+            raise ValueError(f"Unsupported browser type: {self.browser}. Please choose 'chrome', 'chrome-headless', 'firefox', 'firefox-headless' or 'remote'.")
 
         # Common configurations for all browsers (if driver was successfully initialized)
         if driver:
             driver.set_page_load_timeout(30)
-            driver.maximize_window() # Note: Maximize might not work in headless
-            log.info(f"WebDriverFactory: Driver initialized with page load timeout (30s) and maximized window.")
+            # Headless windows cannot be maximized; their viewport comes from --window-size
+            if not is_headless(driver_options):
+                driver.maximize_window()
+            log.info(f"WebDriverFactory: Driver initialized with page load timeout (30s).")
+            if self.http_pool is not None:
+                self.http_pool.attach(driver)
+            if self.command_tracer is not None:
+                self.command_tracer.instrument(driver)
+            if self.console_collector is not None:
+                self.console_collector.attach(driver)
+
+        return driver
 
-        return driver
\ No newline at end of file
+    def _start_remote_session(self, driver_options):
+        """
+        Starts a session on the grid. The requested capabilities are tried first; if no node
+        can satisfy them, the optional ones (browser version, platform) are dropped one at a time.
+        """
+        requested = dict(self.capabilities)
+        candidates = [dict(requested)]
+        for name in self.OPTIONAL_REMOTE_CAPABILITIES:
+            if name in requested:
+                requested.pop(name)
+                candidates.append(dict(requested))
+
+        last_error = None
+        for index, capabilities in enumerate(candidates):
+            for name, value in capabilities.items():
+                driver_options.set_capability(name, value)
+            for name in self.OPTIONAL_REMOTE_CAPABILITIES:
+                if name not in capabilities:
+                    driver_options.capabilities.pop(name, None)
+            try:
+                driver = webdriver.Remote(command_executor=self.grid_url, options=driver_options)
+            except SessionNotCreatedException as e:
+                last_error = e
+                log.warning(f"WebDriverFactory: Grid could not match {capabilities or 'default capabilities'}: {e.msg}")
+                continue
+            negotiated = {k: driver.capabilities.get(k) for k in ("browserName", "browserVersion", "platformName")}
+            if index:
+                log.warning(f"WebDriverFactory: Relaxed capabilities to {capabilities}; grid gave {negotiated}.")
+            log.info(f"WebDriverFactory: Remote session {driver.session_id} on {self.grid_url}: {negotiated}")
+            return driver
+        raise last_error
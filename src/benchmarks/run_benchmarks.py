@@ -0,0 +1,389 @@
+"""
+@package benchmarks
+
+Benchmarks for the framework's own overhead.
+
+Every SeleniumDriver operation (get_element, click_element, send_keys_element,
+is_element_present) runs against static HTML fixtures that mirror our forms,
+in success and failure mode. For each case we record per-operation latency and
+the number of WebDriver commands it sent. The "raw" cases do the same thing with
+plain driver calls, so framework time = SeleniumDriver case - raw case.
+The journey cases fill the teacher wizard batched and element by element.
+The pool cases time single commands, sequentially and from several threads at
+once, with each HTTP pool profile in turn (--pool-profile).
+
+Launch time and fixture page load timings are recorded per launch profile.
+Results are written as JSON so that two runs can be compared before/after a change.
+
+Example:
+    python src/benchmarks/run_benchmarks.py --label baseline
+    python src/benchmarks/run_benchmarks.py --label observer --wait-backend observer
+    python src/benchmarks/run_benchmarks.py --label bidi --wait-backend bidi
+    python src/benchmarks/run_benchmarks.py --label presets --launch-profile ci-fast perf-measure
+    python src/benchmarks/run_benchmarks.py --label pool --only pool --pool-profile default tuned
+    python src/benchmarks/run_benchmarks.py --compare src/benchmarks/results/baseline.json src/benchmarks/results/observer.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.support import expected_conditions as EC
+from base.selenium_driver import SeleniumDriver
+from base.journey import Journey, Step, fill, click
+from base.web_driver_factory import WebDriverFactory
+from base.launch_profiles import LAUNCH_PROFILES, build_options, resolve_profile_name, install_no_animations
+from base.http_pool import HTTP_POOL_PROFILES, SharedHttpPool
+
+log = logging.getLogger(__name__)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+MISSING_LOCATOR = "//*[@id='qa-benchmark-missing']"
+
+# (case name, fixture, operation, locator, locatorType, mode)
+CASES = [
+    ("login.get_element", "login.html", "get_element", "id_username", "id", "success"),
+    ("login.send_keys_element", "login.html", "send_keys_element", "id_password", "id", "success"),
+    ("login.click_element", "login.html", "click_element", "//button[normalize-space()='Login']", "xpath", "success"),
+    ("login.is_element_present", "login.html", "is_element_present", "//li[@class='error approval-message']", "xpath", "success"),
+    ("wizard.send_keys_element", "teacher_wizard.html", "send_keys_element", "//input[@id='id_full_name_en']", "xpath", "success"),
+    ("wizard.click_element", "teacher_wizard.html", "click_element", "//button[normalize-space()='Next']", "xpath", "success"),
+    ("course.send_keys_element", "course_add.html", "send_keys_element", "//textarea[@id='id_description']", "xpath", "success"),
+    ("course.click_element", "course_add.html", "click_element", "id_categories_2", "id", "success"),
+    ("admin.get_element", "admin_change_list.html", "get_element", "//a[normalize-space()='teacher100']", "xpath", "success"),
+    ("admin.click_element", "admin_change_list.html", "click_element", "//input[@value='100']", "xpath", "success"),
+    ("admin.is_element_present", "admin_change_list.html", "is_element_present", "//select[@name='action']", "xpath", "success"),
+    ("login.get_element.missing", "login.html", "get_element", MISSING_LOCATOR, "xpath", "failure"),
+    ("login.click_element.missing", "login.html", "click_element", MISSING_LOCATOR, "xpath", "failure"),
+    ("login.send_keys_element.missing", "login.html", "send_keys_element", MISSING_LOCATOR, "xpath", "failure"),
+    ("admin.is_element_present.missing", "admin_change_list.html", "is_element_present", MISSING_LOCATOR, "xpath", "failure"),
+]
+
+# Plain WebDriver equivalents of the success cases
+RAW_OPERATIONS = {
+    "get_element": lambda driver, by, locator: driver.find_element(by, locator),
+    "is_element_present": lambda driver, by, locator: len(driver.find_elements(by, locator)) > 0,
+    "click_element": lambda driver, by, locator: driver.find_element(by, locator).click(),
+    "send_keys_element": lambda driver, by, locator: _raw_send_keys(driver.find_element(by, locator)),
+}
+
+
+def _raw_send_keys(element):
+    element.clear()
+    element.send_keys("benchmark")
+
+
+class CommandCounter:
+    """Counts the WebDriver commands sent through driver.execute (WebElement calls go through it too)."""
+
+    def __init__(self, driver):
+        self.counts = Counter()
+        self._execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.counts[driver_command] += 1
+            return self._execute(driver_command, params)
+        driver.execute = counting_execute
+
+    def reset(self):
+        self.counts = Counter()
+
+
+def _fixture_url(fixture):
+    return "file://" + os.path.join(FIXTURES_DIR, fixture)
+
+
+def _launch(browser, launch_profile):
+    """Starts a browser with the given launch profile. Returns (driver, launch seconds)."""
+    start_time = time.perf_counter()
+    driver = WebDriverFactory(browser).getWebDriverInstance(driver_options=build_options(browser, launch_profile))
+    return driver, round(time.perf_counter() - start_time, 3)
+
+
+def measure_page_timings(driver, repeats=3):
+    """Navigation timings (ms) of every fixture page, median of `repeats` loads."""
+    timings = {}
+    for fixture in sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html")):
+        samples = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            driver.get(_fixture_url(fixture))
+            wall_ms = (time.perf_counter() - start_time) * 1000
+            entry = driver.execute_script(
+                "var e = performance.getEntriesByType('navigation')[0];"
+                "return e ? {dcl: e.domContentLoadedEventEnd, load: e.loadEventEnd} : null;") or {}
+            samples.append((wall_ms, entry.get("dcl") or 0, entry.get("load") or 0))
+        timings[fixture] = {
+            "get_ms": round(statistics.median(s[0] for s in samples), 2),
+            "dom_content_loaded_ms": round(statistics.median(s[1] for s in samples), 2),
+            "load_ms": round(statistics.median(s[2] for s in samples), 2),
+        }
+    return timings
+
+
+def _run_operation(page, operation, locator, locatorType, timeout):
+    if operation == "send_keys_element":
+        return page.send_keys_element("benchmark", locator, locatorType, timeout=timeout)
+    if operation == "get_element":
+        return page.get_element(locator, locatorType, timeout=timeout, condition=EC.presence_of_element_located)
+    return getattr(page, operation)(locator, locatorType, timeout=timeout)
+
+
+def _summarize_latencies(latencies, iterations):
+    latencies = sorted(latencies)
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 2),
+        "max_ms": round(latencies[-1], 2),
+        "commands_per_op": 1.0,  # timed calls that send one command each; _summarize counts the others
+    }
+
+
+def _summarize(latencies, counter, iterations):
+    summary = _summarize_latencies(latencies, iterations)
+    summary["commands_per_op"] = round(sum(counter.counts.values()) / iterations, 2)
+    summary["commands"] = {name: round(count / iterations, 2) for name, count in sorted(counter.counts.items())}
+    return summary
+
+
+def run_benchmarks(driver, iterations=20, failure_iterations=3, failure_timeout=1, only=None):
+    counter = CommandCounter(driver)
+    page = SeleniumDriver(driver, _fixture_url(""))
+    results = {}
+    current_fixture = None
+
+    for name, fixture, operation, locator, locatorType, mode in CASES:
+        if only and not any(pattern in name for pattern in only):
+            continue
+        if fixture != current_fixture:
+            driver.get(_fixture_url(fixture))
+            current_fixture = fixture
+        page.invalidate_element_cache()
+
+        runs = iterations if mode == "success" else failure_iterations
+        timeout = 10 if mode == "success" else failure_timeout
+        cases = [(name, lambda: _run_operation(page, operation, locator, locatorType, timeout))]
+        if mode == "success":
+            by = page._get_by_type(locatorType)
+            cases.append((name + ".raw", lambda: RAW_OPERATIONS[operation](driver, by, locator)))
+
+        for case_name, call in cases:
+            call()  # warm-up, not measured
+            counter.reset()
+            latencies = []
+            for _ in range(runs):
+                start_time = time.perf_counter()
+                call()
+                latencies.append((time.perf_counter() - start_time) * 1000)
+            results[case_name] = _summarize(latencies, counter, runs)
+            if mode == "failure":
+                # Time spent beyond the configured wait is the framework's failure-path cost (logging, screenshots)
+                results[case_name]["overhead_ms"] = round(results[case_name]["p50_ms"] - timeout * 1000, 2)
+            log.info(f"{case_name}: p50 {results[case_name]['p50_ms']} ms, "
+                     f"{results[case_name]['commands_per_op']} commands/op")
+    return results
+
+
+def _wizard_journey(page):
+    wizard = "//input[@id='id_{}']"
+    return Journey(page, "teacher_wizard", [
+        Step("basic information", [fill(wizard.format(field), "xpath", "benchmark")
+                                   for field in ("full_name_en", "full_name_ar", "email", "phone_number")]
+             + [click("//button[normalize-space()='Next: Teaching Info']", "xpath")],
+             wait_for=(wizard.format("experience_years"), "xpath")),
+        Step("professional details", [fill(wizard.format(field), "xpath", "12")
+                                      for field in ("experience_years", "university", "graduation_year", "major")]
+             + [fill("//textarea[@id='id_bio']", "xpath", "benchmark"),
+                click("//button[normalize-space()='Next']", "xpath")],
+             wait_for=("//button[normalize-space()='Submit Application']", "xpath")),
+    ])
+
+
+def run_journey_benchmarks(driver, iterations=20):
+    """The first two teacher wizard steps as one journey, batched vs. per element."""
+    counter = CommandCounter(driver)
+    page = SeleniumDriver(driver, _fixture_url(""))
+    driver.get(_fixture_url("teacher_wizard.html"))
+    journey = _wizard_journey(page)
+    results = {}
+    for case_name, per_element in (("wizard.journey.batched", False), ("wizard.journey.per_element", True)):
+        journey.run(per_element=per_element)  # warm-up, not measured
+        counter.reset()
+        latencies = []
+        for _ in range(iterations):
+            start_time = time.perf_counter()
+            journey.run(per_element=per_element)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        results[case_name] = _summarize(latencies, counter, iterations)
+        log.info(f"{case_name}: p50 {results[case_name]['p50_ms']} ms, "
+                 f"{results[case_name]['commands_per_op']} commands/op")
+    return results
+
+
+# (case name, command) timed one call at a time per HTTP pool profile
+POOL_CASES = [
+    ("getTitle", lambda driver: driver.title),
+    ("findElements", lambda driver: driver.find_elements("xpath", "//input")),
+    ("executeScript", lambda driver: driver.execute_script("return document.readyState")),
+]
+
+
+def _use_pool_profile(driver, profile, threads):
+    """Points the driver at a fresh pool of the given profile. Returns the SharedHttpPool (None for default)."""
+    connection = driver.command_executor
+    pool = SharedHttpPool.from_profile(profile, maxsize=threads)
+    if pool is None:
+        # Selenium's own settings, as a new driver would get them
+        connection.client_config.timeout = 120
+        connection._conn = connection._get_connection_manager()
+    else:
+        pool.attach(driver)
+    return pool
+
+
+def run_pool_benchmarks(driver, profiles, iterations=20, threads=4):
+    """Per-command latency with each HTTP pool profile, sequentially and with `threads` callers at once."""
+    driver.get(_fixture_url("login.html"))
+    results = {}
+    for profile in profiles:
+        pool = _use_pool_profile(driver, profile, threads)
+        for case_name, command in POOL_CASES:
+            command(driver)  # warm-up (and first connection), not measured
+            latencies = []
+            for _ in range(iterations):
+                start_time = time.perf_counter()
+                command(driver)
+                latencies.append((time.perf_counter() - start_time) * 1000)
+            results[f"pool.{profile}.{case_name}"] = _summarize_latencies(latencies, iterations)
+
+        latencies, lock = [], threading.Lock()
+
+        def worker():
+            for _ in range(iterations):
+                start_time = time.perf_counter()
+                driver.find_elements("xpath", "//input")
+                with lock:
+                    latencies.append((time.perf_counter() - start_time) * 1000)
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        case = results[f"pool.{profile}.findElements.{threads}threads"] = _summarize_latencies(latencies, len(latencies))
+        if pool is not None:
+            case["pool"] = pool.stats()
+        log.info(f"HTTP pool '{profile}': getTitle p50 {results[f'pool.{profile}.getTitle']['p50_ms']} ms, "
+                 f"{threads} threads p95 {case['p95_ms']} ms")
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base_path, new_path):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"launch: {base.get('launch_profile')} {base.get('launch_seconds')}s -> "
+          f"{new.get('launch_profile')} {new.get('launch_seconds')}s")
+    for fixture in sorted(set(base.get("pages", {})) & set(new.get("pages", {}))):
+        print(f"  {fixture:<38} get {base['pages'][fixture]['get_ms']:>8} -> {new['pages'][fixture]['get_ms']:>8} ms")
+    print(f"{'case':<40} {'base p50':>9} {'new p50':>9} {'delta':>8} {'base cmd':>9} {'new cmd':>8}")
+    for name in sorted(set(base["results"]) | set(new["results"])):
+        old_case, new_case = base["results"].get(name), new["results"].get(name)
+        if not old_case or not new_case:
+            print(f"{name:<40} {'only in ' + ('new' if new_case else 'base'):>9}")
+            continue
+        delta = (new_case["p50_ms"] - old_case["p50_ms"]) / old_case["p50_ms"] * 100 if old_case["p50_ms"] else 0.0
+        print(f"{name:<40} {old_case['p50_ms']:>9} {new_case['p50_ms']:>9} {delta:>+7.1f}% "
+              f"{old_case['commands_per_op']:>9} {new_case['commands_per_op']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure SeleniumDriver overhead against local fixture pages.")
+    parser.add_argument("--browser", default="chrome-headless", choices=["chrome", "chrome-headless", "firefox", "firefox-headless"])
+    parser.add_argument("--launch-profile", nargs="+", choices=sorted(LAUNCH_PROFILES),
+                        help="Launch presets to measure, one result file each (default: the browser's default)")
+    parser.add_argument("--label", default="run", help="Name of the result file in --output-dir")
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--failure-iterations", type=int, default=3)
+    parser.add_argument("--failure-timeout", type=float, default=1, help="Wait (s) used by the failure cases")
+    parser.add_argument("--only", nargs="*", help="Only run cases whose name contains one of these strings")
+    parser.add_argument("--wait-backend", choices=["poll", "observer", "bidi"], default="poll")
+    parser.add_argument("--element-cache", action="store_true")
+    parser.add_argument("--no-animations", action="store_true", help="Measure with animations disabled")
+    parser.add_argument("--pool-profile", nargs="+", choices=sorted(HTTP_POOL_PROFILES),
+                        help="Also time single commands with each HTTP pool profile (e.g. default tuned)")
+    parser.add_argument("--pool-threads", type=int, default=4, help="Concurrent callers in the threaded pool case")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    SeleniumDriver.wait_backend = args.wait_backend
+    WebDriverFactory.bidi_enabled = args.wait_backend == "bidi"
+    SeleniumDriver.element_cache_enabled = args.element_cache
+    profiles = args.launch_profile or [resolve_profile_name(args.browser)]
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    for launch_profile in profiles:
+        driver, launch_seconds = _launch(args.browser, launch_profile)
+        log.info(f"Launch profile '{launch_profile}' started in {launch_seconds} seconds.")
+        try:
+            driver.implicitly_wait(0)
+            SeleniumDriver.animations_disabled = args.no_animations and install_no_animations(driver)
+            pages = measure_page_timings(driver)
+            results = run_benchmarks(driver, args.iterations, args.failure_iterations, args.failure_timeout, args.only)
+            if not args.only or any("journey" in pattern for pattern in args.only):
+                results.update(run_journey_benchmarks(driver, args.iterations))
+            if args.pool_profile:
+                results.update(run_pool_benchmarks(driver, args.pool_profile, args.iterations, args.pool_threads))
+            browser_version = driver.capabilities.get("browserVersion")
+        finally:
+            driver.quit()
+
+        label = args.label if len(profiles) == 1 else f"{args.label}-{launch_profile}"
+        output_path = os.path.join(args.output_dir, f"{label}.json")
+        with open(output_path, "w") as f:
+            json.dump({
+                "label": label,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "git_revision": _git_revision(),
+                "browser": args.browser,
+                "browser_version": browser_version,
+                "launch_profile": launch_profile,
+                "launch_seconds": launch_seconds,
+                "pages": pages,
+                "wait_backend": args.wait_backend,
+                "element_cache": args.element_cache,
+                "no_animations": SeleniumDriver.animations_disabled,
+                "results": results,
+            }, f, indent=2)
+        log.info(f"Benchmark results written to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
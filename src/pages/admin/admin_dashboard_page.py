@@ -5,12 +5,37 @@ from base.selenium_driver import SeleniumDriver
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import utilities.custome_logger as cl
+from base.js_locators import ADMIN_CHANGE_LIST_JS, ADMIN_BULK_ACTION_JS, ADMIN_CHANGE_FORMS_SUBMIT_JS
+import utilities.event_log as event_log
+from urllib.parse import urlencode
 import time # Import time for potential short sleeps
+import re
 
 class AdminDashboardPage(SeleniumDriver):
 
     log = cl.CustomLogger(logging.DEBUG)
 
+    # Sidebar links to the change list of each model; their hrefs give the change list URLs
+    _CHANGELIST_LINKS = {
+        "users": "//a[./p[normalize-space()='User Profiles']]",
+        "courses": "//a[./p[normalize-space()='Teacher Courses']]",
+    }
+    # Columns that identify a record, besides the text of its change link. Other cells (full names,
+    # flags, dates) are shared by many rows and are never indexed.
+    _IDENTIFYING_FIELDS = {
+        "users": ("username", "email"),
+        "courses": ("title",),
+    }
+    # Shared by every instance in the session:
+    # {(base URL, model): change list URL} and {change list URL: {key: {"pk", "url"}, or None when
+    # several rows have that key}}
+    _changelist_urls = {}
+    _record_index = {}
+
+    PUBLISH_COURSES_ACTION = "Mark selected as Published (Available to Customers)"
+    # Django admin's default list_per_page: the boxes a "Select all" POST carries
+    CHANGE_LIST_PAGE_SIZE = 100
+
     def __init__(self, driver, base_url):
         super().__init__(driver, base_url) # Pass base_url to super() if SeleniumDriver uses it
         self.driver = driver # Redundant but harmless, as super().__init__ already sets it
@@ -68,6 +93,9 @@ class AdminDashboardPage(SeleniumDriver):
         self._is_teacher_approved_checkbox = "//input[@id='id_is_teacher_approved']"
         self._save_button_generic = "//input[@type='submit' and @value='Save']" # Renamed to avoid conflict if you have a specific 'Save' for commission
         self._successful_change_message_generic = "//li[contains(@class, 'success') and contains(text(), 'was changed successfully')]" # Renamed
+        # The admin's answer to a submitted change form
+        self._admin_success_message = "//div[contains(@class, 'alert-success')] | //ul[contains(@class, 'messagelist')]/li[contains(@class, 'success')]"
+        self._admin_error_message = "//p[contains(@class, 'errornote')] | //div[contains(@class, 'alert-danger')] | //ul[contains(@class, 'messagelist')]/li[contains(@class, 'error')]"
 
     def is_on_dashboard_page(self):
         """
@@ -130,13 +158,162 @@ class AdminDashboardPage(SeleniumDriver):
             self.take_screenshot(f"user_status_icon_not_found_{email}_{status_type}_{self.get_current_timestamp()}.png")
             return None
 
+    ##############################################
+    ### Change list search, filters and index ###
+    ##############################################
+    def get_changelist_url(self, model):
+        """
+        Returns the change list URL of "users" or "courses", read once from the admin sidebar.
+        """
+        if (self.base_url, model) in self._changelist_urls:
+            return self._changelist_urls[(self.base_url, model)]
+        link_locator = self._CHANGELIST_LINKS[model]
+        # A plain probe: no failure log or screenshot, and no implicit wait on the usual miss
+        implicit_wait = self.driver.timeouts.implicit_wait
+        self.driver.implicitly_wait(0)
+        try:
+            on_admin_page = bool(self.driver.find_elements(By.XPATH, link_locator))
+        finally:
+            self.driver.implicitly_wait(implicit_wait)
+        if not on_admin_page:
+            self.driver.get(f"{self.base_url}/admin/")
+        link = self.get_element(link_locator, "xpath", timeout=5)
+        if not link:
+            self.log.error(f"Could not find the sidebar link to the {model} change list.")
+            return None
+        url = link.get_attribute("href").split("?", 1)[0]
+        self._changelist_urls[(self.base_url, model)] = url
+        self.log.info(f"Change list URL for {model}: {url}")
+        return url
+
+    def _fetch_change_list(self, url):
+        """Fetches and parses a change list inside the browser. Returns its rows, or None on error."""
+        try:
+            result = self.driver.execute_async_script(ADMIN_CHANGE_LIST_JS, url)
+        except Exception as e:
+            self.log.error(f"Could not fetch change list {url}: {e}")
+            return None
+        if result.get("error"):
+            self.log.error(f"Could not fetch change list {url}: {result['error']}")
+            return None
+        if result.get("paginated"):
+            self.log.warning(f"Change list {url} is still paginated; records past the first page are found by search.")
+        return result["rows"]
+
+    def _row_keys(self, model, row):
+        """The identifying texts of a change list row: its link text and the model's identifying columns."""
+        keys = {row["link"]} | {row["fields"].get(field) for field in self._IDENTIFYING_FIELDS.get(model, ())}
+        return {key for key in keys if key}
+
+    def _index_rows(self, model, index, rows):
+        """Adds the rows to the index. A key found on rows of different records maps to None (ambiguous)."""
+        for row in rows:
+            if not row["url"]:
+                continue
+            for key in self._row_keys(model, row):
+                record = {"pk": row["pk"], "url": row["url"]}
+                if key in index and index[key] != record:
+                    index[key] = None
+                else:
+                    index[key] = record
+
+    def build_record_index(self, model):
+        """
+        Maps the identifying texts of each record (username and email, course title) to the
+        record's pk and change URL, from a single fetch of the whole list (?all=).
+        """
+        changelist_url = self.get_changelist_url(model)
+        if not changelist_url:
+            return None
+        start_time = time.time()
+        rows = self._fetch_change_list(f"{changelist_url}?all=")
+        if rows is None:
+            return None
+        index = {}
+        self._index_rows(model, index, rows)
+        self._record_index[changelist_url] = index
+        self.log.info(f"Indexed {len(rows)} {model} in {time.time() - start_time:.2f} seconds.")
+        return index
+
+    def find_record(self, model, key):
+        """
+        Looks a record up by its identifying text (username, email or course title).
+        Misses are searched with ?q= and added to the index. Keys shared by several records
+        are always searched, and only an exact match on a single record is returned.
+
+        Returns:
+            dict: {"pk", "url"} of the record, or None if the change list has no such record.
+        """
+        changelist_url = self.get_changelist_url(model)
+        if not changelist_url:
+            return None
+        index = self._record_index.get(changelist_url)
+        if index is None:
+            index = self.build_record_index(model) or {}
+        if index.get(key):
+            return index[key]
+        rows = self._fetch_change_list(f"{changelist_url}?{urlencode({'q': key})}") or []
+        matches = {row["pk"]: row for row in rows if row["url"] and key in self._row_keys(model, row)}
+        if len(matches) > 1:
+            self.log.error(f"'{key}' matches {len(matches)} {model} records; refusing to pick one.")
+            return None
+        if not matches:
+            return None
+        row = next(iter(matches.values()))
+        record = {"pk": row["pk"], "url": row["url"]}
+        if key not in index:
+            index[key] = record
+            self._record_index[changelist_url] = index
+        return record
+
+    def forget_record(self, model, key):
+        index = self._record_index.get(self._changelist_urls.get((self.base_url, model)), {})
+        index.pop(key, None)
+
+    def open_change_page(self, model, *keys):
+        """
+        Opens /admin/<app>/<model>/<pk>/change/ for the first key found in the index.
+
+        Returns:
+            bool: True if a change page was opened.
+        """
+        for key in keys:
+            record = self.find_record(model, key)
+            if not record:
+                continue
+            self.driver.get(record["url"])
+            if "/change/" in self.driver.current_url:
+                self.log.info(f"Opened change page of {model} '{key}': {record['url']}")
+                return True
+            # Deleted since it was indexed (e.g. the SUT database was restored): look it up again once
+            self.forget_record(model, key)
+            record = self.find_record(model, key)
+            if record:
+                self.driver.get(record["url"])
+                return "/change/" in self.driver.current_url
+        self.log.error(f"No {model} record found for {keys}.")
+        return False
+
+    def search_change_list(self, model, term):
+        """Opens the change list filtered by Django admin search (?q=)."""
+        return self.filter_change_list(model, q=term)
+
+    def filter_change_list(self, model, **filters):
+        """Opens the change list with list filters as query parameters, e.g. is_published__exact=0."""
+        changelist_url = self.get_changelist_url(model)
+        if not changelist_url:
+            return False
+        self.driver.get(f"{changelist_url}?{urlencode(filters)}" if filters else changelist_url)
+        return True
+
     def change_user_status_and_commission(self, user_email, new_approval_status=None, commission_value=None):
         
-        self.log.info(f"Selecting checkbox for course: {user_email}")
-        locator_1 = self.teadher_user_name(user_email)
-        
-        self.click_element(locator_1, "xpath")
-        time.sleep(1)
+        self.log.info(f"Opening change page for user: {user_email}")
+        # Straight to the user's /change/ URL; the list link is only there while the user is on the first page
+        if not self.open_change_page("users", user_email, user_email.split('@')[0]):
+            locator_1 = self.teadher_user_name(user_email)
+            self.click_element(locator_1, "xpath")
+            time.sleep(1)
         self.click_element(self.teacher_app_status_tabe, "xpath")
         time.sleep(1)
         self.send_keys_element(commission_value, self.commitin_input_text, "xpath")
@@ -146,6 +323,23 @@ class AdminDashboardPage(SeleniumDriver):
       
     
 
+    def wait_for_teacher_approved(self, user_email, timeout=15):
+        """
+        Waits for the admin's answer to the approval, then for the user's change list row to show
+        the teacher as approved.
+
+        Returns:
+            bool: True once the change list shows the teacher approved.
+        """
+        outcome = self.wait_for_any({"saved": (self._admin_success_message, "xpath"),
+                                     "error": (self._admin_error_message, "xpath")}, timeout=timeout)
+        if outcome != "saved":
+            self.log.error(f"Approving {user_email} was not confirmed by the admin (outcome: {outcome}).")
+            return False
+        self.search_change_list("users", user_email)
+        approved_icon = f"{self._user_row_by_email(user_email)}/td[4]//img[@alt='True']"
+        return self.wait_for_any({"approved": (approved_icon, "xpath")}, timeout=timeout) == "approved"
+
     def navigate_to_teacher_courses_page(self):
         """Navigates to the section where teacher-added courses are managed."""
         self.log.info("Navigating to Teacher Courses page.")
@@ -188,6 +382,10 @@ class AdminDashboardPage(SeleniumDriver):
         """Selects the checkbox next to a specific course in the list."""
         self.log.info(f"Selecting checkbox for course: {course_name}")
         locator = self._course_checkbox_by_name(course_name)
+        record = self.find_record("courses", course_name)
+        if record and record["pk"] and self.search_change_list("courses", course_name):
+            # The search keeps the course's row on the first page however long the list gets
+            locator = f"//input[@name='_selected_action' and @value='{record['pk']}']"
         try:
             # CORRECTED: Use self.click_element instead of self.element_click
             if self.click_element(locator, "xpath"):
@@ -233,4 +431,170 @@ class AdminDashboardPage(SeleniumDriver):
         except Exception as e:
             self.log.error(f"An unexpected error occurred clicking 'Go' button: {e}")
             self.take_screenshot("click_go_button_exception.png")
-            return False
\ No newline at end of file
+            return False
+
+    ##########################
+    ### Bulk admin actions ###
+    ##########################
+    def _run_batch_script(self, script, *args, timeout=30):
+        """Runs an async script with a script timeout long enough for a whole batch, then restores it."""
+        previous_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(max(timeout, previous_timeout))
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+
+    def _report_batch(self, summary, number, total, records, ok, seconds, messages):
+        per_second = round(records / seconds, 2) if seconds else None
+        summary["batches"].append({"batch": number, "records": records, "ok": ok, "seconds": round(seconds, 3),
+                                   "per_second": per_second, "messages": messages})
+        self.log.info(f"{summary['action']} batch {number}/{total}: {records} {summary['model']} in {seconds:.2f}s "
+                      f"({per_second} records/s){'' if ok else ' FAILED: ' + '; '.join(messages)}")
+        event_log.emit({"ts": round(time.time(), 3), "test": event_log.current_test_id(), "page": type(self).__name__,
+                        "method": summary["action"], "action": "bulk_batch", "model": summary["model"],
+                        "batch": number, "records": records, "duration_ms": round(seconds * 1000, 2),
+                        "outcome": "ok" if ok else "fail"})
+
+    @staticmethod
+    def _finish_summary(summary, start_time):
+        summary["seconds"] = round(time.time() - start_time, 3)
+        summary["per_second"] = round(summary["succeeded"] / summary["seconds"], 2) if summary["seconds"] else None
+
+    def _changed_count(self, messages, sent):
+        """Number of records the admin reports in its result message ("3 courses were published.")."""
+        for message in messages or []:
+            match = re.search(r"\b(\d+)\b", message)
+            if match:
+                return int(match.group(1))
+        self.log.warning(f"No record count in the admin's result messages {messages}; "
+                         f"counting none of the {sent} records sent as changed.")
+        return 0
+
+    def _resolve_records(self, model, keys, summary):
+        """Returns [(key, record)] for the keys found in the index; the others go to summary["missing"]."""
+        found = []
+        for key in keys:
+            record = self.find_record(model, key)
+            if record and record["pk"]:
+                found.append((key, record))
+            else:
+                summary["missing"].append(key)
+        if summary["missing"]:
+            self.log.error(f"No {model} record found for {summary['missing']}.")
+        return found
+
+    def run_bulk_action(self, model, action_text, keys=None, batch_size=200, **filters):
+        """
+        Runs a change list action (the action dropdown + Go) on many records, without opening
+        the list or ticking boxes: each batch is one POST sent from the browser session.
+
+        With keys (e.g. course titles or emails) the records are looked up in the index and sent
+        batch_size pks at a time. Without keys the action runs once on every record matching the
+        list filters, like ticking "Select all N" across pages (select_across).
+
+        Returns:
+            dict: {"action", "model", "records", "succeeded", "failed", "missing", "seconds",
+            "per_second", "batches"}; failed and missing list the keys concerned.
+        """
+        summary = {"action": action_text, "model": model, "records": 0, "succeeded": 0, "failed": [],
+                   "missing": [], "seconds": None, "per_second": None, "batches": []}
+        changelist_url = self.get_changelist_url(model)
+        if not changelist_url:
+            return summary
+        start_time = time.time()
+
+        if keys is None:
+            list_url = f"{changelist_url}?{urlencode(filters)}" if filters else changelist_url
+            rows = self._fetch_change_list(f"{changelist_url}?{urlencode(dict(filters, all=''))}") or []
+            summary["records"] = len(rows)
+            if not rows:
+                self.log.info(f"{action_text}: no {model} match {filters}.")
+                self._finish_summary(summary, start_time)
+                return summary
+            batch_start = time.time()
+            # select_across acts on every match, but Django only runs it when some pk is posted
+            first_page = [row["pk"] for row in rows if row["pk"]][:self.CHANGE_LIST_PAGE_SIZE]
+            result = self._run_batch_script(ADMIN_BULK_ACTION_JS, list_url, action_text, first_page, True)
+            ok = bool(result and result.get("ok"))
+            if ok:
+                # What the action changed, not how many rows the separate ?all= fetch saw
+                summary["succeeded"] = self._changed_count(result.get("messages"), len(rows))
+            self._report_batch(summary, 1, 1, len(rows), ok, time.time() - batch_start,
+                               (result or {}).get("messages") or [(result or {}).get("error") or "no result"])
+            self._finish_summary(summary, start_time)
+            return summary
+
+        records = self._resolve_records(model, keys, summary)
+        summary["records"] = len(records)
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+        for number, batch in enumerate(batches, start=1):
+            batch_start = time.time()
+            try:
+                result = self._run_batch_script(ADMIN_BULK_ACTION_JS, changelist_url, action_text,
+                                                [record["pk"] for _, record in batch], False)
+            except Exception as e:
+                result = {"ok": False, "messages": [], "error": str(e)}
+            result = result or {}
+            ok = bool(result.get("ok"))
+            if ok:
+                summary["succeeded"] += self._changed_count(result.get("messages"), len(batch))
+            else:
+                summary["failed"].extend(key for key, _ in batch)
+            self._report_batch(summary, number, len(batches), len(batch), ok, time.time() - batch_start,
+                               result.get("messages") or [result.get("error") or "no result"])
+        self._finish_summary(summary, start_time)
+        self.log.info(f"{action_text}: {summary['succeeded']}/{len(keys)} {model} in {summary['seconds']}s "
+                      f"({summary['per_second']} records/s)")
+        return summary
+
+    def publish_courses(self, course_names=None, batch_size=200, **filters):
+        """Publishes the named courses, or every course matching the filters (e.g. is_published__exact=0)."""
+        return self.run_bulk_action("courses", self.PUBLISH_COURSES_ACTION, course_names, batch_size, **filters)
+
+    def approve_teachers(self, emails, commission_value, batch_size=25):
+        """
+        Approves many teachers with the given commission. There is no change list action for this,
+        so each teacher's change form is submitted with "Approve Teacher", batch_size forms per
+        in-browser script instead of several clicks per teacher.
+
+        Returns:
+            dict: Same shape as run_bulk_action().
+        """
+        summary = {"action": "Approve Teacher", "model": "users", "records": 0, "succeeded": 0, "failed": [],
+                   "missing": [], "seconds": None, "per_second": None, "batches": []}
+        start_time = time.time()
+        records = []
+        for email in emails:
+            record = self.find_record("users", email) or self.find_record("users", email.split('@')[0])
+            if record:
+                records.append((email, record))
+            else:
+                summary["missing"].append(email)
+        if summary["missing"]:
+            self.log.error(f"No users record found for {summary['missing']}.")
+        summary["records"] = len(records)
+
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+        for number, batch in enumerate(batches, start=1):
+            batch_start = time.time()
+            try:
+                results = self._run_batch_script(
+                    ADMIN_CHANGE_FORMS_SUBMIT_JS, [record["url"] for _, record in batch],
+                    {"commission_percentage": str(commission_value)}, "_approve_teacher",
+                    timeout=5 * len(batch))
+            except Exception as e:
+                results = [{"ok": False, "messages": [str(e)]} for _ in batch]
+            messages = []
+            for (email, _), result in zip(batch, results):
+                if result.get("ok"):
+                    summary["succeeded"] += 1
+                else:
+                    summary["failed"].append(email)
+                    messages.append(f"{email}: {' '.join(result.get('messages') or [])}")
+            self._report_batch(summary, number, len(batches), len(batch), not messages,
+                               time.time() - batch_start, messages)
+        self._finish_summary(summary, start_time)
+        self.log.info(f"Approved {summary['succeeded']}/{len(emails)} teachers in {summary['seconds']}s "
+                      f"({summary['per_second']} records/s)")
+        return summary
@@ -49,10 +49,14 @@ class AdminLoginPage(SeleniumDriver):
         self.enter_password(password)
         self.click_login_button()
         
-        if self.is_element_visible(self._error_message, locatorType="xpath", timeout=2):
+        # One wait for whichever page comes back: the error message or the dashboard
+        outcome = self.wait_for_any({"error": (self._error_message, "xpath"),
+                                     "dashboard": (self._dashboard_header, "xpath")},
+                                    timeout=10, visible=True)
+        if outcome == "error":
             print("Login failed: Error message visible.")
             return False
-        elif self.is_element_visible(self._dashboard_header, locatorType="xpath", timeout=10):
+        elif outcome == "dashboard":
             print("Admin login successful.")
             return True
         else:
@@ -81,7 +85,8 @@ class AdminLoginPage(SeleniumDriver):
 
             if profile_dropdown_clicked:
                 print("Clicked profile dropdown trigger.")
-                time.sleep(0.5)
+                if not self.animations_disabled:
+                    time.sleep(0.5) # Dropdown slides open
 
                 if not self.click_element(self._logout_button_locator, locatorType="xpath", timeout=10):
                     print(f"Failed to click logout button: '{self._logout_button_locator}'")
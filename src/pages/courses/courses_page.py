@@ -44,6 +44,8 @@ class CoursesPage(SeleniumDriver):
         self._card_expiry_year_selector = "//select[@id='id_expiry_year']" # Assuming this is the correct ID
         self._pay_button = "//button[normalize-space()='Pay Now']"
         self._enroll_error_message = "//div[@role='alert']" # Common locator for alert messages
+        # Any page without the payment form: a successful payment leaves it, a failed one renders it again
+        self._enrolled_page = "//body[not(.//button[normalize-space()='Pay Now'])]"
         self._all_courses_cards = "//div[@class='course-card']" # Changed name for clarity
     # Locator for the welcome pop-up's close button, based on your screenshot inspection
     # This is an HTML element, not a browser-native alert.
@@ -248,7 +250,10 @@ class CoursesPage(SeleniumDriver):
         # after the Course Detail page/modal loads.
         #self.webScroll("down")
         self.webScroll("down")
-        time.sleep(4) 
+        # The details page is still loading after the navigation; wait for it instead of a fixed sleep
+        self.wait_for_page_load()
+        self.get_element(self._register_button, locatorType="xpath", timeout=15,
+                         condition=EC.visibility_of_element_located)
         self.click_register_course()
         
         # Scroll down again if needed for the payment form fields
@@ -264,7 +269,9 @@ class CoursesPage(SeleniumDriver):
         Verifies if an enrollment error message is displayed.
         """
         self.log.info("Verifying if enrollment failed message is present.")
-        # Using the new isElementVisible which internally uses get_element and handles exceptions
-        result = self.is_element_visible(locator=self._enroll_error_message, locatorType="xpath")
+        # Returns as soon as either the alert renders or the payment form is gone
+        outcome = self.wait_for_any({"failed": (self._enroll_error_message, "xpath"),
+                                     "enrolled": (self._enrolled_page, "xpath")}, timeout=10, visible=True)
+        result = outcome == "failed"
         self.log.info(f"Enrollment failed message visible: {result}")
         return result
@@ -63,11 +63,15 @@ class LoginPage(SeleniumDriver):
         return is_logged_in
     
     def verify_login_faild(self):
-        is_not_logged_in = self.is_element_present(self.error_message_login_locator, locatorType="xpath")
+        # Returns as soon as either the error message or the Logout link shows up
+        outcome = self.wait_for_any({"failed": (self.error_message_login_locator, "xpath"),
+                                     "logged_in": (self.logout_link_locator, "xpath")}, timeout=5)
+        is_not_logged_in = outcome == "failed"
         return is_not_logged_in
     
     def verify_logout_success(self):
-        is_not_logged_out = self.is_element_present(self.login_button_locator, locatorType="xpath")
+        outcome = self.wait_for_any({"logged_out": (self.login_button_locator, "xpath")}, timeout=5)
+        is_not_logged_out = outcome == "logged_out"
         return is_not_logged_out
     
     
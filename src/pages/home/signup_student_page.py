@@ -2,6 +2,7 @@ from selenium.webdriver.common.by import By
 from base.selenium_driver import SeleniumDriver
 import utilities.custome_logger as cl
 import logging
+from base.journey import Journey, Step, fill, click, upload
 
 class SignupPage(SeleniumDriver):
     def __init__(self, driver, base_url):
@@ -69,6 +70,10 @@ class SignupPage(SeleniumDriver):
     def signup_student(self, username="", email="", full_name_ar="", full_name_en="",
                        password="", password_2="", profile_image="",
                        bio=""):
+        if self.journeys_enabled:
+            self.signup_student_journey(username, email, full_name_ar, full_name_en, password,
+                                        password_2, profile_image, bio).run_or_raise()
+            return
         self.click_login_link()
         self.click_signup_link()
         self.enter_username(username)
@@ -82,5 +87,25 @@ class SignupPage(SeleniumDriver):
         self.enter_user_profile_image(profile_image)
         self.enter_bio(bio)
         self.cick_signup_button()
+
+    def signup_student_journey(self, username, email, full_name_ar, full_name_en, password,
+                               password_2, profile_image, bio):
+        return Journey(self, "signup_student", [
+            Step("open login", [click(self.login_link_locator, "xpath")],
+                 wait_for=(self.signup_link_locator, "xpath")),
+            Step("open sign up", [click(self.signup_link_locator, "xpath")],
+                 wait_for=(self.user_name_input_locator, "xpath")),
+            Step("sign up form", [
+                fill(self.user_name_input_locator, "xpath", username),
+                fill(self.user_emil_imput_locator, "xpath", email),
+                fill(self.user_full_name_en_locator, "xpath", full_name_en),
+                fill(self.user_full_name_ar_locator, "xpath", full_name_ar),
+                fill(self.user_password_input_locator, "xpath", password),
+                fill(self.user_password_input_locator2, "xpath", password_2),
+                upload(self._user_profile_image_input_locator, "xpath", profile_image),
+                fill(self.user_bio_input_locator, "xpath", bio),
+                click(self.submitt_button_locator, "xpath"),
+            ]),
+        ])
         
     
\ No newline at end of file
@@ -7,6 +7,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, NoAlertPresentException, StaleElementReferenceException
 import time 
+from base.journey import Journey, Step, fill, select, click, upload
 
 
 class CourseAddingPage(SeleniumDriver):
@@ -126,6 +127,10 @@ class CourseAddingPage(SeleniumDriver):
     def add_new_course(self, course_title="", course_describtion="", course_price=0.0, 
                        course_language="",course_level="", 
                        course_image_location = "", course_video_link=""):
+        if self.journeys_enabled:
+            self.add_new_course_journey(course_title, course_describtion, course_price, course_language,
+                                        course_level, course_image_location, course_video_link).run_or_raise()
+            return
         self.click_add_new_course_button()
         self.enter_course_title(course_title)
         self.enter_course_description(course_describtion)
@@ -136,6 +141,24 @@ class CourseAddingPage(SeleniumDriver):
         self.enter_course_image_location(course_image_location)
         self.enter_course_video_link(course_video_link)
         self.click_course_add_submit()
+
+    def add_new_course_journey(self, course_title, course_describtion, course_price, course_language,
+                               course_level, course_image_location, course_video_link):
+        return Journey(self, "add_new_course", [
+            Step("open form", [click(self.add_new_course_button, "xpath")],
+                 wait_for=(self.course_title_locator, "xpath")),
+            Step("course details", [
+                fill(self.course_title_locator, "xpath", course_title),
+                fill(self.course_describtion_locator, "xpath", course_describtion),
+                fill(self.course_price_locator, "id", course_price),
+                select(self.course_language_list, "xpath", course_language),
+                click(self.course_category_2, "id"),
+                select(self.course_level_locator, "id", course_level),
+                upload(self.course_image_locator, "id", course_image_location),
+                fill(self.course_video_link_locator, "id", course_video_link),
+                click(self.submit_adding_of_course, "xpath"),
+            ], wait_for=(self.successull_adding_course_meesaage, "xpath")),
+        ])
         
     def verify_adding_course_succssed(self):
         """
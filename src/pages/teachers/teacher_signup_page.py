@@ -7,6 +7,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, NoAlertPresentException, StaleElementReferenceException
 import time 
+from base.journey import Journey, Step, fill, click
 class TeacherSignPage(SeleniumDriver):
 
     def __init__(self, driver, base_url):
@@ -292,6 +293,11 @@ class TeacherSignPage(SeleniumDriver):
                      year_of_exp="", university_attend="", graduate_year="", 
                      major_study="", bio_teacher="", password="", password_2=""):
         
+        if self.journeys_enabled:
+            self.teacher_join_journey(full_name_en, full_name_ar, email, phone_number, year_of_exp,
+                                      university_attend, graduate_year, major_study, bio_teacher,
+                                      password, password_2).run_or_raise()
+            return
         self.enter_basic_teacher_info(full_name_en, full_name_ar, email, phone_number)
         self.click_next_to_teacher_info()
         self.enter_profesional_teacher_info(year_of_exp, university_attend, graduate_year,
@@ -301,6 +307,37 @@ class TeacherSignPage(SeleniumDriver):
         self.enter_teacher_password(password, password_2)
         self.click_submit_password_set()
 
+    def teacher_join_journey(self, full_name_en, full_name_ar, email, phone_number, year_of_exp,
+                             university_attend, graduate_year, major_study, bio_teacher, password, password_2):
+        """
+        The four wizard steps of teacher_join as a Journey: one script and one wait per step.
+        """
+        return Journey(self, "teacher_join", [
+            Step("basic information", [
+                fill(self._full_name_en_input, "xpath", full_name_en),
+                fill(self._full_name_ar_input, "xpath", full_name_ar),
+                fill(self._email_input, "xpath", email),
+                fill(self._phone_number, "xpath", phone_number),
+                click(self._next_teacher_info_butt, "xpath"),
+            ], wait_for=(self._year_of_experince_input, "xpath")),
+            Step("professional details", [
+                fill(self._year_of_experince_input, "xpath", year_of_exp),
+                fill(self._university_input, "xpath", university_attend),
+                fill(self._graduate_year_input, "xpath", graduate_year),
+                fill(self._specialization_input, "xpath", major_study),
+                fill(self._bio_input, "xpath", bio_teacher),
+                click(self._next_button, "xpath"),
+            ], wait_for=(self._submit_button, "xpath")),
+            Step("review", [
+                click(self._submit_button, "xpath"),
+            ], wait_for=(self._password_input, "xpath")),
+            Step("password", [
+                fill(self._password_input, "xpath", password),
+                fill(self._password_input_2, "xpath", password_2),
+                click(self._set_password, "xpath"),
+            ], wait_for=(self._success_joining_message, "xpath")),
+        ])
+
 
     def verify_joining_succssed(self):
        
@@ -8,6 +8,7 @@ from pages.teachers.add_course_page import CourseAddingPage
 from pages.admin.admin_login_page import AdminLoginPage
 from pages.admin.admin_dashboard_page import AdminDashboardPage
 import time
+from utilities.test_data import unique_suffix
 
 
 @pytest.mark.usefixtures("oneTimeSetUp", "setUp")
@@ -35,8 +36,8 @@ class TestAdminCoursePublishing(unittest.TestCase):
     def test_valid_course_added(self):
         
         self.home_page.go_to_Teacher_Dashboard_page()
-        course_name = "testing_course" + str(int(time.time()))
-        course_description  = "We are adding random course for testing !" + str(int(time.time())) # A strong unique password
+        course_name = "testing_course" + unique_suffix()
+        course_description  = "We are adding random course for testing !" + unique_suffix() # A strong unique password
         course_price = int(time.time()/100000)
         course_language = "English"
         course_level = "Advanced"
@@ -90,4 +91,27 @@ class TestAdminCoursePublishing(unittest.TestCase):
        
 
             
-    
\ No newline at end of file
+    
+
+    @pytest.mark.run(order=2)
+    def test_bulk_publish_courses(self):
+        # publish_courses sends the change list action as one POST; the courses must come out published
+        course_names = [f"bulk_course_{number}_{unique_suffix()}" for number in range(2)]
+        for course_name in course_names:
+            self.home_page.go_to_Teacher_Dashboard_page()
+            self.course_page.add_new_course(course_name, "Bulk publishing test course " + unique_suffix(),
+                                            int(time.time()/100000), "English", "Advanced",
+                                            "/home/majd/Documents/Majd-Personal-Work/majd.kassem.business_qa/images/student_1.jpg",
+                                            "https://www.google.co.uk/")
+            assert self.course_page.verify_adding_course_succssed() is True
+        self.login_page.logout()
+
+        self.admin_login_page.admin_login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
+        summary = self.admin_dashboard_page.publish_courses(course_names)
+
+        assert summary["succeeded"] == len(course_names), f"Bulk publish failed: {summary}"
+        assert summary["failed"] == [] and summary["missing"] == []
+        for course_name in course_names:
+            self.admin_dashboard_page.search_change_list("courses", course_name)
+            assert self.admin_dashboard_page.get_course_published_status(course_name) == "True"
+        self.admin_login_page.logout()
@@ -8,7 +8,9 @@ from base.selenium_driver import SeleniumDriver
 from pages.teachers.teacher_signup_page import TeacherSignPage
 from pages.home.login_page import LoginPage
 from pages.home.home_page import HomePage
+from base.async_driver import AsyncBrowser, run_concurrently
 import random
+from utilities.test_data import account_tag
 
 
 @pytest.mark.usefixtures("oneTimeSetUp", "setUp")
@@ -20,9 +22,10 @@ class TestAdminDashboardFeatures(unittest.TestCase):
     commission_value = "42"
     # classSetup will now return a tuple of initialized page objects
     @pytest.fixture(autouse=True)
-    def objectSetup(self, oneTimeSetUp, base_url_from_cli):
+    def objectSetup(self, oneTimeSetUp, base_url_from_cli, driver_factory):
         
         self.base_url = base_url_from_cli
+        self.driver_factory = driver_factory
         self.join_as_teacher_page = TeacherSignPage(self.driver, self.base_url)
 
         self.admin_login_page = AdminLoginPage(self.driver, self.base_url)
@@ -34,72 +37,110 @@ class TestAdminDashboardFeatures(unittest.TestCase):
         self.loginpage = LoginPage(self.driver, self.base_url)
 
 
-    @pytest.mark.run(order=1)
-    def test_admin_approves_pending_teacher(self):
-        
-        self.home_page.go_to_teacher_signup_page()
-        
+    def _new_pending_teacher(self):
+        """Sign-up data of a teacher no other test or matrix browser uses."""
         timestamp_suffix = str(int(time.time() * 1000))[-4:]
         random_suffix = random.randint(1, 999)
-        unique_id = f"{timestamp_suffix}{random_suffix}"
-        pending_teacher_email = f"P_Teacher_{unique_id}@kuwaitnet.email"
-        username_login = f"P_Teacher_{unique_id}"
-        #pending_teacher_email = "pending_teacher_" + str(int(time.time())) + "@kuwaitnet.email"
-        pending_teacher_password = "Dinamo12@" # A strong unique password
-
-       # 1. Teacher Signup
-        self.join_as_teacher_page.teacher_join(
-            full_name_en="Kuwaitnet",
-            full_name_ar="كويت نت",
-            email=pending_teacher_email,
-            phone_number="00965957708653",
-            year_of_exp="12",
-            university_attend="Damascus University",
-            graduate_year="2009",
-            major_study="Math",
-            bio_teacher="We build people mind",
-            password=pending_teacher_password,
-            password_2=pending_teacher_password,
+        unique_id = f"{timestamp_suffix}{random_suffix}{account_tag()}"
+        email = f"P_Teacher_{unique_id}@kuwaitnet.email"
+        password = "Dinamo12@" # A strong unique password
+        return {
+            "email": email,
+            "username": f"P_Teacher_{unique_id}",
+            "password": password,
+            "join": dict(
+                full_name_en="Kuwaitnet",
+                full_name_ar="كويت نت",
+                email=email,
+                phone_number="00965957708653",
+                year_of_exp="12",
+                university_attend="Damascus University",
+                graduate_year="2009",
+                major_study="Math",
+                bio_teacher="We build people mind",
+                password=password,
+                password_2=password,
+            ),
+        }
+
+    def _approve_teacher(self, admin_dashboard_page, teacher):
+        admin_dashboard_page.navigate_to_user_management()
+        admin_dashboard_page.change_user_status_and_commission(
+            teacher["email"], commission_value=self.commission_value
         )
+        assert admin_dashboard_page.wait_for_teacher_approved(teacher["email"]) is True
+
+    def _teacher_logs_in(self, teacher):
+        self.driver.get(self.base_url)
+        self.loginpage.login(teacher["username"], teacher["password"])
+        return self.loginpage.verify_login_success()
+
+    @pytest.mark.run(order=1)
+    def test_admin_approves_pending_teacher(self):
+        teacher = self._new_pending_teacher()
+
+        # 1. Teacher Signup
+        self.home_page.go_to_teacher_signup_page()
+        self.join_as_teacher_page.teacher_join(**teacher["join"])
         self.join_as_teacher_page.verify_joining_succssed()
 
         # 2. Admin Login
         self.admin_login_page.admin_login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
 
         # 3. Admin Approves Teacher
-        self.admin_dashboard_page.navigate_to_user_management()
-        self.admin_dashboard_page.change_user_status_and_commission(
-            pending_teacher_email, commission_value=self.commission_value
-        )
-        time.sleep(5) # A short pause after approval, just in case of backend latency
+        self._approve_teacher(self.admin_dashboard_page, teacher)
 
         # 4. Admin Logout
         self.admin_login_page.logout()
-         # Navigate back to base URL after logout
 
-        # 5. DUMMY LOGIN TO TRIGGER ACTIVATION / CLEAR STATE (NEW STEP)
-        # Use a known, reliable account for this, e.g., a student or even admin again.
-        # This simulates what you found manually.
-        # For example, create a dummy student account if you have one, or just re-login as admin.
-        
-        # Option A: Re-login as Admin (briefly)
-        #self.loginpage.login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
+        # 5. Teacher Login
+        assert self._teacher_logs_in(teacher) is True
 
-        #time.sleep(2) # Short pause
-        #self.loginpage.logout() # Logout the admin again
-        
+    @pytest.mark.run(order=2)
+    def test_admin_approves_pending_teacher_concurrently(self):
+        # Same flow as above, but the teacher signs up while the admin logs in from a second browser session
+        teacher = self._new_pending_teacher()
 
-        # Option B: Use a dummy student account (if your app has one)
-        # dummy_student_email = "dummy.student@example.com"
-        # dummy_student_password = "Password123!"
-        # self.loginpage.login(dummy_student_email, dummy_student_password)
-        # self.loginpage.verify_login_success_student() # Assuming you have a method to verify student login
-        # time.sleep(2)
-        # self.loginpage.logout() # Logout the dummy student
-        # self.driver.get(self.base_url)
-        self.driver.get(self.base_url)
-        # 6. Attempt Teacher Login
-        self.loginpage.login(username_login, pending_teacher_password)
-        result = self.loginpage.verify_login_success() # This should now pass!
+        teacher_browser = AsyncBrowser(self.driver, self.base_url)
+        admin_browser = AsyncBrowser(self.driver_factory(), self.base_url)
+        teacher_home = teacher_browser.page(HomePage)
+        teacher_signup = teacher_browser.page(TeacherSignPage)
+        admin_login = admin_browser.page(AdminLoginPage)
+
+        async def teacher_signs_up():
+            await teacher_home.go_to_teacher_signup_page()
+            await teacher_signup.teacher_join(**teacher["join"])
+            return await teacher_signup.verify_joining_succssed()
+
+        async def admin_logs_in():
+            return await admin_login.admin_login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
+
+        joined, admin_logged_in = run_concurrently(teacher_signs_up, admin_logs_in)
+        assert joined is True
+        assert admin_logged_in is True
 
-        assert result is True
\ No newline at end of file
+        # Approval needs the teacher to exist, so it runs after both actors are done
+        self._approve_teacher(AdminDashboardPage(admin_browser.driver, self.base_url), teacher)
+
+        assert self._teacher_logs_in(teacher) is True
+
+    @pytest.mark.run(order=3)
+    def test_bulk_approve_teachers(self):
+        # approve_teachers submits each change form from the admin's session; every teacher must come out approved
+        teachers = [self._new_pending_teacher() for _ in range(2)]
+        for teacher in teachers:
+            self.driver.get(self.base_url)
+            self.home_page.go_to_teacher_signup_page()
+            self.join_as_teacher_page.teacher_join(**teacher["join"])
+            assert self.join_as_teacher_page.verify_joining_succssed() is True
+        emails = [teacher["email"] for teacher in teachers]
+
+        self.admin_login_page.admin_login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
+        summary = self.admin_dashboard_page.approve_teachers(emails, self.commission_value)
+
+        assert summary["succeeded"] == len(emails), f"Bulk approval failed: {summary}"
+        assert summary["failed"] == [] and summary["missing"] == []
+        for email in emails:
+            self.admin_dashboard_page.search_change_list("users", email)
+            assert self.admin_dashboard_page.get_user_status_from_list(email, "approved") == "True"
+        self.admin_login_page.logout()
@@ -0,0 +1,99 @@
+from utilities.locator_audit import LocatorAudit
+import unittest
+import pytest
+from pages.home.login_page import LoginPage
+from pages.home.home_page import HomePage
+from pages.home.signup_student_page import SignupPage
+from pages.courses.courses_page import CoursesPage
+from pages.teachers.teacher_signup_page import TeacherSignPage
+from pages.admin.admin_login_page import AdminLoginPage
+from pages.admin.admin_dashboard_page import AdminDashboardPage
+
+
+@pytest.mark.audit
+@pytest.mark.cacheable
+@pytest.mark.usefixtures("oneTimeSetUp", "setUp")
+class TestLocatorAudit(unittest.TestCase):
+    """
+    Dry-run of the page objects: every page is opened once and all of its
+    locators are checked in a single script call. Run before the suite to
+    fail fast on locator drift:
+        pytest src/tests/audit -m audit --browser chrome-headless --baseurl <url>
+    """
+
+    ADMIN_USERNAME = "admin"
+    ADMIN_PASSWORD = "admin"
+
+    @pytest.fixture(autouse=True)
+    def objectSetup(self, oneTimeSetUp, base_url_from_cli):
+        self.base_url = base_url_from_cli
+        self.audit = LocatorAudit(self.driver, self.base_url)
+        self.home_page = HomePage(self.driver, self.base_url)
+        self.login_page = LoginPage(self.driver, self.base_url)
+        self.signup_page = SignupPage(self.driver, self.base_url)
+        self.courses_page = CoursesPage(self.driver, self.base_url)
+        self.teacher_signup_page = TeacherSignPage(self.driver, self.base_url)
+        self.admin_login_page = AdminLoginPage(self.driver, self.base_url)
+        self.admin_dashboard_page = AdminDashboardPage(self.driver, self.base_url)
+
+        # Every check starts logged out on the home page
+        self.driver.delete_all_cookies()
+        self.driver.get(self.base_url)
+
+    def assert_no_broken_locators(self, page, only=None):
+        results = self.audit.audit_page(page, only=only)
+        failures = self.audit.failures(results)
+        assert not failures, (f"{type(page).__name__} has broken locators: " +
+                              ", ".join(f"{name}={r['locator']!r} ({r['status']})" for name, r in failures.items()))
+
+    @pytest.mark.run(order=1)
+    def test_home_page_locators(self):
+        self.assert_no_broken_locators(self.home_page,
+                                       only=["_course_menu_link", "_join_as_teacher_link", "_home_page_locator"])
+
+    @pytest.mark.run(order=2)
+    def test_login_page_locators(self):
+        self.login_page.click_login_link()
+        self.assert_no_broken_locators(self.login_page,
+                                       only=["email_input_loctor", "password_input_locator", "login_button_locator"])
+
+    @pytest.mark.run(order=3)
+    def test_student_signup_page_locators(self):
+        self.signup_page.click_login_link()
+        self.signup_page.click_signup_link()
+        self.assert_no_broken_locators(self.signup_page,
+                                       only=["user_name_input_locator", "user_emil_imput_locator",
+                                             "user_full_name_en_locator", "user_full_name_ar_locator",
+                                             "user_password_input_locator", "user_password_input_locator2",
+                                             "_user_profile_image_input_locator", "user_bio_input_locator",
+                                             "submitt_button_locator"])
+
+    @pytest.mark.run(order=4)
+    def test_teacher_signup_page_locators(self):
+        self.home_page.go_to_teacher_signup_page()
+        # Steps 1-3 live in one document; later steps are reported as hidden, not missing.
+        # The password step is rendered only after the application is submitted.
+        self.assert_no_broken_locators(self.teacher_signup_page,
+                                       only=["_full_name_en_input", "_full_name_ar_input", "_email_input",
+                                             "_phone_number", "_next_teacher_info_butt",
+                                             "_year_of_experince_input", "_university_input",
+                                             "_graduate_year_input", "_specialization_input", "_bio_input",
+                                             "_next_button", "_submit_button"])
+
+    @pytest.mark.run(order=5)
+    def test_courses_page_locators(self):
+        self.home_page.go_to_course_page()
+        self.assert_no_broken_locators(self.courses_page,
+                                       only=["_view_course_details_button", "_all_courses_cards"])
+
+    @pytest.mark.run(order=6)
+    def test_admin_login_page_locators(self):
+        self.admin_login_page.navigate_to_admin_login_page()
+        self.assert_no_broken_locators(self.admin_login_page,
+                                       only=["_username_input", "_password_input", "_login_button"])
+
+    @pytest.mark.run(order=7)
+    def test_admin_dashboard_page_locators(self):
+        self.admin_login_page.admin_login(self.ADMIN_USERNAME, self.ADMIN_PASSWORD)
+        self.assert_no_broken_locators(self.admin_dashboard_page,
+                                       only=["_dashboard_header", "teacher_profile_link", "_teacher_courses_link"])
@@ -1,12 +1,27 @@
 import pytest
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service as ChromeService
 import os
 import shutil
+import json
 import tempfile
 import logging
 from base.web_driver_factory import WebDriverFactory # Your factory
+from base.remote_sessions import RemoteSessionPool
+from base.profile_snapshot import ProfileSnapshot, run_id as profile_run_id, remove_run_dir
+from base.launch_profiles import (LAUNCH_PROFILES, FIREFOX_BROWSERS, build_chrome_options, build_options,
+                                   resolve_profile_name, install_no_animations)
+from base.selenium_driver import SeleniumDriver
+from base.traced_connection import CommandTracer
+from base.http_pool import HTTP_POOL_PROFILES, SharedHttpPool
+from base.bidi_backend import BidiSession
+import utilities.event_log as event_log
+from utilities.sut_health import SutHealthMonitor
+from utilities.test_impact import ImpactGraph, changed_lines
+from utilities.result_cache import ResultCache, sut_fingerprint, DEFAULT_TTL
+from utilities.db_snapshot import SqliteSnapshot, SESSION_TABLES
+from utilities.trace_recorder import TraceRecorder
+from utilities.console_collector import ConsoleCollector
 
 # --- NEW IMPORTS FOR API INTERACTION ---
 import requests
@@ -26,9 +41,307 @@ if not logging.getLogger().handlers:
                         format='%(asctime)s - %(levelname)s - %(message)s')
 log = logging.getLogger(__name__)
 
+result_cache_key = pytest.StashKey()
+sut_db_key = pytest.StashKey()
+trace_recorder_key = pytest.StashKey()
+
 def pytest_addoption(parser):
-    parser.addoption("--browser", action="store", default="chrome", help="Type of browser: chrome or firefox")
+    parser.addoption("--browser", action="store", default="chrome", help="Type of browser: chrome, chrome-headless, firefox, firefox-headless or remote (Selenium Grid)")
     parser.addoption("--baseurl", action="store", default="http://127.0.0.1:8000", help="Base URL for testing")
+    parser.addoption("--grid-url", action="store", default="http://127.0.0.1:4444",
+                     help="Selenium Grid hub URL used with --browser remote")
+    parser.addoption("--grid-capabilities", action="store", default=None,
+                     help='Extra capabilities for grid sessions as JSON, e.g. \'{"browserVersion": "126", "platformName": "linux"}\'')
+    parser.addoption("--grid-max-sessions", action="store", type=int, default=4,
+                     help="Most grid sessions this run holds at once; idle sessions are reused between classes")
+    parser.addoption("--launch-profile", action="store", default=None, choices=sorted(LAUNCH_PROFILES),
+                     help="Browser launch preset (default: ci-fast for the headless browsers, debug-visible for chrome and firefox)")
+    parser.addoption("--no-animations", action="store_true", default=False,
+                     help="Disable CSS transitions, animations and smooth scrolling in every page (Chrome)")
+    parser.addoption("--profile-snapshot", action="store_true", default=False,
+                     help="Launch Chrome from a copy of a warmed-up golden profile built once per run")
+    parser.addoption("--profile-role", action="store", default=None,
+                     help="Log the golden profile in as this role: admin or teacher (default: anonymous)")
+    parser.addoption("--profile-dir", action="store", default=None,
+                     help="Directory for golden profile snapshots (default: system temp dir)")
+    parser.addoption("--wait-backend", action="store", default="poll", choices=["poll", "observer", "bidi"],
+                     help="How SeleniumDriver waits: poll (WebDriverWait over HTTP), observer (in-browser MutationObserver) "
+                          "or bidi (re-check on WebDriver BiDi events)")
+    parser.addoption("--element-cache", action="store_true", default=False,
+                     help="Re-use elements found by a page object while they are still attached to the page")
+    parser.addoption("--event-log", action="store", default=None,
+                     help="Write one JSON line per SeleniumDriver action to this file (rotated by size)")
+    parser.addoption("--sut-health", action="store_true", default=False,
+                     help="Probe the base URL before and during the run and stop testing a dead SUT early")
+    parser.addoption("--cold-start-budget", action="store", type=int, default=180,
+                     help="Seconds to wait for the SUT to come up before the first test (with --sut-health)")
+    parser.addoption("--sut-breaker", action="store", default="skip", choices=["skip", "abort"],
+                     help="What to do with the remaining tests once the SUT is unhealthy: skip them or abort the run")
+    parser.addoption("--impacted-since", action="store", default=None,
+                     help="Only run tests affected by changes since this git revision (e.g. origin/dev)")
+    parser.addoption("--sut-db", action="store", default=None,
+                     help="Path of the local SUT's SQLite database: snapshot it at session start and restore it between tests")
+    parser.addoption("--sut-db-restore", action="store", default="class", choices=["class", "test", "session"],
+                     help="When to restore the --sut-db snapshot: before every class, before every test, or only at session end")
+    parser.addoption("--journeys", action="store_true", default=False,
+                     help="Run the teacher wizard, student sign-up and course add flows as batched journey steps")
+    parser.addoption("--result-cache", action="store_true", default=False,
+                     help="Reuse earlier passes of @pytest.mark.cacheable tests while the test, the modules it imports "
+                          "and the SUT build are unchanged (needs --sut-version-path)")
+    parser.addoption("--result-cache-ttl", action="store", type=int, default=DEFAULT_TTL,
+                     help="Seconds a cached pass stays valid when the marker sets no ttl")
+    parser.addoption("--sut-version-path", action="store", default=None,
+                     help="Path of a SUT endpoint returning its build/version; required by --result-cache")
+    parser.addoption("--failure-trace", action="store", type=int, default=0,
+                     help="Keep the last N actions (DOM, URL, console) in memory and write them out when a test fails (0 = off)")
+    parser.addoption("--failure-trace-dir", action="store", default="test-results/traces",
+                     help="Where failure traces are written (--failure-trace)")
+    parser.addoption("--console-errors", action="store_true", default=False,
+                     help="Collect JS exceptions, console errors and browser log entries per page and test (Chrome DevTools)")
+    parser.addoption("--console-error-budget", action="store", type=int, default=0,
+                     help="Errors a page may log during one test before --console-budget-action applies")
+    parser.addoption("--console-budget-action", action="store", default="warn", choices=["warn", "fail"],
+                     help="warn: report pages over the budget; fail: also fail the test")
+    parser.addoption("--command-trace", action="store", default=None,
+                     help="Trace every WebDriver command per test and page-object method, and write the histograms to this JSON file")
+    parser.addoption("--http-pool", action="store", default="default", choices=sorted(HTTP_POOL_PROFILES),
+                     help="HTTP pool for the WebDriver link: default (Selenium's, per driver) or tuned (shared, keep-alive, own timeouts)")
+    parser.addoption("--http-pool-size", action="store", type=int, default=None,
+                     help="Connections per host of the tuned pool (default: --grid-max-sessions with --browser remote, else 4)")
+
+def pytest_configure(config):
+    SeleniumDriver.wait_backend = config.getoption("--wait-backend")
+    log.info(f"SeleniumDriver wait backend: {SeleniumDriver.wait_backend}")
+    WebDriverFactory.bidi_enabled = SeleniumDriver.wait_backend == "bidi"
+    SeleniumDriver.element_cache_enabled = config.getoption("--element-cache")
+    SeleniumDriver.animations_disabled = config.getoption("--no-animations")
+    SeleniumDriver.journeys_enabled = config.getoption("--journeys")
+    event_log_path = config.getoption("--event-log")
+    if event_log_path:
+        event_log.configure(event_log_path)
+        log.info(f"Writing SeleniumDriver events to {event_log_path}")
+
+    if config.getoption("--sut-health"):
+        SeleniumDriver.health_monitor = SutHealthMonitor(config.getoption("--baseurl"),
+                                                         cold_start_budget=config.getoption("--cold-start-budget"))
+    _setup_result_cache(config)
+    if config.getoption("--profile-snapshot") and not hasattr(config, "workerinput"):
+        # Fixed before xdist starts its workers, which inherit it and share one golden profile
+        profile_run_id()
+    if config.getoption("--failure-trace") > 0:
+        recorder = TraceRecorder(config.getoption("--failure-trace-dir"), capacity=config.getoption("--failure-trace"))
+        config.stash[trace_recorder_key] = recorder
+        event_log.add_listener(recorder.record)
+        log.info(f"Failure traces of the last {recorder.capacity} actions go to {recorder.directory}")
+    if config.getoption("--console-errors"):
+        WebDriverFactory.console_collector = ConsoleCollector(config.getoption("--console-error-budget"))
+        # Sessions with a BiDi websocket (--wait-backend bidi) but no DevTools listener (Firefox) report through BiDi
+        BidiSession.console_sink = WebDriverFactory.console_collector.add_bidi
+    if config.getoption("--command-trace"):
+        WebDriverFactory.command_tracer = CommandTracer()
+    pool_size = config.getoption("--http-pool-size") or (
+        config.getoption("--grid-max-sessions") if config.getoption("--browser") == "remote" else 4)
+    WebDriverFactory.http_pool = SharedHttpPool.from_profile(config.getoption("--http-pool"), pool_size)
+
+def _src_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _impact_graph(config):
+    return ImpactGraph.load(_src_root(), str(config.cache.mkdir("test_impact") / "graph.json"))
+
+def _setup_result_cache(config):
+    if not config.getoption("--result-cache") or getattr(config, "cache", None) is None:
+        return
+    if not config.getoption("--sut-version-path"):
+        # The home page's headers and asset URLs do not change with a deploy unless static names are hashed
+        raise pytest.UsageError("--result-cache needs --sut-version-path: without a version endpoint a new SUT "
+                                "build cannot be told apart and stale passes would be reused.")
+    try:
+        graph = _impact_graph(config)
+    except Exception as e:
+        log.error(f"Result cache disabled, could not build the test graph: {e}")
+        return
+    fingerprint = sut_fingerprint(config.getoption("--baseurl"), config.getoption("--sut-version-path"))
+    # One file per browser: a pass on Chrome says nothing about Firefox, and matrix runs write them concurrently
+    results_file = f"results-{config.getoption('--browser')}.json"
+    config.stash[result_cache_key] = ResultCache(str(config.cache.mkdir("result_cache") / results_file),
+                                                 fingerprint, graph, os.path.dirname(_src_root()))
+    log.info(f"Result cache enabled (SUT fingerprint: {fingerprint})")
+
+def pytest_collection_modifyitems(config, items):
+    since = config.getoption("--impacted-since")
+    if not since:
+        return
+    try:
+        graph = _impact_graph(config)
+        selected_ids = graph.select(changed_lines(since, os.path.dirname(_src_root())))
+    except Exception as e:
+        log.error(f"Test impact selection failed, running all collected tests: {e}")
+        return
+    if selected_ids is None:
+        return
+
+    selected, deselected = [], []
+    for item in items:
+        # Parametrized ids ("test_x[param]") map to their function
+        (selected if item.nodeid.split("[", 1)[0] in selected_ids else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    log.info(f"Impact selection since {since}: running {len(selected)}, deselected {len(deselected)}.")
+
+def pytest_unconfigure(config):
+    event_log.close()
+    recorder = config.stash.get(trace_recorder_key, None)
+    if recorder is not None:
+        event_log.remove_listener(recorder.record)
+    if WebDriverFactory.console_collector is not None:
+        WebDriverFactory.console_collector.close()
+    if WebDriverFactory.command_tracer is not None:
+        WebDriverFactory.command_tracer.save(config.getoption("--command-trace"))
+    if WebDriverFactory.http_pool is not None:
+        WebDriverFactory.http_pool.close()
+    cache = config.stash.get(result_cache_key, None)
+    if cache is not None:
+        cache.save()
+    if config.getoption("--profile-snapshot") and not hasattr(config, "workerinput"):
+        # The controller (or the only process) ends last; no worker needs the golden profile any more
+        remove_run_dir(config.getoption("--profile-dir"))
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    recorder = item.config.stash.get(trace_recorder_key, None)
+    if recorder is not None:
+        recorder.clear()
+    if WebDriverFactory.console_collector is not None:
+        WebDriverFactory.console_collector.begin_test(item.nodeid)
+    cache = item.config.stash.get(result_cache_key, None)
+    if cache is not None and item.get_closest_marker("cacheable"):
+        entry = cache.lookup(item.nodeid)
+        if entry:
+            passed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["passed_at"]))
+            pytest.skip(f"cached pass from {passed_at} (test, page objects and SUT build unchanged)")
+
+    monitor = SeleniumDriver.health_monitor
+    if monitor is None:
+        return
+    if not monitor.cold_start_checked and monitor.wait_until_ready():
+        event_log.emit({"ts": round(time.time(), 3), "event": "sut_cold_start", "url": monitor.url,
+                        "duration_s": monitor.metrics["cold_start_seconds"],
+                        "probes": monitor.metrics["cold_start_probes"]})
+    if not monitor.allow():
+        if item.config.getoption("--sut-breaker") == "abort":
+            pytest.exit(f"Aborting run: {monitor.open_reason}", returncode=3)
+        monitor.metrics["skipped_tests"] += 1
+        pytest.skip(f"SUT breaker open: {monitor.open_reason}")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    collector = WebDriverFactory.console_collector
+    if collector is not None and report.when == "call":
+        # First, so a test failed for its console errors is not stored as a cached pass
+        _apply_console_budget(item, report, collector)
+    tracer = WebDriverFactory.command_tracer
+    if tracer is not None and report.when == "call":
+        commands = tracer.format_test(item.nodeid)
+        if commands:
+            report.sections.append(("driver commands", commands))
+    cache = item.config.stash.get(result_cache_key, None)
+    marker = item.get_closest_marker("cacheable")
+    if cache is not None and marker and report.when in ("setup", "call"):
+        if report.failed:
+            cache.invalidate(item.nodeid)
+        elif report.when == "call" and report.passed:
+            cache.store(item.nodeid, marker.kwargs.get("ttl", item.config.getoption("--result-cache-ttl")))
+    monitor = SeleniumDriver.health_monitor
+    if monitor is not None and report.failed and report.when in ("setup", "call"):
+        monitor.probe_after_failure()
+    recorder = item.config.stash.get(trace_recorder_key, None)
+    if recorder is not None and report.failed and report.when in ("setup", "call"):
+        crash = getattr(report.longrepr, "reprcrash", None)
+        path = recorder.flush(item.nodeid, reason=crash.message if crash else None)
+        if path:
+            report.sections.append(("failure trace", f"python src/utilities/trace_recorder.py {path}"))
+
+def _apply_console_budget(item, report, collector):
+    records = collector.format_records(item.nodeid)
+    if records:
+        report.sections.append(("console errors", records))
+    over_budget = collector.over_budget(item.nodeid)
+    if not over_budget:
+        return
+    message = ", ".join(f"{page}: {errors} errors" for page, errors in over_budget)
+    message = f"Console error budget ({collector.error_budget} per page) exceeded: {message}"
+    collector.budget_breaches.append((item.nodeid, message))
+    if item.config.getoption("--console-budget-action") == "fail" and report.passed:
+        report.outcome = "failed"
+        report.longrepr = f"{message}\n{records}"
+    else:
+        log.warning(f"{item.nodeid}: {message}")
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if SeleniumDriver.element_cache_enabled:
+        totals = SeleniumDriver.element_cache_totals
+        lookups = sum(totals.values())
+        hit_rate = totals["hits"] / lookups * 100 if lookups else 0.0
+        terminalreporter.write_sep("-", "element cache")
+        terminalreporter.write_line(f"lookups: {lookups}, hits: {totals['hits']}, misses: {totals['misses']}, "
+                                    f"stale: {totals['stale']}, hit rate: {hit_rate:.1f}%")
+    monitor = SeleniumDriver.health_monitor
+    if monitor is not None and monitor.cold_start_checked:
+        metrics = monitor.metrics
+        terminalreporter.write_sep("-", "SUT health")
+        terminalreporter.write_line(f"cold start: {metrics['cold_start_seconds']}s ({metrics['cold_start_probes']} probes), "
+                                    f"probes: {metrics['probes']} ({metrics['unhealthy_probes']} unhealthy), "
+                                    f"breaker trips: {metrics['breaker_trips']}, skipped tests: {metrics['skipped_tests']}")
+    cache = config.stash.get(result_cache_key, None)
+    if cache is not None:
+        terminalreporter.write_sep("-", "result cache")
+        terminalreporter.write_line(f"SUT fingerprint: {cache.sut_fingerprint}, reused: {len(cache.reused)}, "
+                                    f"stored: {cache.stored}")
+        for test_id in cache.reused:
+            terminalreporter.write_line(f"  cached: {test_id}")
+    recorder = config.stash.get(trace_recorder_key, None)
+    if recorder is not None:
+        stats = recorder.stats
+        average_ms = stats["snapshot_ms_total"] / stats["recorded"] if stats["recorded"] else 0.0
+        terminalreporter.write_sep("-", "failure traces")
+        terminalreporter.write_line(f"actions recorded: {stats['recorded']} ({average_ms:.1f} ms each), "
+                                    f"traces written: {stats['traces']} to {recorder.directory}")
+    collector = WebDriverFactory.console_collector
+    if collector is not None:
+        terminalreporter.write_sep("-", "console errors")
+        if collector.unavailable:
+            terminalreporter.write_line(f"sessions without DevTools (not collected): {collector.unavailable}")
+        ranked = sorted(collector.page_totals.items(), key=lambda item: (item[1]["errors"], item[1]["warnings"]), reverse=True)
+        for page, totals in ranked[:15]:
+            terminalreporter.write_line(f"{totals['errors']:>5} errors {totals['warnings']:>5} warnings  {page}")
+        if not ranked:
+            terminalreporter.write_line("no console errors or warnings")
+        for test_id, message in collector.budget_breaches:
+            terminalreporter.write_line(f"  over budget: {test_id}: {message}")
+    tracer = WebDriverFactory.command_tracer
+    if tracer is not None:
+        terminalreporter.write_sep("-", "driver commands")
+        for method, count, total_ms in tracer.chattiest():
+            terminalreporter.write_line(f"{count:>7} commands {total_ms:>10.1f} ms  {method}")
+        terminalreporter.write_line(f"per-test histograms: {config.getoption('--command-trace')}")
+    http_pool = WebDriverFactory.http_pool
+    if http_pool is not None:
+        terminalreporter.write_sep("-", "HTTP pool")
+        terminalreporter.write_line(f"drivers: {http_pool.attached}, maxsize per host: {http_pool.maxsize}, "
+                                    f"timeout: {http_pool.timeout}")
+        for host, stats in http_pool.stats().items():
+            terminalreporter.write_line(f"  {host}: {stats['requests']} requests over {stats['connections']} "
+                                        f"connections ({stats['reuse_pct']}% reused), idle: {stats['idle']}")
+    snapshot = config.stash.get(sut_db_key, None)
+    if snapshot is not None:
+        stats = snapshot.stats
+        terminalreporter.write_sep("-", "SUT database")
+        terminalreporter.write_line(f"snapshot: {stats['snapshot_ms']} ms, restores: {stats['restores']} "
+                                    f"({stats['restore_ms_total']} ms), skipped (unchanged): {stats['skipped_restores']}")
 
 # Move browser and base_url fixtures to the top and ensure they are session scoped
 @pytest.fixture(scope="session")
@@ -48,43 +361,134 @@ def base_url_from_cli(request):
     
     return base_url
 
+@pytest.fixture(scope="session")
+def launch_profile(request, browser):
+    """Name of the launch profile (--launch-profile, or the default for --browser)."""
+    if browser not in ["chrome", "chrome-headless", "remote", *FIREFOX_BROWSERS]:
+        return None
+    return resolve_profile_name(browser, request.config.getoption("--launch-profile"))
+
+@pytest.fixture(scope="session")
+def profile_snapshot(request, browser, base_url_from_cli, launch_profile):
+    """Golden Chrome profile shared by every class in the run, or None when --profile-snapshot is off."""
+    if not request.config.getoption("--profile-snapshot"):
+        yield None
+        return
+    if browser not in ["chrome", "chrome-headless"]:
+        log.warning(f"--profile-snapshot is only supported for Chrome, ignoring it for '{browser}'.")
+        yield None
+        return
+
+    snapshot = ProfileSnapshot(base_url_from_cli,
+                               role=request.config.getoption("--profile-role"),
+                               root_dir=request.config.getoption("--profile-dir"))
+    wdf = WebDriverFactory(browser)
+    try:
+        snapshot.ensure_golden(
+            lambda user_data_dir: wdf.getWebDriverInstance(driver_options=build_chrome_options(launch_profile, user_data_dir)))
+    except Exception as e:
+        log.error(f"Failed to build golden profile, falling back to fresh profiles: {e}")
+        yield None
+        return
+
+    yield snapshot
+    snapshot.cleanup()
+
+@pytest.fixture(scope="session")
+def remote_pool(request, browser, launch_profile):
+    """Shared pool of grid sessions for --browser remote, or None for local browsers."""
+    if browser != "remote":
+        yield None
+        return
+    capabilities = json.loads(request.config.getoption("--grid-capabilities") or "{}")
+    wdf = WebDriverFactory(browser, grid_url=request.config.getoption("--grid-url"), capabilities=capabilities)
+    pool = RemoteSessionPool(
+        lambda: wdf.getWebDriverInstance(driver_options=build_chrome_options(launch_profile)),
+        max_sessions=request.config.getoption("--grid-max-sessions"))
+    yield pool
+    pool.close_all()
+
+@pytest.fixture(scope="session")
+def sut_db(request):
+    """Snapshot of the local SUT database (--sut-db), restored when the session ends. None without --sut-db."""
+    db_path = request.config.getoption("--sut-db")
+    if not db_path:
+        yield None
+        return
+    snapshot = SqliteSnapshot(db_path)
+    snapshot.take()
+    request.config.stash[sut_db_key] = snapshot
+    yield snapshot
+    snapshot.restore()
+    snapshot.close()
+
+@pytest.fixture(scope="class", autouse=True)
+def _sut_db_class_reset(request, sut_db):
+    if sut_db is not None and request.config.getoption("--sut-db-restore") == "class":
+        sut_db.restore()
+
+@pytest.fixture(autouse=True)
+def _sut_db_test_reset(request, sut_db):
+    if sut_db is not None and request.config.getoption("--sut-db-restore") == "test":
+        # The class browser logged in during oneTimeSetUp; keep its session row
+        sut_db.restore(keep_tables=SESSION_TABLES)
+
+@pytest.fixture(scope="function")
+def fresh_sut_db(sut_db):
+    """Restores the SUT database before this test whatever --sut-db-restore says. Skips without --sut-db."""
+    if sut_db is None:
+        pytest.skip("fresh_sut_db needs --sut-db")
+    sut_db.restore(keep_tables=SESSION_TABLES)
+    return sut_db
+
+def _install_no_animations(driver):
+    if SeleniumDriver.animations_disabled and not install_no_animations(driver):
+        # Without the script the post-scroll pauses and intercepted-click retries are still needed
+        SeleniumDriver.animations_disabled = False
+
+def _log_first_paint(driver):
+    try:
+        first_paint = driver.execute_script(
+            "const e = performance.getEntriesByName('first-contentful-paint')[0]; return e ? e.startTime : null;")
+        if first_paint is not None:
+            log.info(f"First contentful paint of base URL: {first_paint:.0f} ms")
+    except Exception as e:
+        log.debug(f"Could not read first paint timing: {e}")
+
 @pytest.fixture(scope="class")
-def oneTimeSetUp(request, browser, base_url_from_cli): # Now these are correctly passed as arguments
+def oneTimeSetUp(request, browser, base_url_from_cli, profile_snapshot, launch_profile, remote_pool): # Now these are correctly passed as arguments
     log.info(f"Running one time setUp for browser: {browser}")
     driver_options = None
     temp_user_data_dir = None
     driver = None 
     try:
         if browser == "chrome" or browser == "chrome-headless":
-            chrome_options = Options()
-            driver_options = chrome_options
-            driver_options.add_argument('--no-sandbox')
-            driver_options.add_argument('--disable-dev-shm-usage')
-            driver_options.add_argument('--window-size=1920,1080')
-
-            if browser == "chrome-headless":
-                driver_options.add_argument('--headless')
-                driver_options.add_argument('--disable-gpu')
-                log.info("Configuring Chrome for headless mode.")
-            else:
-                log.info("Configuring Chrome for visible mode (local).")
-            log.info(f"Final Chrome Options: {driver_options.arguments}")
+            if profile_snapshot:
+                temp_user_data_dir = profile_snapshot.clone(request.cls.__name__ if request.cls else None)
+            driver_options = build_chrome_options(launch_profile, temp_user_data_dir)
 
-        elif browser == "firefox":
+        elif browser in FIREFOX_BROWSERS:
             log.info("Configuring Firefox browser.")
-            pass 
+            driver_options = build_options(browser, launch_profile)
 
         wdf = WebDriverFactory(browser)
         try:
-            driver = wdf.getWebDriverInstance(driver_options=driver_options)
-            log.info("WebDriver instance obtained successfully.")
+            launch_start = time.time()
+            if remote_pool:
+                driver = remote_pool.acquire()
+            else:
+                driver = wdf.getWebDriverInstance(driver_options=driver_options)
+            log.info(f"WebDriver instance obtained successfully in {time.time() - launch_start:.2f} seconds "
+                     f"(launch profile: {launch_profile}).")
         except Exception as e:
             log.error(f"Failed to get WebDriver instance: {e}")
             pytest.skip(f"Could not initialize WebDriver for browser '{browser}': {e}. Please check driver compatibility and installation.")
 
         driver.implicitly_wait(10) # Good practice for initial element loading
+        _install_no_animations(driver)
         driver.get(base_url_from_cli)
         log.info(f"Navigated to Base URL: {base_url_from_cli}")
+        _log_first_paint(driver)
 
         if request.cls:
             request.cls.driver = driver
@@ -95,22 +499,58 @@ def oneTimeSetUp(request, browser, base_url_from_cli): # Now these are correctly
     finally:
         log.info("Running one time tearDown (from finally block).")
         # Check if driver was successfully initialized before quitting
-        if driver:
+        if driver and remote_pool:
+            # Grid sessions go back to the pool for the next class
+            remote_pool.release(driver)
+            log.info("Remote WebDriver session returned to the pool.")
+        elif driver:
             try:
+                BidiSession.release(driver.session_id)
                 driver.quit()
                 log.info("WebDriver quit.")
             except Exception as e:
                 log.error(f"Error quitting WebDriver: {e}")
 
         # Clean up the temporary user data directory
-        '''
         if temp_user_data_dir and os.path.exists(temp_user_data_dir):
-            try:
-                shutil.rmtree(temp_user_data_dir)
-                log.info(f"Successfully cleaned up: {temp_user_data_dir}")
-            except OSError as e:
-                log.error(f"Error cleaning up temporary directory {temp_user_data_dir}: {e}")
-        '''
+            profile_snapshot.remove_clone(temp_user_data_dir)
+@pytest.fixture(scope="function")
+def driver_factory(browser, base_url_from_cli, launch_profile, remote_pool):
+    """
+    Creates extra WebDriver sessions for tests that drive several actors at once
+    (e.g. a teacher and an admin). Every session is quit after the test
+    (or returned to the pool with --browser remote).
+    """
+    drivers = []
+
+    def _create_driver():
+        driver_options = None
+        if browser in ["chrome", "chrome-headless", *FIREFOX_BROWSERS]:
+            driver_options = build_options(browser, launch_profile)
+        if remote_pool:
+            driver = remote_pool.acquire()
+        else:
+            driver = WebDriverFactory(browser).getWebDriverInstance(driver_options=driver_options)
+        drivers.append(driver)
+        driver.implicitly_wait(10)
+        _install_no_animations(driver)
+        driver.get(base_url_from_cli)
+        log.info(f"Extra WebDriver session started on {base_url_from_cli}")
+        return driver
+
+    yield _create_driver
+
+    for driver in drivers:
+        if remote_pool:
+            remote_pool.release(driver)
+            continue
+        try:
+            BidiSession.release(driver.session_id)
+            driver.quit()
+            log.info("Extra WebDriver quit.")
+        except Exception as e:
+            log.error(f"Error quitting extra WebDriver: {e}")
+
 @pytest.fixture(scope="function")
 def setUp():
     log.info("Running method level setUp")
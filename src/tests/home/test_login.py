@@ -23,6 +23,7 @@ class TestLogin(unittest.TestCase):
         assert result is True
                 
     @pytest.mark.run(order = 1)        
+    @pytest.mark.cacheable
     def test_invalid_login(self):
         self.login_page.login("mjdwassouf", "mjd095770865a")
         result = self.login_page.verify_login_faild()
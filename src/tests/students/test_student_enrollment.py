@@ -6,6 +6,7 @@ from pages.home.login_page import LoginPage
 from pages.home.home_page import HomePage
 from pages.home.signup_student_page import SignupPage
 import time
+from utilities.test_data import unique_suffix
 
 
 @pytest.mark.usefixtures("oneTimeSetUp", "setUp")
@@ -20,14 +21,14 @@ class RegisterCoursesTests(unittest.TestCase):
         self.courses_page = CoursesPage(self.driver, self.base_url)
         self.student_signup_page = SignupPage(self.driver, self.base_url)
 
-        self.username = "test_user" + str(int(time.time()))
-        self.email= "test_user_email" + str(int(time.time())) + "@kuwaitnet.email"
-        self.full_ar_name= "test_user_ar_name" + str(int(time.time()))
-        self.full_en_name= "test_user_aen_name" + str(int(time.time()))
+        self.username = "test_user" + unique_suffix()
+        self.email= "test_user_email" + unique_suffix() + "@kuwaitnet.email"
+        self.full_ar_name= "test_user_ar_name" + unique_suffix()
+        self.full_en_name= "test_user_aen_name" + unique_suffix()
         self.user_password = "Dinamo12@"
         self.user_password_2 = "Dinamo12@"
         self.user_profile = "/home/majd/Documents/myproject/majd.kassem.business_qa/images/user.jpg"
-        self.user_bio = "test_user_bio" +  str(int(time.time()))
+        self.user_bio = "test_user_bio" +  unique_suffix()
 
         self.student_signup_page.signup_student(self.username, self.email, self.full_ar_name,
                                                 self.full_en_name, self.user_password,
@@ -7,6 +7,7 @@ from pages.teachers.teacher_signup_page import TeacherSignPage
 from pages.teachers.add_course_page import CourseAddingPage
 
 import time
+from utilities.test_data import unique_suffix
 
 
 @pytest.mark.usefixtures("oneTimeSetUp", "setUp")
@@ -27,8 +28,8 @@ class TestTeacher(unittest.TestCase):
     def test_valid_course_added(self):
         
         self.home_page.go_to_Teacher_Dashboard_page()
-        course_name = "testing_course" + str(int(time.time()))
-        course_description  = "We are adding random course for testing !" + str(int(time.time())) # A strong unique password
+        course_name = "testing_course" + unique_suffix()
+        course_description  = "We are adding random course for testing !" + unique_suffix() # A strong unique password
         course_price = int(time.time())
         course_language = "English"
         course_level = "Advanced"
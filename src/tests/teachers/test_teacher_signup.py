@@ -7,6 +7,7 @@ from pages.teachers.teacher_signup_page import TeacherSignPage
 import os
 import time
 import random
+from utilities.test_data import account_tag
 
 
 @pytest.mark.usefixtures("oneTimeSetUp", "setUp")
@@ -26,7 +27,7 @@ class TestTeacher(unittest.TestCase):
         self.home_page.go_to_teacher_signup_page()
         timestamp_suffix = str(int(time.time() * 1000))[-4:]
         random_suffix = random.randint(1, 999)
-        unique_id = f"{timestamp_suffix}{random_suffix}"
+        unique_id = f"{timestamp_suffix}{random_suffix}{account_tag()}"
         pending_teacher_email = f"P_Teacher_{unique_id}@kuwaitnet.email"
         pending_teacher_password = "Dinamo12@" # A strong unique password
         username_login = f"P_Teacher_{unique_id}"
@@ -48,7 +49,7 @@ class TestTeacher(unittest.TestCase):
         self.home_page.go_to_teacher_signup_page()
         timestamp_suffix = str(int(time.time() * 1000))[-4:]
         random_suffix = random.randint(1, 999)
-        unique_id = f"{timestamp_suffix}{random_suffix}"
+        unique_id = f"{timestamp_suffix}{random_suffix}{account_tag()}"
         pending_teacher_email = f"P_Teacher_{unique_id}@kuwaitnet.email"
         pending_teacher_password = "Dinamo12@" # A strong unique password
         username_login = f"P_Teacher_{unique_id}"
@@ -0,0 +1,184 @@
+import os
+import subprocess
+import tempfile
+import textwrap
+import unittest
+
+from utilities.test_impact import ImpactGraph, changed_lines
+
+SOURCES = {
+    "src/base/selenium_driver.py": """
+        class SeleniumDriver:
+            def click_element(self, locator):
+                return locator
+    """,
+    "src/pages/login_page.py": """
+        from base.selenium_driver import SeleniumDriver
+
+        class LoginPage(SeleniumDriver):
+            def __init__(self, driver):
+                self.driver = driver
+                self.login_button = "//button"
+
+            def login(self):
+                self.click_element(self.login_button)
+
+            def logout(self):
+                return None
+    """,
+    "src/pages/courses_page.py": """
+        from base.selenium_driver import SeleniumDriver
+
+        class CoursesPage(SeleniumDriver):
+            def enroll(self):
+                return None
+    """,
+    "src/utilities/fixtures_helper.py": """
+        def make_driver():
+            return None
+    """,
+    "src/utilities/unused_tool.py": """
+        def main():
+            return 0
+    """,
+    "src/utilities/test_helpers.py": """
+        class TestHelpers:
+            def test_like_name(self):
+                return None
+    """,
+    "src/tests/conftest.py": """
+        from utilities.fixtures_helper import make_driver
+    """,
+    "src/tests/test_login.py": """
+        from pages.login_page import LoginPage
+
+        class TestLogin:
+            def setup(self):
+                self.login_page = LoginPage(None)
+
+            def test_login(self):
+                self.login_page.login()
+    """,
+    "src/tests/test_courses.py": """
+        from pages.courses_page import CoursesPage
+
+        class TestCourses:
+            def setup(self):
+                self.courses_page = CoursesPage(None)
+
+            def test_enroll(self):
+                self.courses_page.enroll()
+    """,
+}
+
+TEST_LOGIN = "src/tests/test_login.py::TestLogin::test_login"
+TEST_ENROLL = "src/tests/test_courses.py::TestCourses::test_enroll"
+
+
+def _write(root, relpath, text):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(textwrap.dedent(text).lstrip())
+
+
+def _member_line(graph, member):
+    return graph.members[member][0]
+
+
+class TestImpactGraphSelect(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        for relpath, text in SOURCES.items():
+            _write(cls.tmp.name, relpath, text)
+        cls.graph = ImpactGraph.build(os.path.join(cls.tmp.name, "src"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_only_modules_under_tests_hold_tests(self):
+        self.assertEqual(set(self.graph.tests), {TEST_LOGIN, TEST_ENROLL})
+
+    def test_changed_page_method_selects_the_tests_reaching_it(self):
+        line = _member_line(self.graph, "src/pages/login_page.py::LoginPage::login")
+        self.assertEqual(self.graph.select({"src/pages/login_page.py": {line}}), {TEST_LOGIN})
+
+    def test_changed_locator_selects_the_tests_using_it(self):
+        line = _member_line(self.graph, "src/pages/login_page.py::LoginPage::login_button")
+        self.assertEqual(self.graph.select({"src/pages/login_page.py": {line}}), {TEST_LOGIN})
+
+    def test_changed_test_file_selects_its_tests(self):
+        self.assertEqual(self.graph.select({"src/tests/test_courses.py": {1}}), {TEST_ENROLL})
+
+    def test_full_suite_file_runs_everything(self):
+        self.assertIsNone(self.graph.select({"pytest.ini": {3}}))
+
+    def test_module_imported_by_conftest_runs_everything(self):
+        self.assertIsNone(self.graph.select({"src/utilities/fixtures_helper.py": {2}}))
+
+    def test_source_change_reaching_no_test_runs_everything(self):
+        self.assertIsNone(self.graph.select({"src/utilities/unused_tool.py": {2}}))
+        self.assertIsNone(self.graph.select({"src/utilities/unused_tool.py": None}))
+
+    def test_unreached_member_of_a_reached_module_runs_everything(self):
+        line = _member_line(self.graph, "src/pages/login_page.py::LoginPage::logout")
+        self.assertIsNone(self.graph.select({"src/pages/login_page.py": {line}}))
+
+    def test_non_source_change_selects_nothing(self):
+        self.assertEqual(self.graph.select({"README.md": {1}}), set())
+
+
+class TestChangedLines(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self._git("init", "-q")
+        self._git("config", "user.email", "qa@example.com")
+        self._git("config", "user.name", "qa")
+        _write(self.root, "src/a.py", "".join(f"line{n}\n" for n in range(1, 11)))
+        _write(self.root, "src/gone.py", "x = 1\n")
+        self._git("add", ".")
+        self._git("commit", "-q", "-m", "base")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def _rewrite_a(self, lines):
+        _write(self.root, "src/a.py", "".join(line + "\n" for line in lines))
+
+    def test_modified_lines(self):
+        lines = [f"line{n}" for n in range(1, 11)]
+        lines[2], lines[7] = "changed3", "changed8"
+        self._rewrite_a(lines)
+        self.assertEqual(changed_lines("HEAD", self.root), {"src/a.py": {3, 8}})
+
+    def test_added_lines(self):
+        lines = [f"line{n}" for n in range(1, 11)]
+        lines[4:4] = ["new5", "new6"]
+        self._rewrite_a(lines)
+        self.assertEqual(changed_lines("HEAD", self.root), {"src/a.py": {5, 6}})
+
+    def test_pure_deletion_marks_the_line_at_the_gap(self):
+        lines = [f"line{n}" for n in range(1, 11)]
+        del lines[3:5]
+        self._rewrite_a(lines)
+        self.assertEqual(changed_lines("HEAD", self.root), {"src/a.py": {3}})
+
+    def test_deleted_and_new_files(self):
+        os.remove(os.path.join(self.root, "src/gone.py"))
+        _write(self.root, "src/new.py", "a = 1\nb = 2\n")
+        self._git("add", "-A")
+        self.assertEqual(changed_lines("HEAD", self.root), {"src/gone.py": None, "src/new.py": {1, 2}})
+
+    def test_committed_changes_since_a_revision(self):
+        self._rewrite_a(["first"] + [f"line{n}" for n in range(2, 11)])
+        self._git("commit", "-q", "-am", "change")
+        self.assertEqual(changed_lines("HEAD~1", self.root), {"src/a.py": {1}})
+        self.assertEqual(changed_lines("HEAD", self.root), {})
@@ -0,0 +1,164 @@
+"""
+@package utilities
+
+Cross-browser matrix: runs the suite on several browsers at once on one
+machine and compares their per-page timings side by side.
+
+Every browser gets its own pytest process, started concurrently against the
+same SUT. The runs share the seeded data (admin user, published courses), but
+each sets QA_ACCOUNT_TAG to a tag of its own ("chromeh" for chrome-headless), so
+the accounts and courses the tests create never collide, even between chrome
+and chrome-headless (see utilities/test_data.py). A browser may appear only
+once. Each run writes its own event log, Allure results and console output
+under the output directory. The result cache keeps one file per browser.
+
+--sut-db is refused: a restore by one run would wipe the rows the other run
+is using. Seed the database once before the matrix instead.
+
+When all runs have finished, the event logs are aggregated by page method
+(PageClass.method) and printed as one table: p50/p95 per browser and the p50
+of the last browser as a ratio of the first. The table is also written to
+comparison.json.
+
+Example:
+    python src/utilities/browser_matrix.py -- src/tests -m "not slow"
+    python src/utilities/browser_matrix.py --browsers chrome-headless firefox-headless --out test-results/matrix -- src/tests
+    python src/utilities/browser_matrix.py --report-only --out test-results/matrix
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.event_log import aggregate, iter_events
+from utilities.test_data import ACCOUNT_TAG_ENV
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BROWSERS = ["chrome-headless", "firefox-headless"]
+
+# Options the matrix sets per browser, or that cannot be shared between concurrent runs
+_RESERVED_OPTIONS = ("--browser", "--event-log", "--alluredir", "--sut-db")
+
+
+def _event_log_path(out_dir, browser):
+    return os.path.join(out_dir, f"{browser}.ndjson")
+
+
+def _account_tag(browser):
+    # "firefox-headless" -> "firefoxh": short enough for usernames, and distinct for every --browsers choice
+    return browser.replace("-headless", "h")
+
+
+def run_matrix(browsers, pytest_args, out_dir):
+    """
+    Runs pytest once per browser, all at the same time.
+
+    Returns:
+        dict: {browser: {"returncode", "seconds", "output"}}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    runs = {}
+    for browser in browsers:
+        event_log_path = _event_log_path(out_dir, browser)
+        for stale in glob.glob(event_log_path + "*"):
+            os.remove(stale)
+        command = [sys.executable, "-m", "pytest", *pytest_args, "--browser", browser,
+                   "--event-log", event_log_path, f"--alluredir={os.path.join(out_dir, 'allure-' + browser)}"]
+        env = dict(os.environ, **{ACCOUNT_TAG_ENV: _account_tag(browser)})
+        output_path = os.path.join(out_dir, f"{browser}.log")
+        output = open(output_path, "w", encoding="utf-8")
+        log.info(f"Starting {browser}: {' '.join(command)}")
+        process = subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT, env=env)
+        runs[browser] = {"process": process, "file": output, "output": output_path, "start": time.monotonic()}
+
+    results = {}
+    for browser, run in runs.items():
+        returncode = run["process"].wait()
+        run["file"].close()
+        results[browser] = {"returncode": returncode, "seconds": round(time.monotonic() - run["start"], 1),
+                            "output": run["output"]}
+        log.info(f"{browser} finished with exit code {returncode} in {results[browser]['seconds']} s")
+    return results
+
+
+def compare(browsers, out_dir):
+    """
+    Returns:
+        dict: {"PageClass.method": {browser: histogram summary}}, for methods seen by any browser.
+    """
+    table = {}
+    for browser in browsers:
+        paths = sorted(glob.glob(_event_log_path(out_dir, browser) + "*"))
+        for key, histogram in aggregate(iter_events(paths), by="page").items():
+            table.setdefault(key, {})[browser] = histogram.summary()
+    return table
+
+
+def format_comparison(table, browsers, top=40):
+    """One row per page method, slowest total first: count, p50 and p95 per browser, last/first p50 ratio."""
+    def total_ms(row):
+        return sum(summary["mean_ms"] * summary["count"] for summary in row.values())
+
+    header = "".join(f"{browser[:22]:>24}" for browser in browsers)
+    lines = [f"{'':<48}{header}   ratio",
+             f"{'page method':<48}" + "".join(f"{'n':>6}{'p50':>9}{'p95':>9}" for _ in browsers) + "   p50"]
+    for key, row in sorted(table.items(), key=lambda item: total_ms(item[1]), reverse=True)[:top]:
+        cells = ""
+        for browser in browsers:
+            summary = row.get(browser)
+            cells += (f"{summary['count']:>6}{summary['p50_ms']:>9}{summary['p95_ms']:>9}" if summary
+                      else f"{'-':>6}{'-':>9}{'-':>9}")
+        first, other = row.get(browsers[0]), row.get(browsers[-1])
+        ratio = f"{other['p50_ms'] / first['p50_ms']:.2f}x" if first and other and first["p50_ms"] else "-"
+        lines.append(f"{key[:47]:<48}{cells}{ratio:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the suite on several browsers concurrently and compare per-page timings.",
+        epilog="Arguments after -- are passed to every pytest run.")
+    parser.add_argument("--browsers", nargs="+", default=DEFAULT_BROWSERS,
+                        choices=["chrome", "chrome-headless", "firefox", "firefox-headless"])
+    parser.add_argument("--out", default="test-results/matrix", help="Directory for event logs, Allure results and output")
+    parser.add_argument("--top", type=int, default=40, help="Show the N page methods with the highest total time")
+    parser.add_argument("--report-only", action="store_true", help="Compare the event logs of an earlier matrix run")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    duplicates = sorted({browser for browser in args.browsers if args.browsers.count(browser) > 1})
+    if duplicates:
+        parser.error(f"{', '.join(duplicates)} given more than once in --browsers")
+
+    pytest_args = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+    reserved = [arg for arg in pytest_args if arg.split("=", 1)[0] in _RESERVED_OPTIONS]
+    if reserved:
+        parser.error(f"{', '.join(reserved)} cannot be passed to a matrix run")
+
+    exit_code = 0
+    if not args.report_only:
+        results = run_matrix(args.browsers, pytest_args, args.out)
+        for browser, result in results.items():
+            print(f"{browser}: exit code {result['returncode']} in {result['seconds']} s, output in {result['output']}")
+        exit_code = next((result["returncode"] for result in results.values() if result["returncode"]), 0)
+
+    table = compare(args.browsers, args.out)
+    if not table:
+        print(f"No events recorded under {args.out}")
+        return exit_code or 1
+    with open(os.path.join(args.out, "comparison.json"), "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+    print(format_comparison(table, args.browsers, args.top))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
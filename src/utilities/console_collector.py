@@ -0,0 +1,242 @@
+"""
+@package utilities
+
+ConsoleCollector class implementation
+
+Collects the SUT's front-end errors: uncaught exceptions
+(Runtime.exceptionThrown), browser log entries such as failed requests and
+CSP violations (Log.entryAdded) and console.error/warn calls
+(Runtime.consoleAPICalled). They are counted per page and per test.
+
+Every Chrome session started by WebDriverFactory gets its own DevTools
+connection, opened on the session's "se:cdp" endpoint. Local chromedriver does
+not return that capability; the endpoint is then read from the browser's
+debuggerAddress (/json/version), as Selenium's own start_devtools does. Events
+are pushed to a background reader thread, so nothing polls get_log() between
+commands. Sessions with neither (Firefox, grids that do not proxy DevTools)
+are not collected and a warning is logged.
+
+Pages are grouped by URL path with numeric segments folded ("/courses/{id}/").
+A test whose page logs more errors than the budget gets a warning, or fails
+with --console-budget-action fail.
+
+Example:
+    pytest src/tests --console-errors --console-error-budget 0 --console-budget-action fail
+"""
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+import websocket
+
+log = logging.getLogger(__name__)
+
+ERROR_LEVELS = ("error", "exception", "assert")
+
+
+def page_key(url):
+    """URL path with numeric segments folded, e.g. http://host/courses/12/?a=1 -> /courses/{id}/"""
+    if not url:
+        return "(unknown)"
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return url.split("?", 1)[0]
+    return re.sub(r"/\d+(?=/|$)", "/{id}", parts.path or "/")
+
+
+def devtools_url(capabilities):
+    """
+    The browser-level DevTools WebSocket URL of a session: "se:cdp" when the driver returns it,
+    otherwise webSocketDebuggerUrl from http://<debuggerAddress>/json/version.
+
+    Returns:
+        str: The URL, or None when the session exposes no DevTools endpoint.
+    """
+    capabilities = capabilities or {}
+    if capabilities.get("se:cdp"):
+        return capabilities["se:cdp"]
+    for options_key in ("goog:chromeOptions", "ms:edgeOptions"):
+        address = (capabilities.get(options_key) or {}).get("debuggerAddress")
+        if address:
+            response = requests.get(f"http://{address}/json/version", timeout=5)
+            response.raise_for_status()
+            return response.json().get("webSocketDebuggerUrl")
+    return None
+
+
+class _DevToolsListener:
+    """One DevTools connection: attaches to every page target of the browser and forwards events."""
+
+    def __init__(self, collector, cdp_url, session_id):
+        self.collector = collector
+        self.session_id = session_id
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._target_urls = {}    # targetId -> current URL
+        self._sessions = {}       # CDP sessionId -> targetId
+        self._socket = websocket.create_connection(cdp_url, timeout=10, suppress_origin=True)
+        self._socket.settimeout(None)
+        self._thread = threading.Thread(target=self._read, name=f"console-{session_id[:8]}", daemon=True)
+        self._thread.start()
+        self._send("Target.setDiscoverTargets", {"discover": True})
+
+    def _send(self, method, params=None, session=None):
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session:
+            message["sessionId"] = session
+        with self._send_lock:
+            self._socket.send(json.dumps(message))
+
+    def _read(self):
+        try:
+            while True:
+                message = json.loads(self._socket.recv())
+                if "method" in message:
+                    self._dispatch(message["method"], message.get("params", {}), message.get("sessionId"))
+        except Exception as e:
+            # The browser went away (driver.quit) or the connection dropped
+            log.debug(f"DevTools connection of session {self.session_id} closed: {e}")
+
+    def _dispatch(self, method, params, session):
+        if method in ("Target.targetCreated", "Target.targetInfoChanged"):
+            info = params["targetInfo"]
+            if info.get("type") != "page":
+                return
+            known = info["targetId"] in self._target_urls
+            self._target_urls[info["targetId"]] = info.get("url")
+            if method == "Target.targetCreated" and not known:
+                self._send("Target.attachToTarget", {"targetId": info["targetId"], "flatten": True})
+        elif method == "Target.targetDestroyed":
+            self._target_urls.pop(params.get("targetId"), None)
+        elif method == "Target.attachedToTarget":
+            self._sessions[params["sessionId"]] = params["targetInfo"]["targetId"]
+            self._target_urls[params["targetInfo"]["targetId"]] = params["targetInfo"].get("url")
+            for domain_enable in ("Runtime.enable", "Log.enable"):
+                self._send(domain_enable, session=params["sessionId"])
+        elif method == "Runtime.exceptionThrown":
+            details = params.get("exceptionDetails", {})
+            exception = details.get("exception") or {}
+            text = exception.get("description") or details.get("text", "")
+            self._add(session, "exception", "exception", text.splitlines()[0] if text else "",
+                      details.get("url"), details.get("lineNumber"))
+        elif method == "Log.entryAdded":
+            entry = params.get("entry", {})
+            self._add(session, "log", entry.get("level"), entry.get("text", ""), entry.get("url"),
+                      entry.get("lineNumber"), entry.get("source"))
+        elif method == "Runtime.consoleAPICalled" and params.get("type") in ("error", "warning", "assert"):
+            text = " ".join(str(arg.get("value", arg.get("description", ""))) for arg in params.get("args", []))
+            frames = (params.get("stackTrace") or {}).get("callFrames") or [{}]
+            self._add(session, "console", params["type"], text, frames[0].get("url"), frames[0].get("lineNumber"))
+
+    def _add(self, session, kind, level, text, source_url, line, source=None):
+        page_url = self._target_urls.get(self._sessions.get(session))
+        self.collector.add({"ts": round(time.time(), 3), "kind": kind, "level": level, "text": (text or "")[:500],
+                            "page": page_key(page_url), "url": page_url, "source_url": source_url,
+                            "line": line, "source": source, "session": self.session_id})
+
+    def close(self):
+        try:
+            self._socket.close()
+        except Exception:
+            pass
+
+
+class ConsoleCollector:
+
+    def __init__(self, error_budget=0, levels=("error", "exception", "assert", "warning")):
+        """
+        Args:
+            error_budget (int): Errors (exceptions, error logs, console.error) a page may log in one test.
+            levels (tuple): Levels that are kept; warnings are counted but never over budget.
+        """
+        self.error_budget = error_budget
+        self.levels = levels
+        self.current_test = None
+        self._listeners = {}
+        self._lock = threading.Lock()
+        self._by_test = {}        # test id -> [record]
+        self.page_totals = {}     # page -> {"errors": n, "warnings": n}
+        self.unavailable = 0
+        self.budget_breaches = []  # [(test id, message)], filled by conftest
+
+    def attach(self, driver):
+        """Opens a DevTools connection for the driver. Returns False when the session has none."""
+        if driver.session_id in self._listeners:
+            return True
+        try:
+            cdp_url = devtools_url(driver.capabilities)
+        except (requests.RequestException, ValueError) as e:
+            self.unavailable += 1
+            log.warning(f"Console collection skipped for session {driver.session_id}: "
+                        f"cannot read the DevTools endpoint from debuggerAddress: {e}")
+            return False
+        if not cdp_url:
+            self.unavailable += 1
+            log.warning(f"Console collection skipped for session {driver.session_id}: no DevTools endpoint "
+                        f"(browser: {driver.capabilities.get('browserName')}).")
+            return False
+        try:
+            self._listeners[driver.session_id] = _DevToolsListener(self, cdp_url, driver.session_id)
+        except Exception as e:
+            self.unavailable += 1
+            log.warning(f"Console collection skipped for session {driver.session_id}: cannot connect to {cdp_url}: {e}")
+            return False
+        log.info(f"Collecting console errors of session {driver.session_id} from {cdp_url}")
+        return True
+
+    def add(self, record):
+        level = "exception" if record["kind"] == "exception" else (record["level"] or "").lower()
+        if level not in self.levels:
+            return
+        record["level"] = level
+        with self._lock:
+            record["test"] = self.current_test
+            self._by_test.setdefault(self.current_test, []).append(record)
+            totals = self.page_totals.setdefault(record["page"], {"errors": 0, "warnings": 0})
+            totals["errors" if level in ERROR_LEVELS else "warnings"] += 1
+
+    def add_bidi(self, record):
+        """BidiSession.console_sink: adds a log.entryAdded record unless the session's DevTools listener reports it."""
+        if record.get("session") in self._listeners:
+            return
+        self.add(record)
+
+    def begin_test(self, test_id):
+        with self._lock:
+            self.current_test = test_id
+
+    def test_records(self, test_id):
+        with self._lock:
+            return list(self._by_test.get(test_id, []))
+
+    def test_pages(self, test_id):
+        """{page: {"errors": n, "warnings": n}} for one test."""
+        pages = {}
+        for record in self.test_records(test_id):
+            counts = pages.setdefault(record["page"], {"errors": 0, "warnings": 0})
+            counts["errors" if record["level"] in ERROR_LEVELS else "warnings"] += 1
+        return pages
+
+    def over_budget(self, test_id):
+        """[(page, errors)] for the pages that logged more errors than the budget in this test."""
+        return [(page, counts["errors"]) for page, counts in sorted(self.test_pages(test_id).items())
+                if counts["errors"] > self.error_budget]
+
+    def format_records(self, test_id, limit=20):
+        lines = []
+        for record in self.test_records(test_id)[:limit]:
+            where = record["source_url"] or record["source"] or ""
+            if record["source_url"] and record["line"] is not None:
+                where += f":{record['line']}"
+            lines.append(f"[{record['level']}] {record['page']}: {record['text']} {where}".rstrip())
+        return "\n".join(lines)
+
+    def close(self):
+        for listener in self._listeners.values():
+            listener.close()
+        self._listeners.clear()
@@ -0,0 +1,159 @@
+"""
+@package utilities
+
+SqliteSnapshot class implementation
+
+Snapshots the local SUT's SQLite database at session start and puts it back
+between classes or tests, so every test starts from the same small tables
+instead of the users and courses left behind by earlier runs.
+
+Both directions use SQLite's online backup API, which is safe while the Django
+dev server has the database open (a plain file copy is not). The snapshot is
+held in memory, so a restore costs milliseconds. A restore is skipped when
+nothing wrote to the database since the last one (PRAGMA data_version).
+
+Per-test restores keep the live django_session rows, so the browser a class
+logged in with in oneTimeSetUp stays logged in. Accounts a class created itself
+are still rolled back, and their sessions stop working with them.
+
+Example:
+    pytest src/tests --sut-db ../business_app/db.sqlite3 --sut-db-restore class
+    python src/utilities/db_snapshot.py save ../business_app/db.sqlite3 clean.sqlite3
+    python src/utilities/db_snapshot.py load ../business_app/db.sqlite3 clean.sqlite3
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+log = logging.getLogger(__name__)
+
+# Tables whose live rows survive a restore that passes keep_tables=SESSION_TABLES
+SESSION_TABLES = ("django_session",)
+
+
+class SqliteSnapshot:
+
+    def __init__(self, db_path, busy_timeout=30):
+        if not os.path.isfile(db_path):
+            raise FileNotFoundError(f"SUT database not found: {db_path}")
+        self.db_path = db_path
+        # Kept open for the whole run: restores write through it and data_version is tracked on it
+        self._live = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False)
+        self._snapshot = None
+        self._data_version = None
+        self.stats = {"snapshot_ms": None, "restores": 0, "skipped_restores": 0, "restore_ms_total": 0.0}
+
+    def _current_data_version(self):
+        return self._live.execute("PRAGMA data_version").fetchone()[0]
+
+    def take(self):
+        """Copies the live database into memory."""
+        start_time = time.perf_counter()
+        self._snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        self._live.backup(self._snapshot)
+        self._data_version = self._current_data_version()
+        self.stats["snapshot_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        counts = self.row_counts(self._snapshot)
+        log.info(f"Snapshot of {self.db_path} taken in {self.stats['snapshot_ms']} ms "
+                 f"({len(counts)} tables, {sum(counts.values())} rows)")
+
+    def is_dirty(self):
+        """True if another connection (the SUT) wrote to the database since the snapshot or the last restore."""
+        return self._current_data_version() != self._data_version
+
+    def restore(self, force=False, keep_tables=()):
+        """
+        Writes the snapshot back over the live database.
+
+        Args:
+            force (bool): Restore even if nothing wrote to the database since the last restore.
+            keep_tables (tuple): Tables whose current rows are kept instead of the snapshot's.
+
+        Returns:
+            float: Milliseconds spent, or 0.0 if the restore was skipped because nothing changed.
+        """
+        if self._snapshot is None:
+            raise RuntimeError("restore() called before take()")
+        if not force and not self.is_dirty():
+            self.stats["skipped_restores"] += 1
+            return 0.0
+        start_time = time.perf_counter()
+        kept = self._read_tables(keep_tables)
+        self._snapshot.backup(self._live)
+        if kept:
+            with self._live:
+                for table, rows in kept.items():
+                    self._live.execute(f'DELETE FROM "{table}"')
+                    if rows:
+                        placeholders = ", ".join("?" * len(rows[0]))
+                        self._live.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', rows)
+        self._data_version = self._current_data_version()
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        self.stats["restores"] += 1
+        self.stats["restore_ms_total"] = round(self.stats["restore_ms_total"] + duration_ms, 2)
+        log.info(f"Restored {self.db_path} from snapshot in {duration_ms} ms")
+        return duration_ms
+
+    def _read_tables(self, tables):
+        existing = {row[0] for row in self._live.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        return {table: self._live.execute(f'SELECT * FROM "{table}"').fetchall() for table in tables if table in existing}
+
+    def save(self, path):
+        """Writes the in-memory snapshot to a file (e.g. to keep a known clean state between runs)."""
+        target = sqlite3.connect(path)
+        try:
+            self._snapshot.backup(target)
+        finally:
+            target.close()
+
+    def load(self, path):
+        """Uses a snapshot file saved earlier instead of the current database contents."""
+        source = sqlite3.connect(path)
+        try:
+            self._snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+            source.backup(self._snapshot)
+        finally:
+            source.close()
+        self._data_version = None
+
+    @staticmethod
+    def row_counts(connection):
+        """Returns {table: row count} for every table in the database."""
+        tables = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")]
+        return {table: connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+
+    def close(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        self._live.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save or load a snapshot of the SUT's SQLite database.")
+    parser.add_argument("command", choices=["save", "load"],
+                        help="save: copy DB to SNAPSHOT; load: put SNAPSHOT back into DB")
+    parser.add_argument("db", help="Path of the SUT database (e.g. db.sqlite3)")
+    parser.add_argument("snapshot", help="Snapshot file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    snapshot = SqliteSnapshot(args.db)
+    try:
+        if args.command == "save":
+            snapshot.take()
+            snapshot.save(args.snapshot)
+        else:
+            snapshot.load(args.snapshot)
+            snapshot.restore(force=True)
+    finally:
+        snapshot.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+@package utilities
+
+Structured event log for SeleniumDriver actions.
+
+Every decorated action (get_element, click_element, send_keys_element, ...)
+emits one compact JSON line: test id, page class, calling page method,
+locator, action, duration and outcome. Lines are buffered in memory and the
+file is rotated by size, so the log stays cheap to write and to ship.
+
+Only the outermost action is recorded: the get_element call made inside
+click_element is part of the click's duration, not a record of its own.
+
+Example:
+    pytest src/tests --event-log test-results/events.ndjson
+    python src/utilities/event_log.py test-results/events.ndjson* --by locator --top 20
+"""
+import argparse
+import functools
+import glob
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_BUFFER_RECORDS = 256
+
+
+class EventLogWriter:
+    """Buffered newline-delimited JSON writer with size-based rotation (path, path.1, ... path.N)."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 buffer_records=DEFAULT_BUFFER_RECORDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_records = buffer_records
+        self._buffer = []
+        # The trio facade drives page objects from worker threads
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_records:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer = []
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+
+_writer = None
+_state = threading.local()
+# Called with (page object, record) after every recorded action, e.g. the failure trace recorder
+_listeners = []
+
+
+def configure(path, **kwargs):
+    """Starts writing events to path. Called once per session from conftest (--event-log)."""
+    global _writer
+    close()
+    _writer = EventLogWriter(path, **kwargs)
+    return _writer
+
+
+def close():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def is_enabled():
+    return _writer is not None
+
+
+def add_listener(listener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def emit(record):
+    if _writer is not None:
+        _writer.write(record)
+
+
+def current_test_id():
+    # PYTEST_CURRENT_TEST looks like "src/tests/x.py::TestX::test_y (call)"
+    current = os.environ.get("PYTEST_CURRENT_TEST", "")
+    return current.rsplit(" (", 1)[0] if current else None
+
+
+def logged_action(func):
+    """
+    Decorator for SeleniumDriver actions. The locator is taken from the "locator" /
+    "locatorType" arguments; False/None results are recorded as "fail", exceptions as "error".
+    Costs a single attribute check when no event log or listener is configured.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if (_writer is None and not _listeners) or getattr(_state, "active", False):
+            return func(self, *args, **kwargs)
+
+        caller = sys._getframe(1).f_code.co_name
+        _state.active = True
+        outcome = "error"
+        start_time = time.perf_counter()
+        try:
+            result = func(self, *args, **kwargs)
+            outcome = "fail" if result is False or result is None else "ok"
+            return result
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            _state.active = False
+            locator, locator_type = _locator_from_args(func.__name__, args, kwargs)
+            record = {
+                "ts": round(time.time(), 3),
+                "test": current_test_id(),
+                "page": type(self).__name__,
+                "method": caller,
+                "action": func.__name__,
+                "locator": locator,
+                "locator_type": locator_type,
+                "duration_ms": round(duration_ms, 2),
+                "outcome": outcome,
+            }
+            emit(record)
+            for listener in _listeners:
+                listener(self, record)
+    return wrapper
+
+
+def _locator_from_args(action, args, kwargs):
+    # send_keys_element and wait_for_text take the data/text first: (data, locator, locatorType)
+    offset = 1 if action in ("send_keys_element", "wait_for_text") else 0
+    locator = kwargs.get("locator", args[offset] if len(args) > offset else None)
+    locator_type = kwargs.get("locatorType", args[offset + 1] if len(args) > offset + 1 else "id")
+    if not isinstance(locator, str):
+        locator = None
+    return locator, locator_type if locator else None
+
+
+class LatencyHistogram:
+    """Constant-memory latency histogram with log-spaced buckets (~5% relative error)."""
+
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value, failed=False):
+        self.count += 1
+        self.failures += int(failed)
+        self.total += value
+        self.max = max(self.max, value)
+        bucket = int(math.log(value, self.GROWTH)) if value > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.GROWTH ** (bucket + 0.5) if bucket else 1.0, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean_ms": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "max_ms": round(self.max, 1),
+        }
+
+
+def iter_events(paths):
+    """Streams records from one or more event log files, skipping lines that do not parse."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def aggregate(events, by="locator"):
+    """Aggregates events into {key: LatencyHistogram}. by: locator, test, page or action."""
+    histograms = {}
+    for event in events:
+        if by == "locator":
+            key = f"{event.get('page')}:{event.get('locator_type')}={event.get('locator')}"
+        elif by == "page":
+            key = f"{event.get('page')}.{event.get('method')}"
+        else:
+            key = str(event.get(by))
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        histogram.add(event.get("duration_ms", 0.0), event.get("outcome") != "ok")
+    return histograms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency statistics from SeleniumDriver event logs.")
+    parser.add_argument("paths", nargs="+", help="Event log files (globs are expanded)")
+    parser.add_argument("--by", choices=["locator", "test", "page", "action"], default="locator")
+    parser.add_argument("--top", type=int, default=20, help="Show the N keys with the highest total time")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON")
+    args = parser.parse_args(argv)
+
+    paths = sorted({p for pattern in args.paths for p in (glob.glob(pattern) or [pattern])})
+    histograms = aggregate(iter_events(paths), by=args.by)
+    ranked = sorted(histograms.items(), key=lambda item: item[1].total, reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({key: h.summary() for key, h in ranked}, indent=2))
+        return 0
+    print(f"{'count':>7} {'fail':>5} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}  {args.by}")
+    for key, histogram in ranked:
+        s = histogram.summary()
+        print(f"{s['count']:>7} {s['failures']:>5} {s['mean_ms']:>8} {s['p50_ms']:>8} "
+              f"{s['p95_ms']:>8} {s['max_ms']:>8}  {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
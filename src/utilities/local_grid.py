@@ -0,0 +1,318 @@
+"""
+@package utilities
+
+Container-free stand-in for a Selenium Grid hub, for exercising the remote mode
+(session reuse, capability negotiation, concurrency limits) on one Linux box.
+
+The hub speaks the W3C WebDriver protocol on one port and forwards every
+command to a chromedriver process it launched itself ("node"). Each node
+accepts at most max_sessions sessions; a new-session request waits in a queue
+until a slot is free (or new_session_timeout passes). Capabilities are matched
+the W3C way (alwaysMatch merged with each firstMatch entry in turn).
+
+Example:
+    python src/utilities/local_grid.py --port 4444 --nodes 2 --max-sessions 2
+    pytest src/tests --browser remote --grid-url http://127.0.0.1:4444
+"""
+import argparse
+import http.client
+import json
+import logging
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+SESSION_PATH = re.compile(r"^/session/([^/]+)(/.*)?$")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Node:
+    """One chromedriver process and the sessions running on it."""
+
+    def __init__(self, name, driver_path, max_sessions, browser_name="chrome", browser_version=None,
+                 platform_name=None, port=None):
+        self.name = name
+        self.max_sessions = max_sessions
+        self.browser_name = browser_name
+        self.browser_version = browser_version
+        self.platform_name = platform_name or sys.platform.rstrip("0123456789")
+        self.port = port or _free_port()
+        self.sessions = set()
+        self.process = None
+        self.driver_path = driver_path
+
+    def start(self, startup_timeout=20):
+        self.process = subprocess.Popen([self.driver_path, f"--port={self.port}"],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + startup_timeout
+        while time.time() < deadline:
+            try:
+                status, _, _ = self.request("GET", "/status", None)
+                if status == 200:
+                    log.info(f"Node {self.name} ready on port {self.port} (max {self.max_sessions} sessions)")
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f"Node {self.name} ({self.driver_path}) did not start within {startup_timeout} seconds")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    @property
+    def free_slots(self):
+        return self.max_sessions - len(self.sessions)
+
+    def matches(self, capabilities):
+        if capabilities.get("browserName") not in (None, self.browser_name):
+            return False
+        platform_name = capabilities.get("platformName")
+        if platform_name and platform_name.lower() not in ("any", self.platform_name):
+            return False
+        browser_version = capabilities.get("browserVersion")
+        if browser_version and self.browser_version and not self.browser_version.startswith(browser_version):
+            return False
+        return True
+
+    def request(self, method, path, body, timeout=300):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=timeout)
+        try:
+            headers = {"Content-Type": "application/json; charset=utf-8"} if body is not None else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.getheader("Content-Type", "application/json"), response.read()
+        finally:
+            connection.close()
+
+
+class LocalGrid:
+    """Schedules new sessions onto nodes and routes session commands to the node that owns them."""
+
+    def __init__(self, nodes, new_session_timeout=120):
+        self.nodes = nodes
+        self.new_session_timeout = new_session_timeout
+        self._routes = {}
+        self._condition = threading.Condition()
+        self.stats = {"sessions_created": 0, "queued_requests": 0, "rejected_requests": 0}
+
+    @staticmethod
+    def candidate_capabilities(payload):
+        """W3C capability processing: alwaysMatch merged with every firstMatch entry, in order."""
+        capabilities = payload.get("capabilities", {})
+        always = capabilities.get("alwaysMatch", {})
+        return [dict(always, **first) for first in capabilities.get("firstMatch", [{}]) or [{}]]
+
+    def reserve_node(self, candidates):
+        """Blocks until a matching node has a free slot. Returns (node, capabilities) or (None, reason)."""
+        matching = [(node, caps) for caps in candidates for node in self.nodes if node.matches(caps)]
+        if not matching:
+            self.stats["rejected_requests"] += 1
+            return None, f"No node supports any of the requested capabilities: {candidates}"
+
+        deadline = time.time() + self.new_session_timeout
+        queued = False
+        with self._condition:
+            while True:
+                for node, caps in matching:
+                    if node.free_slots > 0:
+                        # Hold the slot with a placeholder until the node answers
+                        node.sessions.add(f"pending-{id(caps)}-{time.time()}")
+                        return node, caps
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.stats["rejected_requests"] += 1
+                    return None, f"Timed out after {self.new_session_timeout}s waiting for a free slot"
+                if not queued:
+                    queued = True
+                    self.stats["queued_requests"] += 1
+                    log.info("All matching nodes are at their session limit, queueing the request")
+                self._condition.wait(remaining)
+
+    def session_started(self, node, session_id):
+        with self._condition:
+            node.sessions.discard(next((s for s in node.sessions if s.startswith("pending-")), None))
+            if session_id:
+                node.sessions.add(session_id)
+                self._routes[session_id] = node
+                self.stats["sessions_created"] += 1
+            self._condition.notify_all()
+
+    def session_ended(self, session_id):
+        with self._condition:
+            node = self._routes.pop(session_id, None)
+            if node:
+                node.sessions.discard(session_id)
+            self._condition.notify_all()
+
+    def node_for(self, session_id):
+        with self._condition:
+            return self._routes.get(session_id)
+
+    def status(self):
+        with self._condition:
+            return {
+                "ready": any(node.free_slots > 0 for node in self.nodes),
+                "message": "Local stand-in grid",
+                "nodes": [{"id": node.name, "port": node.port, "browserName": node.browser_name,
+                           "maxSessions": node.max_sessions, "sessions": len(node.sessions)} for node in self.nodes],
+                "stats": dict(self.stats),
+            }
+
+
+class GridRequestHandler(BaseHTTPRequestHandler):
+    grid = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        log.debug(format % args)
+
+    def _send(self, status, body, content_type="application/json; charset=utf-8"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, error, message):
+        self._send(status, {"value": {"error": error, "message": message, "stacktrace": ""}})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else None
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    def _route(self, method):
+        body = self._read_body()
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        if path.startswith("/wd/hub"):
+            path = path[len("/wd/hub"):] or "/"
+
+        if method == "GET" and path == "/status":
+            self._send(200, {"value": self.grid.status()})
+        elif method == "POST" and path == "/session":
+            self._new_session(body)
+        else:
+            match = SESSION_PATH.match(path)
+            if not match:
+                self._error(404, "unknown command", f"Unknown command: {method} {path}")
+                return
+            self._forward(method, path, body, match.group(1), is_delete=(method == "DELETE" and not match.group(2)))
+
+    def _new_session(self, body):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._error(400, "invalid argument", "New session payload is not valid JSON")
+            return
+        node, detail = self.grid.reserve_node(self.grid.candidate_capabilities(payload))
+        if node is None:
+            self._error(500, "session not created", detail)
+            return
+
+        session_id = None
+        try:
+            # Forward only the capability set that matched this node
+            status, content_type, response = node.request(
+                "POST", "/session", json.dumps({"capabilities": {"alwaysMatch": detail, "firstMatch": [{}]}}))
+            if status == 200:
+                session_id = json.loads(response)["value"]["sessionId"]
+                log.info(f"Session {session_id} started on node {node.name}")
+            self._send(status, response, content_type)
+        except OSError as e:
+            self._error(500, "session not created", f"Node {node.name} unreachable: {e}")
+        finally:
+            self.grid.session_started(node, session_id)
+
+    def _forward(self, method, path, body, session_id, is_delete):
+        node = self.grid.node_for(session_id)
+        if node is None:
+            self._error(404, "invalid session id", f"Unknown session: {session_id}")
+            return
+        try:
+            status, content_type, response = node.request(method, path, body)
+        except OSError as e:
+            self._error(500, "unknown error", f"Node {node.name} unreachable: {e}")
+            return
+        finally:
+            if is_delete:
+                self.grid.session_ended(session_id)
+        self._send(status, response, content_type)
+
+
+def start_grid(port=4444, nodes=1, max_sessions=2, driver_path=None, new_session_timeout=120, browser_version=None):
+    """Launches the nodes and serves the hub in a background thread. Returns (server, grid)."""
+    driver_path = driver_path or shutil.which("chromedriver")
+    if not driver_path:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+
+    grid_nodes = [Node(f"node-{i + 1}", driver_path, max_sessions, browser_version=browser_version) for i in range(nodes)]
+    for node in grid_nodes:
+        node.start()
+    grid = LocalGrid(grid_nodes, new_session_timeout)
+    handler = type("BoundGridRequestHandler", (GridRequestHandler,), {"grid": grid})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log.info(f"Local grid listening on http://127.0.0.1:{server.server_port} with {nodes} node(s)")
+    return server, grid
+
+
+def stop_grid(server, grid):
+    server.shutdown()
+    server.server_close()
+    for node in grid.nodes:
+        node.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in Selenium Grid hub forwarding to chromedrivers.")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--nodes", type=int, default=1, help="Number of chromedriver processes")
+    parser.add_argument("--max-sessions", type=int, default=2, help="Concurrent sessions per node")
+    parser.add_argument("--chromedriver", default=None, help="chromedriver path (default: PATH, then webdriver-manager)")
+    parser.add_argument("--new-session-timeout", type=int, default=120)
+    parser.add_argument("--browser-version", default=None,
+                        help="Browser version the nodes advertise (requests pinning another version do not match)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server, grid = start_grid(args.port, args.nodes, args.max_sessions, args.chromedriver, args.new_session_timeout,
+                              args.browser_version)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_grid(server, grid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+@package utilities
+
+LocatorAudit class implementation
+Validates every locator declared on a page object against the current page
+with a single execute_script call, instead of paying a get_element timeout
+per broken locator.
+
+Example:
+    audit = LocatorAudit(self.driver, self.base_url)
+    results = audit.audit_page(login_page)
+    assert not audit.failures(results)
+"""
+import re
+import logging
+import utilities.custome_logger as cl
+from selenium.webdriver.common.by import By
+from base.selenium_driver import SeleniumDriver
+from base.js_locators import BATCH_LOCATOR_CHECK_JS
+
+class LocatorAudit(SeleniumDriver):
+
+    log = cl.CustomLogger(logging.INFO)
+
+    STATUS_OK = "ok"
+    STATUS_HIDDEN = "hidden"          # present in the DOM but not visible (e.g. later wizard steps)
+    STATUS_AMBIGUOUS = "ambiguous"    # matches more than one element
+    STATUS_MISSING = "missing"
+    STATUS_INVALID = "invalid"        # the browser rejected the selector/XPath
+    STATUS_UNKNOWN = "unknown"        # asked for by name, but the page object has no such locator
+
+    _DJANGO_ID = re.compile(r"^id_[\w-]+$")
+
+    def __init__(self, driver, base_url):
+        super(LocatorAudit, self).__init__(driver, base_url)
+
+    def collect_locators(self, page):
+        """
+        Returns {attribute_name: (By, value)} for every static locator declared on a page object.
+        Templates ("{}"), lambdas and URLs are skipped because they need runtime data.
+        """
+        attributes = {}
+        for cls in reversed(type(page).__mro__):
+            if cls in (object, SeleniumDriver) or not issubclass(cls, SeleniumDriver):
+                continue
+            attributes.update({k: v for k, v in vars(cls).items() if not k.startswith("__")})
+        attributes.update(vars(page))
+
+        locators = {}
+        for name, value in attributes.items():
+            if name.endswith("_type"):
+                continue
+            explicit_type = attributes.get(f"{name}_type")
+
+            if isinstance(value, tuple) and len(value) == 2 and isinstance(value[1], str):
+                by, locator = value
+            elif isinstance(value, str):
+                locator = value.strip()
+                if not locator or "{" in locator or "://" in locator:
+                    continue
+                if isinstance(explicit_type, str):
+                    by = self._get_by_type(explicit_type)
+                elif locator.startswith("/") or locator.startswith("("):
+                    by = By.XPATH
+                elif self._DJANGO_ID.match(locator):
+                    by = By.ID
+                else:
+                    continue # Plain data such as "English" or "admin"
+            else:
+                continue
+
+            if by:
+                locators[name] = (by, locator)
+        return locators
+
+    def audit_page(self, page, only=None):
+        """
+        Checks the locators of a page object against the page the browser is currently on.
+
+        Args:
+            page: A page object instance (subclass of SeleniumDriver).
+            only (list): Attribute names to check. Defaults to every collected locator.
+
+        Returns:
+            dict: {attribute_name: {"locator", "by", "count", "visible", "status", "error"}}
+        """
+        locators = self.collect_locators(page)
+        unknown = []
+        if only:
+            # A typo or a renamed locator must fail the audit, not shrink it
+            unknown = [name for name in only if name not in locators]
+            if unknown:
+                self.log.error(f"{type(page).__name__} has no static locators named: {unknown}")
+            locators = {name: locators[name] for name in only if name in locators}
+
+        checks = [[name, by, locator] for name, (by, locator) in locators.items()]
+        raw = self.driver.execute_script(BATCH_LOCATOR_CHECK_JS, checks) or {}
+
+        results = {}
+        for name, (by, locator) in locators.items():
+            entry = raw.get(name, {"count": 0, "visible": 0, "error": "no result returned"})
+            results[name] = {
+                "locator": locator,
+                "by": by,
+                "count": entry["count"],
+                "visible": entry["visible"],
+                "error": entry["error"],
+                "status": self._status(entry),
+            }
+        for name in unknown:
+            results[name] = {"locator": None, "by": None, "count": 0, "visible": 0,
+                             "error": "no such locator on the page object", "status": self.STATUS_UNKNOWN}
+        self.log_report(type(page).__name__, results)
+        return results
+
+    def _status(self, entry):
+        if entry["error"]:
+            return self.STATUS_INVALID
+        if entry["count"] == 0:
+            return self.STATUS_MISSING
+        if entry["count"] > 1:
+            return self.STATUS_AMBIGUOUS
+        if entry["visible"] == 0:
+            return self.STATUS_HIDDEN
+        return self.STATUS_OK
+
+    def failures(self, results):
+        """Locators that would make get_element time out (missing or rejected by the browser), or do not exist."""
+        return {name: r for name, r in results.items()
+                if r["status"] in (self.STATUS_MISSING, self.STATUS_INVALID, self.STATUS_UNKNOWN)}
+
+    def log_report(self, page_name, results):
+        self.log.info(f"### LOCATOR AUDIT :: {page_name} ({len(results)} locators) on {self.driver.current_url}")
+        for name, r in sorted(results.items(), key=lambda item: item[1]["status"]):
+            message = (f"{r['status'].upper():9} {name} = '{r['locator']}' ({r['by']}) "
+                       f"matches={r['count']} visible={r['visible']}")
+            if r["error"]:
+                message += f" error={r['error']}"
+            if r["status"] in (self.STATUS_MISSING, self.STATUS_INVALID, self.STATUS_UNKNOWN):
+                self.log.error(message)
+            elif r["status"] == self.STATUS_AMBIGUOUS:
+                self.log.warning(message)
+            else:
+                self.log.info(message)
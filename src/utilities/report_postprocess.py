@@ -0,0 +1,333 @@
+"""
+@package utilities
+
+Post-processing of the Allure/JUnit results before they are published.
+
+Runs in a process pool and streams over the result directory:
+  1. optimizes PNG screenshots losslessly (or converts them to WebP with --webp, needs Pillow),
+     both the Allure attachments and the files SeleniumDriver saves to screenshots/
+  2. collapses repeated lines in text/log attachments
+  3. deduplicates attachments by content hash and points every result at one copy
+  4. writes a compact summary JSON (Allure statuses, slowest tests, JUnit totals, bytes saved)
+
+Example:
+    python src/utilities/report_postprocess.py --allure-dir allure-results --screenshots-dir screenshots \
+        --junit test-results/junit_report.xml --summary test-results/summary.json
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+log = logging.getLogger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Chunks needed to render the image with the same colours; everything else (text, timestamps, ...) is dropped.
+PNG_KEEP_CHUNKS = {b"IHDR", b"PLTE", b"tRNS", b"IDAT", b"IEND", b"gAMA", b"cHRM", b"sRGB", b"iCCP"}
+TEXT_EXTENSIONS = (".txt", ".log")
+# Leading timestamps are ignored when deciding whether two log lines repeat each other.
+LOG_TIMESTAMP = re.compile(r"^\s*(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2} [AP]M|\d{4}-\d{2}-\d{2}[ T][\d:,.]+)\s*-?\s*")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_png_chunks(data):
+    position = len(PNG_SIGNATURE)
+    while position < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[position:position + 8])
+        yield chunk_type, data[position + 8:position + 8 + length]
+        position += 12 + length
+
+
+def _png_chunk(chunk_type, payload):
+    return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", zlib.crc32(chunk_type + payload))
+
+
+def optimize_png(path):
+    """Recompresses the image data at the highest zlib level and drops ancillary chunks. Returns the new size."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        return len(data)
+
+    header, image_data, trailer = [], [], []
+    for chunk_type, payload in _read_png_chunks(data):
+        if chunk_type not in PNG_KEEP_CHUNKS:
+            continue
+        if chunk_type == b"IDAT":
+            image_data.append(payload)
+        elif image_data:
+            trailer.append(_png_chunk(chunk_type, payload))
+        else:
+            header.append(_png_chunk(chunk_type, payload))
+
+    compressed = zlib.compress(zlib.decompress(b"".join(image_data)), 9)
+    optimized = PNG_SIGNATURE + b"".join(header) + _png_chunk(b"IDAT", compressed) + b"".join(trailer)
+    if len(optimized) >= len(data):
+        return len(data)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(optimized)
+    os.replace(tmp_path, path)
+    return len(optimized)
+
+
+def convert_png_to_webp(path):
+    """Converts a PNG to lossless WebP next to it and removes the PNG. Returns the new path, or None without Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    webp_path = os.path.splitext(path)[0] + ".webp"
+    with Image.open(path) as image:
+        image.save(webp_path, "WEBP", lossless=True, method=6)
+    os.remove(path)
+    return webp_path
+
+
+def collapse_repeated_lines(path):
+    """Streams a text attachment and collapses consecutive repeated lines. Returns the new size."""
+    tmp_path = path + ".tmp"
+    previous_key, previous_line, repeats = None, None, 0
+
+    def flush(out):
+        if previous_line is None:
+            return
+        out.write(previous_line)
+        if repeats:
+            out.write(f"... (previous line repeated {repeats} more times)\n")
+
+    with open(path, "r", encoding="utf-8", errors="replace") as src, \
+            open(tmp_path, "w", encoding="utf-8") as out:
+        for line in src:
+            key = LOG_TIMESTAMP.sub("", line).rstrip()
+            if key == previous_key:
+                repeats += 1
+                continue
+            flush(out)
+            previous_key, previous_line, repeats = key, line if line.endswith("\n") else line + "\n", 0
+        flush(out)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def process_attachment(task):
+    """Worker: shrinks one attachment and hashes the result. Runs in a child process."""
+    path, use_webp = task
+    size_before = os.path.getsize(path)
+    new_path = path
+    try:
+        lower = path.lower()
+        if lower.endswith(".png"):
+            converted = convert_png_to_webp(path) if use_webp else None
+            if converted:
+                new_path = converted
+            else:
+                optimize_png(path)
+        elif lower.endswith(TEXT_EXTENSIONS):
+            collapse_repeated_lines(path)
+    except Exception as e:
+        # A corrupt attachment is published as is
+        log.warning(f"Could not optimize {path}: {e}")
+    return {
+        "name": os.path.basename(path),
+        "new_name": os.path.basename(new_path),
+        "sha256": file_sha256(new_path),
+        "size_before": size_before,
+        "size_after": os.path.getsize(new_path),
+    }
+
+
+def _rewrite_attachments(node, renames):
+    changed = False
+    for attachment in node.get("attachments", []):
+        target = renames.get(attachment.get("source"))
+        if target:
+            attachment["source"] = target
+            if target.endswith(".webp"):
+                attachment["type"] = "image/webp"
+            changed = True
+    for step in node.get("steps", []):
+        changed = _rewrite_attachments(step, renames) or changed
+    for key in ("befores", "afters"):
+        for fixture in node.get(key, []):
+            changed = _rewrite_attachments(fixture, renames) or changed
+    return changed
+
+
+def process_result_file(task):
+    """Worker: points attachment references at the deduplicated/converted files and returns a summary record."""
+    path, renames = task
+    with open(path, "r", encoding="utf-8") as f:
+        result = json.load(f)
+    if renames and _rewrite_attachments(result, renames):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    if not path.endswith("-result.json"):
+        return None
+    start, stop = result.get("start"), result.get("stop")
+    return {
+        "name": result.get("fullName") or result.get("name"),
+        "status": result.get("status", "unknown"),
+        "duration_ms": (stop - start) if start and stop else None,
+    }
+
+
+def bounded_map(executor, func, tasks, window):
+    """Like executor.map, but keeps at most `window` tasks in flight so huge directories are streamed."""
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(func, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def junit_totals(junit_path):
+    """Counts JUnit test cases by outcome with iterparse, clearing elements as it goes."""
+    totals = Counter()
+    if not junit_path or not os.path.exists(junit_path):
+        return dict(totals)
+    for _, element in ET.iterparse(junit_path, events=("end",)):
+        if element.tag != "testcase":
+            continue
+        outcome = "passed"
+        for child in element:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = child.tag
+                break
+        totals[outcome] += 1
+        totals["time_s"] += float(element.get("time") or 0)
+        element.clear()
+    totals["time_s"] = round(totals["time_s"], 3)
+    return dict(totals)
+
+
+def postprocess(allure_dir, junit_path=None, summary_path=None, workers=None, use_webp=False, window=64, slowest=10,
+                screenshots_dir=None):
+    start_time = time.time()
+
+    def attachment_tasks():
+        with os.scandir(allure_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and "-attachment" in entry.name and not entry.name.endswith(".tmp"):
+                    yield entry.path, use_webp
+
+    def screenshot_tasks():
+        # Failure screenshots SeleniumDriver saves next to the run; nothing refers to them, so no dedup
+        if not screenshots_dir or not os.path.isdir(screenshots_dir):
+            return
+        with os.scandir(screenshots_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".png"):
+                    yield entry.path, use_webp
+
+    def result_tasks(renames):
+        with os.scandir(allure_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(("-result.json", "-container.json")):
+                    yield entry.path, renames
+
+    bytes_before = bytes_after = attachment_count = 0
+    canonical_by_hash, renames, duplicates = {}, {}, []
+    statuses, durations = Counter(), []
+    screenshots = {"count": 0, "bytes_before": 0, "bytes_after": 0}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for info in bounded_map(executor, process_attachment, attachment_tasks(), window):
+            attachment_count += 1
+            bytes_before += info["size_before"]
+            canonical = canonical_by_hash.setdefault(info["sha256"], info["new_name"])
+            if canonical != info["new_name"]:
+                duplicates.append(info["new_name"])
+                renames[info["name"]] = canonical
+            else:
+                bytes_after += info["size_after"]
+                if info["new_name"] != info["name"]:
+                    renames[info["name"]] = info["new_name"]
+
+        for info in bounded_map(executor, process_attachment, screenshot_tasks(), window):
+            screenshots["count"] += 1
+            screenshots["bytes_before"] += info["size_before"]
+            screenshots["bytes_after"] += info["size_after"]
+
+        for record in bounded_map(executor, process_result_file, result_tasks(renames), window):
+            if record is None:
+                continue
+            statuses[record["status"]] += 1
+            if record["duration_ms"] is not None:
+                durations.append((record["duration_ms"], record["name"]))
+                durations = sorted(durations, reverse=True)[:slowest]
+
+    # References are rewritten first, so removing the duplicates never leaves a dangling attachment
+    for name in duplicates:
+        try:
+            os.remove(os.path.join(allure_dir, name))
+        except OSError as e:
+            log.warning(f"Could not remove duplicate attachment {name}: {e}")
+
+    summary = {
+        "allure": {"tests": sum(statuses.values()), "statuses": dict(statuses)},
+        "slowest": [{"name": name, "duration_ms": duration} for duration, name in durations],
+        "junit": junit_totals(junit_path),
+        "attachments": {
+            "count": attachment_count,
+            "duplicates_removed": len(duplicates),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+        },
+        "screenshots": screenshots,
+        "postprocess_seconds": round(time.time() - start_time, 2),
+    }
+    if summary_path:
+        os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, separators=(",", ":"))
+    log.info(f"Post-processed {attachment_count} attachments ({len(duplicates)} duplicates, "
+             f"{bytes_before} -> {bytes_after} bytes) and {screenshots['count']} screenshots "
+             f"({screenshots['bytes_before']} -> {screenshots['bytes_after']} bytes) in {summary['postprocess_seconds']} seconds.")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shrink and summarize Allure/JUnit results before publishing.")
+    parser.add_argument("--allure-dir", default="allure-results")
+    parser.add_argument("--junit", default=None, help="JUnit XML report to include in the summary")
+    parser.add_argument("--summary", default=None, help="Where to write the compact summary JSON")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--screenshots-dir", default="screenshots",
+                        help="Directory of the failure screenshots SeleniumDriver saves (optimized in place)")
+    parser.add_argument("--webp", action="store_true", help="Convert PNG screenshots to lossless WebP (needs Pillow)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if not os.path.isdir(args.allure_dir):
+        log.error(f"Allure results directory not found: {args.allure_dir}")
+        return 1
+    summary = postprocess(args.allure_dir, args.junit, args.summary, args.workers, args.webp,
+                          screenshots_dir=args.screenshots_dir)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+@package utilities
+
+ResultCache class implementation
+
+Reuses earlier passes of read-only tests (marked @pytest.mark.cacheable) so a
+pipeline does not repeat browser work whose outcome cannot have changed. A pass
+is reused only if, within its TTL, all of these are unchanged:
+  - the test id
+  - the test's source
+  - every project module the test imports, directly or not, and every module
+    conftest.py imports (whole files, so module constants such as the
+    js_locators scripts count too)
+  - the SUT build, read from a version endpoint (see sut_fingerprint)
+
+Without a version endpoint the home page's headers and asset URLs stay the same
+across deploys unless the static file names are hashed, so conftest requires
+--sut-version-path with --result-cache.
+
+Example:
+    @pytest.mark.cacheable(ttl=6 * 3600)
+    def test_invalid_login(self): ...
+
+    pytest src/tests --result-cache --sut-version-path /version/
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import requests
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600
+# Response headers that change with a deploy
+BUILD_HEADERS = ("x-app-version", "x-build-id", "x-render-deploy-id", "etag", "last-modified")
+# Static assets in the page; their URLs carry the collectstatic/manifest hashes
+ASSET_URL = re.compile(r"""(?:src|href)=["']([^"']+\.(?:js|css)(?:\?[^"']*)?)["']""")
+
+
+def sut_fingerprint(base_url, version_path=None, timeout=10):
+    """
+    Fingerprint of the deployed SUT build. Uses version_path (e.g. "/version/") when the app
+    exposes one, otherwise the build headers and static asset URLs of the base page. The
+    latter only changes with a deploy when the asset names carry content hashes.
+
+    Returns:
+        str: Hex digest, or None if the SUT could not be reached (nothing is then reused).
+    """
+    url = base_url.rstrip("/") + "/" + (version_path or "").lstrip("/")
+    try:
+        response = requests.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        log.warning(f"Could not fingerprint the SUT at {url}: {e}")
+        return None
+    if response.status_code >= 400:
+        log.warning(f"Could not fingerprint the SUT at {url}: HTTP {response.status_code}")
+        return None
+
+    digest = hashlib.sha1()
+    if version_path:
+        digest.update(response.content)
+    else:
+        for header in BUILD_HEADERS:
+            digest.update(f"{header}={response.headers.get(header, '')}\n".encode())
+        for asset in sorted(set(ASSET_URL.findall(response.text))):
+            digest.update(asset.encode() + b"\n")
+    return digest.hexdigest()
+
+
+class ResultCache:
+
+    def __init__(self, path, sut_fingerprint, graph=None, repo_root="."):
+        self.path = path
+        self.sut_fingerprint = sut_fingerprint
+        self.graph = graph
+        self.repo_root = repo_root
+        self.entries = self._read()
+        self.reused = []
+        self.stored = 0
+        self._file_lines = {}
+        self._file_hashes = {}
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError:
+            log.warning(f"Ignoring unreadable result cache {self.path}")
+            return {}
+
+    def save(self):
+        now = time.time()
+        live = {test_id: entry for test_id, entry in self.entries.items() if entry["expires"] > now}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(live, f, indent=1, sort_keys=True)
+
+    def _source(self, member):
+        """Source lines of one impact graph member ("path::Class::name")."""
+        path = member.split("::", 1)[0]
+        if path not in self._file_lines:
+            try:
+                with open(os.path.join(self.repo_root, path), encoding="utf-8") as f:
+                    self._file_lines[path] = f.readlines()
+            except OSError:
+                self._file_lines[path] = []
+        start, end = self.graph.members.get(member, (1, 0))
+        return "".join(self._file_lines[path][start - 1:end])
+
+    def _file_hash(self, path):
+        if path not in self._file_hashes:
+            try:
+                with open(os.path.join(self.repo_root, path), "rb") as f:
+                    self._file_hashes[path] = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                self._file_hashes[path] = "missing"
+        return self._file_hashes[path]
+
+    def key(self, test_id):
+        """
+        Returns:
+            str: Cache key for the test, or None if it cannot be keyed safely.
+        """
+        if self.sut_fingerprint is None or self.graph is None or test_id not in self.graph.tests:
+            return None
+        test_source = hashlib.sha1(self._source(test_id).encode()).hexdigest()
+        # Whole modules, not just the members the test reaches: constants and scripts live at module level
+        modules = set(self.graph.tests[test_id]["modules"]).union(self.graph.data.get("conftest_modules", []))
+        imported = hashlib.sha1()
+        for path in sorted(modules):
+            imported.update(path.encode() + b"\0" + self._file_hash(path).encode() + b"\n")
+        return "|".join([test_id, test_source, imported.hexdigest(), self.sut_fingerprint])
+
+    def lookup(self, test_id):
+        """
+        Returns:
+            dict: The cached pass ({"key", "passed_at", "expires"}) if still valid, else None.
+        """
+        entry = self.entries.get(test_id)
+        if entry is None or entry["expires"] <= time.time():
+            return None
+        if entry["key"] != self.key(test_id):
+            return None
+        self.reused.append(test_id)
+        return entry
+
+    def store(self, test_id, ttl=DEFAULT_TTL):
+        key = self.key(test_id)
+        if key is None:
+            return
+        now = time.time()
+        self.entries[test_id] = {"key": key, "passed_at": now, "expires": now + ttl}
+        self.stored += 1
+
+    def invalidate(self, test_id):
+        self.entries.pop(test_id, None)
@@ -0,0 +1,143 @@
+"""
+@package utilities
+
+SutHealthMonitor class implementation
+
+Probes the system under test over HTTP so a dead or cold-starting environment
+costs seconds instead of every locator running to its full timeout:
+  - wait_until_ready() waits for cold start within a bounded budget (exponential backoff)
+  - after a failing test, probe_after_failure() checks the SUT; repeated unhealthy
+    probes open the breaker and the remaining tests are skipped (or the run aborted)
+  - while the breaker is open SeleniumDriver actions fail immediately, and it is
+    re-probed every recheck_interval seconds so a recovered SUT closes it again
+
+Example:
+    monitor = SutHealthMonitor("https://staging.example.com", cold_start_budget=180)
+    if not monitor.wait_until_ready():
+        ...  # monitor.is_open is True
+"""
+import logging
+import time
+import requests
+
+log = logging.getLogger(__name__)
+
+
+class SutHealthMonitor:
+
+    def __init__(self, base_url, health_path="", cold_start_budget=180, probe_timeout=10,
+                 initial_interval=1, max_interval=15, failure_threshold=2, recheck_interval=30):
+        self.url = base_url.rstrip("/") + "/" + health_path.lstrip("/")
+        self.cold_start_budget = cold_start_budget
+        self.probe_timeout = probe_timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.failure_threshold = failure_threshold
+        self.recheck_interval = recheck_interval
+
+        self.cold_start_checked = False
+        self.is_open = False
+        self.open_reason = None
+        self._opened_at = None
+        self._consecutive_failures = 0
+        self.metrics = {
+            "cold_start_seconds": None,
+            "cold_start_probes": 0,
+            "probes": 0,
+            "unhealthy_probes": 0,
+            "breaker_trips": 0,
+            "skipped_tests": 0,
+        }
+
+    def probe(self):
+        """
+        One HTTP GET of the health URL.
+
+        Returns:
+            tuple: (healthy, detail) where detail is the status code or the connection error.
+        """
+        self.metrics["probes"] += 1
+        try:
+            response = requests.get(self.url, timeout=self.probe_timeout, allow_redirects=True)
+            # Render answers 502/503/504 (or drops the connection) while an instance is starting or down
+            healthy = response.status_code < 500
+            detail = response.status_code
+        except requests.RequestException as e:
+            healthy, detail = False, type(e).__name__
+        if not healthy:
+            self.metrics["unhealthy_probes"] += 1
+        log.debug(f"Health probe of {self.url}: {'healthy' if healthy else 'unhealthy'} ({detail})")
+        return healthy, detail
+
+    def wait_until_ready(self):
+        """
+        Waits for the SUT to answer, backing off between probes, for at most cold_start_budget seconds.
+        Records the time it took as the cold start metric. Opens the breaker if the budget runs out.
+
+        Returns:
+            bool: True if the SUT became healthy within the budget.
+        """
+        self.cold_start_checked = True
+        start_time = time.time()
+        interval = self.initial_interval
+        detail = None
+        while True:
+            self.metrics["cold_start_probes"] += 1
+            healthy, detail = self.probe()
+            elapsed = time.time() - start_time
+            if healthy:
+                self.metrics["cold_start_seconds"] = round(elapsed, 2)
+                log.info(f"SUT {self.url} ready after {elapsed:.1f} seconds "
+                         f"({self.metrics['cold_start_probes']} probes).")
+                self._close()
+                return True
+            remaining = self.cold_start_budget - elapsed
+            if remaining <= 0:
+                break
+            log.info(f"SUT {self.url} not ready ({detail}), retrying in {min(interval, remaining):.0f} seconds.")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_interval)
+
+        self.trip(f"SUT {self.url} not ready after the {self.cold_start_budget}s cold start budget (last: {detail})")
+        return False
+
+    def probe_after_failure(self):
+        """Called after a failing test: opens the breaker after failure_threshold unhealthy probes in a row."""
+        if self.is_open:
+            return
+        healthy, detail = self.probe()
+        if healthy:
+            self._consecutive_failures = 0
+            return
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            self.trip(f"SUT {self.url} unhealthy after {self._consecutive_failures} failing tests (last: {detail})")
+
+    def allow(self):
+        """
+        Whether tests may run. While the breaker is open the SUT is re-probed at most
+        every recheck_interval seconds, and a healthy probe closes it.
+        """
+        if not self.is_open:
+            return True
+        if time.time() - self._opened_at >= self.recheck_interval:
+            healthy, _ = self.probe()
+            if healthy:
+                log.info(f"SUT {self.url} is healthy again, closing the breaker.")
+                self._close()
+                return True
+            self._opened_at = time.time()
+        return False
+
+    def trip(self, reason):
+        if not self.is_open:
+            self.metrics["breaker_trips"] += 1
+            log.error(f"Opening SUT breaker: {reason}")
+        self.is_open = True
+        self.open_reason = reason
+        self._opened_at = time.time()
+
+    def _close(self):
+        self.is_open = False
+        self.open_reason = None
+        self._consecutive_failures = 0
@@ -0,0 +1,31 @@
+"""
+@package utilities
+
+Names for the accounts and courses a test creates.
+
+Tests make their users unique with a timestamp. Two browsers running the same
+test at the same moment (the browser matrix) would then sign up the same
+username and email, and one of them fails on "already exists". Each matrix run
+sets QA_ACCOUNT_TAG to its browser, and the tag is appended to every generated
+name. Both browsers share the seeded data (admin user, courses) but never an
+account they created. Without the variable nothing changes.
+
+Example:
+    username = "test_user" + unique_suffix()
+    email = f"P_Teacher_{unique_id}{account_tag()}@kuwaitnet.email"
+"""
+import os
+import re
+import time
+
+ACCOUNT_TAG_ENV = "QA_ACCOUNT_TAG"
+
+
+def account_tag():
+    """The run's account tag, reduced to characters every signup form accepts ("" outside the matrix)."""
+    return re.sub(r"[^a-z0-9]", "", os.environ.get(ACCOUNT_TAG_ENV, "").lower())
+
+
+def unique_suffix():
+    """Seconds timestamp followed by the account tag, e.g. "1760870400firefox"."""
+    return f"{int(time.time())}{account_tag()}"
@@ -0,0 +1,420 @@
+"""
+@package utilities
+
+Test impact selection: run only the tests affected by a change.
+
+Builds a dependency graph from the source with ast (no imports are executed):
+  test method -> page-object methods it calls (self.login_page.login) -> the
+  methods and locators those reach (self.click_element, self.email_input_loctor)
+plus the module import graph. A git diff is mapped to the changed members
+(by line range) and every test that reaches one of them is selected.
+
+Changes to FULL_SUITE_FILES select the whole suite, as does any change to a
+module every test imports (e.g. base/selenium_driver.py) or to a module
+conftest.py imports (directly or not): those reach every test through fixtures
+and hooks, not through the test's own imports. A change to a source module
+that selects no test at all also runs everything, since a module nothing
+reaches is more likely a blind spot of the graph than dead code. The graph is
+cached and rebuilt only when a source file changes.
+
+Example:
+    pytest src/tests --impacted-since origin/dev
+    python src/utilities/test_impact.py --since HEAD~1
+"""
+import argparse
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+
+log = logging.getLogger(__name__)
+
+# Any change here runs everything
+FULL_SUITE_FILES = {
+    "src/base/selenium_driver.py",
+    "src/tests/conftest.py",
+    "pytest.ini",
+    "requirements.txt",
+}
+GRAPH_VERSION = 2
+CONFTEST = "src/tests/conftest.py"
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _source_files(src_root):
+    for directory, dirnames, filenames in os.walk(src_root):
+        dirnames[:] = [d for d in dirnames if d not in ("__pycache__", "benchmarks")]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                yield os.path.join(directory, filename)
+
+
+def _fingerprint(paths):
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class _ModuleInfo:
+    """Classes, members (with line ranges), imports and self-references of one module."""
+
+    def __init__(self, path, relpath, tree, src_root):
+        self.path = relpath
+        self.imports = set()      # relpaths of imported project modules
+        self.names = {}           # local name -> (module relpath, class name)
+        self.classes = {}         # class name -> {"bases", "members", "attr_types", "refs", "strings"}
+        self._src_root = src_root
+        self._collect_imports(tree)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                self._collect_class(node)
+
+    def _module_path(self, dotted):
+        candidate = os.path.join(self._src_root, *dotted.split(".")) + ".py"
+        return os.path.relpath(candidate, os.path.dirname(self._src_root)) if os.path.exists(candidate) else None
+
+    def _collect_imports(self, tree):
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                module = self._module_path(node.module)
+                if module:
+                    self.imports.add(module)
+                    for alias in node.names:
+                        self.names[alias.asname or alias.name] = (module, alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    module = self._module_path(alias.name)
+                    if module:
+                        self.imports.add(module)
+
+    def _collect_class(self, node):
+        info = {"bases": [b.id for b in node.bases if isinstance(b, ast.Name)], "members": {},
+                "attr_types": {}, "refs": {}, "strings": {}}
+        self.classes[node.name] = info
+        for item in node.body:
+            end = getattr(item, "end_lineno", item.lineno)
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                info["members"][item.name] = [item.lineno, end]
+                info["refs"][item.name] = sorted(self._self_references(item))
+                info["strings"][item.name] = sorted({c.value for c in ast.walk(item)
+                                                     if isinstance(c, ast.Constant) and isinstance(c.value, str)
+                                                     and c.value.isidentifier()})
+                for target, class_name in self._typed_self_attributes(item):
+                    info["attr_types"][target] = class_name
+                if item.name == "__init__":
+                    # Locators assigned in __init__ are members in their own right
+                    for stmt in ast.walk(item):
+                        if isinstance(stmt, ast.Assign):
+                            for target in stmt.targets:
+                                if self._is_self_attribute(target):
+                                    info["members"].setdefault(target.attr, [stmt.lineno, stmt.end_lineno])
+                                    info["refs"].setdefault(target.attr, [])
+            elif isinstance(item, (ast.Assign, ast.AnnAssign)):
+                targets = item.targets if isinstance(item, ast.Assign) else [item.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        info["members"][target.id] = [item.lineno, end]
+                        info["refs"][target.id] = []
+
+    @staticmethod
+    def _is_self_attribute(node):
+        return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+
+    def _self_references(self, function):
+        # self.x and self.x.y (the latter recorded as "x.y" so it can be resolved through attr_types)
+        refs = set()
+        for node in ast.walk(function):
+            if isinstance(node, ast.Attribute):
+                if self._is_self_attribute(node.value):
+                    refs.add(f"{node.value.attr}.{node.attr}")
+                elif self._is_self_attribute(node):
+                    refs.add(node.attr)
+        return refs
+
+    def _typed_self_attributes(self, function):
+        # self.login_page = LoginPage(...)
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                    and isinstance(node.value.func, ast.Name):
+                for target in node.targets:
+                    if self._is_self_attribute(target):
+                        yield target.attr, node.value.func.id
+
+
+class ImpactGraph:
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def build(cls, src_root):
+        src_root = os.path.abspath(src_root)
+        repo_root = os.path.dirname(src_root)
+        modules = {}
+        for path in _source_files(src_root):
+            relpath = os.path.relpath(path, repo_root)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    tree = ast.parse(f.read(), filename=path)
+            except (SyntaxError, UnicodeDecodeError) as e:
+                log.warning(f"Skipping {relpath} in the impact graph: {e}")
+                continue
+            modules[relpath] = _ModuleInfo(path, relpath, tree, src_root)
+
+        members = {}
+        for relpath, module in modules.items():
+            for class_name, info in module.classes.items():
+                for member, lines in info["members"].items():
+                    members[f"{relpath}::{class_name}::{member}"] = lines
+
+        tests = {}
+        for relpath, module in modules.items():
+            # Only src/tests holds tests; utilities/test_impact.py and friends are not test modules
+            in_tests_dir = os.path.relpath(os.path.join(repo_root, relpath), src_root).split(os.sep)[0] == "tests"
+            if not in_tests_dir or not os.path.basename(relpath).startswith("test_"):
+                continue
+            for class_name, info in module.classes.items():
+                for member in info["members"]:
+                    if member.startswith("test"):
+                        reached = set()
+                        cls._reach(modules, relpath, class_name, member, reached)
+                        tests[f"{relpath}::{class_name}::{member}"] = {
+                            "members": sorted(reached),
+                            "modules": sorted(cls._import_closure(modules, relpath)),
+                        }
+
+        return cls({
+            "version": GRAPH_VERSION,
+            "members": members,
+            "tests": tests,
+            "modules": sorted(modules),
+            "conftest_modules": sorted(cls._import_closure(modules, CONFTEST)),
+        })
+
+    @staticmethod
+    def _resolve_class(modules, module_path, class_name):
+        """Finds where class_name (as seen from module_path) is defined. Returns (module relpath, class name)."""
+        module = modules.get(module_path)
+        if module is None:
+            return None
+        if class_name in module.classes:
+            return module_path, class_name
+        if class_name in module.names:
+            target_module, target_name = module.names[class_name]
+            if target_module != module_path:
+                return ImpactGraph._resolve_class(modules, target_module, target_name)
+        return None
+
+    @staticmethod
+    def _resolve_member(modules, module_path, class_name, member):
+        """Looks member up in the class and its bases. Returns (module relpath, class name) or None."""
+        seen = set()
+        pending = [(module_path, class_name)]
+        while pending:
+            key = pending.pop(0)
+            if key in seen or key[0] not in modules:
+                continue
+            seen.add(key)
+            info = modules[key[0]].classes.get(key[1])
+            if info is None:
+                continue
+            if member in info["members"]:
+                return key
+            for base in info["bases"]:
+                resolved = ImpactGraph._resolve_class(modules, key[0], base)
+                if resolved:
+                    pending.append(resolved)
+        return None
+
+    @staticmethod
+    def _attribute_types(modules, module_path, class_name):
+        types = {}
+        for key in ImpactGraph._class_chain(modules, module_path, class_name):
+            for attr, type_name in modules[key[0]].classes[key[1]]["attr_types"].items():
+                resolved = ImpactGraph._resolve_class(modules, key[0], type_name)
+                if resolved:
+                    types.setdefault(attr, resolved)
+        return types
+
+    @staticmethod
+    def _class_chain(modules, module_path, class_name):
+        chain, pending = [], [(module_path, class_name)]
+        while pending:
+            key = pending.pop(0)
+            if key in chain or key[0] not in modules or key[1] not in modules[key[0]].classes:
+                continue
+            chain.append(key)
+            for base in modules[key[0]].classes[key[1]]["bases"]:
+                resolved = ImpactGraph._resolve_class(modules, key[0], base)
+                if resolved:
+                    pending.append(resolved)
+        return chain
+
+    @classmethod
+    def _reach(cls, modules, module_path, class_name, member, reached):
+        owner = cls._resolve_member(modules, module_path, class_name, member)
+        if owner is None:
+            return
+        node = f"{owner[0]}::{owner[1]}::{member}"
+        if node in reached:
+            return
+        reached.add(node)
+        info = modules[owner[0]].classes[owner[1]]
+        attr_types = cls._attribute_types(modules, module_path, class_name)
+        for ref in info["refs"].get(member, []):
+            if "." in ref:
+                attr, attr_member = ref.split(".", 1)
+                if attr in attr_types:
+                    cls._reach(modules, *attr_types[attr], attr_member, reached)
+                    continue
+                ref = attr
+            cls._reach(modules, module_path, class_name, ref, reached)
+        # Names passed as strings (getattr-style, e.g. the locator audit's "only" lists)
+        for text in info["strings"].get(member, []):
+            for target in attr_types.values():
+                if cls._resolve_member(modules, *target, text):
+                    cls._reach(modules, *target, text, reached)
+
+    @staticmethod
+    def _import_closure(modules, module_path):
+        closure, pending = set(), [module_path]
+        while pending:
+            current = pending.pop()
+            if current in closure or current not in modules:
+                continue
+            closure.add(current)
+            pending.extend(modules[current].imports)
+        return closure
+
+    @classmethod
+    def load(cls, src_root, cache_file=None):
+        """Returns the cached graph if no source file changed since it was built, otherwise rebuilds it."""
+        fingerprint = _fingerprint(_source_files(os.path.abspath(src_root)))
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("fingerprint") == fingerprint and cached.get("version") == GRAPH_VERSION:
+                    return cls(cached)
+            except ValueError:
+                pass
+        graph = cls.build(src_root)
+        graph.data["fingerprint"] = fingerprint
+        if cache_file:
+            os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump(graph.data, f, separators=(",", ":"))
+        return graph
+
+    def select(self, changes):
+        """
+        Args:
+            changes (dict): {repo-relative path: set of changed line numbers (new file), or None for the whole file}
+
+        Returns:
+            set: Selected test ids ("path::Class::test"), or None when the full suite must run.
+        """
+        full = FULL_SUITE_FILES.union(self.data["conftest_modules"]).intersection(changes)
+        if full:
+            log.info(f"Impact selection: {', '.join(sorted(full))} changed, running the full suite.")
+            return None
+
+        changed_members, changed_modules = set(), set()
+        for path, lines in changes.items():
+            if not path.endswith(".py"):
+                continue
+            file_members = {node: span for node, span in self.members.items() if node.startswith(path + "::")}
+            if lines is None:
+                changed_modules.add(path)
+                continue
+            for line in lines:
+                hits = [node for node, (start, end) in file_members.items() if start <= line <= end]
+                if hits:
+                    changed_members.update(hits)
+                else:
+                    # Imports, module constants, class headers: anything in the module may be affected
+                    changed_modules.add(path)
+
+        selected = set()
+        for test_id, deps in self.tests.items():
+            test_file = test_id.split("::", 1)[0]
+            if test_file in changed_modules or test_file in changes \
+                    or changed_members.intersection(deps["members"]) \
+                    or changed_modules.intersection(deps["modules"]):
+                selected.add(test_id)
+        if not selected:
+            changed_sources = sorted(set(self.data["modules"]).intersection(changes))
+            if changed_sources:
+                log.info(f"Impact selection: {', '.join(changed_sources)} changed but reach no test, "
+                         f"running the full suite.")
+                return None
+        log.info(f"Impact selection: {len(selected)} of {len(self.tests)} tests affected.")
+        return selected
+
+    @property
+    def members(self):
+        return self.data["members"]
+
+    @property
+    def tests(self):
+        return self.data["tests"]
+
+
+def changed_lines(since, repo_root):
+    """
+    Parses `git diff -U0 <since>` (committed and uncommitted changes).
+
+    Returns:
+        dict: {repo-relative path: set of new-file line numbers, or None if the file was deleted}
+    """
+    output = subprocess.check_output(["git", "diff", "-U0", "--no-color", since, "--"],
+                                     cwd=repo_root, text=True)
+    changes, current, old_path = {}, None, None
+    for line in output.splitlines():
+        if line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            if line.startswith("+++ b/"):
+                current = line[6:]
+                changes.setdefault(current, set())
+            else:
+                current = None
+                if old_path:
+                    changes[old_path] = None
+        elif current and line.startswith("@@"):
+            match = HUNK_HEADER.match(line)
+            if match:
+                start = int(match.group(3))
+                count = int(match.group(4)) if match.group(4) is not None else 1
+                # A pure deletion (count 0) touches the member around the deleted lines
+                changes[current].update(range(start, start + max(count, 1)))
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the tests affected by changes since a git revision.")
+    parser.add_argument("--since", default="HEAD", help="Git revision to diff against (default: uncommitted changes)")
+    parser.add_argument("--src", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+    parser.add_argument("--cache", default=None, help="Graph cache file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    src_root = os.path.abspath(args.src)
+    graph = ImpactGraph.load(src_root, args.cache)
+    selected = graph.select(changed_lines(args.since, os.path.dirname(src_root)))
+    if selected is None:
+        print(os.path.relpath(os.path.join(src_root, "tests"), os.getcwd()))
+    else:
+        for test_id in sorted(selected):
+            print(test_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+@package utilities
+
+TraceRecorder class implementation
+
+A lightweight failure trace instead of (or next to) screenshots. Every
+SeleniumDriver action recorded by logged_action also goes into an in-memory
+ring buffer of the last N actions. Each entry holds the action, the URL and
+title after it, the console messages since the previous entry and a
+zlib-compressed snapshot of the DOM. A MutationObserver in the page marks the
+document dirty, so the DOM is only serialized and sent after it changed.
+
+Nothing is written for passing tests. When a test fails, its buffer is written
+as one gzipped JSON file: the oldest DOM in full and every later one as a
+delta against the previous snapshot, so any step can be rebuilt and diffed.
+
+Console messages are caught by a hook the snapshot script installs in each
+document, so messages logged before the first action on a page are missed.
+
+Example:
+    pytest src/tests --failure-trace 30 --failure-trace-dir test-results/traces
+    python src/utilities/trace_recorder.py test-results/traces/<test>.trace.json.gz
+    python src/utilities/trace_recorder.py <trace> --diff 7
+    python src/utilities/trace_recorder.py <trace> --dom 7 --out step7.html
+"""
+import argparse
+import collections
+import difflib
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 30
+
+
+def _tokens(html):
+    # One token per tag so deltas stay small when the markup is on a single line
+    return re.split(r"(?<=>)", html)
+
+
+def _delta(old_tokens, new_tokens):
+    """[[start, end, replacement tokens], ...] turning old_tokens into new_tokens."""
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    return [[i1, i2, new_tokens[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def _apply_delta(tokens, delta):
+    tokens = list(tokens)
+    for start, end, replacement in reversed(delta):
+        tokens[start:end] = replacement
+    return tokens
+
+
+class TraceRecorder:
+
+    def __init__(self, directory, capacity=DEFAULT_CAPACITY):
+        self.directory = directory
+        self.capacity = capacity
+        self._entries = collections.deque(maxlen=capacity)
+        self._last_dom = None
+        # The trio facade drives page objects from worker threads
+        self._lock = threading.Lock()
+        self.stats = {"recorded": 0, "snapshot_ms_total": 0.0, "traces": 0}
+
+    def record(self, page, record):
+        """logged_action listener: snapshots the page after the action and adds an entry."""
+        # Imported here so the command line viewer runs without src/ on sys.path
+        from base.js_locators import TRACE_SNAPSHOT_JS
+        start_time = time.perf_counter()
+        entry = dict(record)
+        try:
+            snapshot = page.driver.execute_script(TRACE_SNAPSHOT_JS) or {}
+        except Exception as e:
+            # No document to read (alert open, window closed, session gone): keep the action anyway
+            snapshot = {"error": str(e).splitlines()[0] if str(e) else type(e).__name__}
+        with self._lock:
+            if snapshot.get("html") is not None:
+                self._last_dom = zlib.compress(snapshot["html"].encode("utf-8"), 1)
+            entry.update(url=snapshot.get("url"), title=snapshot.get("title"),
+                         console=snapshot.get("console") or [], snapshot_error=snapshot.get("error"))
+            # Unchanged documents share the previous compressed bytes
+            entry["dom"] = self._last_dom
+            self._entries.append(entry)
+            self.stats["recorded"] += 1
+            self.stats["snapshot_ms_total"] += (time.perf_counter() - start_time) * 1000
+
+    def clear(self):
+        """Starts a new test. The last DOM is kept so the next snapshot can still be compared."""
+        with self._lock:
+            self._entries.clear()
+
+    def flush(self, test_id, reason=None):
+        """
+        Writes the buffered entries of a failed test.
+
+        Returns:
+            str: Path of the trace file, or None if nothing was recorded.
+        """
+        with self._lock:
+            entries = list(self._entries)
+            self._entries.clear()
+        if not entries:
+            return None
+
+        steps = []
+        previous_dom, previous_tokens = None, None
+        for number, entry in enumerate(entries, start=1):
+            step = {key: value for key, value in entry.items() if key != "dom"}
+            step["step"] = number
+            dom = entry["dom"]
+            if dom is not None and dom is not previous_dom:
+                tokens = _tokens(zlib.decompress(dom).decode("utf-8"))
+                if previous_tokens is None:
+                    step["dom"] = "".join(tokens)
+                else:
+                    step["dom_delta"] = _delta(previous_tokens, tokens)
+                previous_dom, previous_tokens = dom, tokens
+            steps.append(step)
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", test_id).strip("_")[:150]
+        path = os.path.join(self.directory, f"{name}.trace.json.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"test": test_id, "reason": reason, "written_at": round(time.time(), 3),
+                       "steps": steps}, f, separators=(",", ":"), default=str)
+        self.stats["traces"] += 1
+        log.info(f"Failure trace for {test_id}: {path} ({len(steps)} steps)")
+        return path
+
+
+def load_trace(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dom_at(trace, step_number):
+    """Rebuilds the DOM as it was after the given step (None if no snapshot was taken by then)."""
+    tokens = None
+    for step in trace["steps"][:step_number]:
+        if "dom" in step:
+            tokens = _tokens(step["dom"])
+        elif "dom_delta" in step:
+            tokens = _apply_delta(tokens, step["dom_delta"])
+    return None if tokens is None else "".join(tokens)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show a failure trace written by --failure-trace.")
+    parser.add_argument("trace", help="Trace file (.trace.json.gz)")
+    parser.add_argument("--diff", type=int, default=None, help="Print the DOM diff between step N-1 and step N")
+    parser.add_argument("--dom", type=int, default=None, help="Rebuild the DOM after step N")
+    parser.add_argument("--out", default=None, help="Write the rebuilt DOM to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    trace = load_trace(args.trace)
+    if args.dom is not None:
+        html = dom_at(trace, args.dom) or ""
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(html)
+        else:
+            print(html)
+        return 0
+    if args.diff is not None:
+        before = (dom_at(trace, args.diff - 1) or "").replace(">", ">\n").splitlines(keepends=True)
+        after = (dom_at(trace, args.diff) or "").replace(">", ">\n").splitlines(keepends=True)
+        sys.stdout.writelines(difflib.unified_diff(before, after, f"step {args.diff - 1}", f"step {args.diff}"))
+        return 0
+
+    print(f"{trace['test']}: {trace.get('reason') or ''}".strip())
+    for step in trace["steps"]:
+        dom = "dom" if "dom" in step else f"delta({len(step['dom_delta'])})" if "dom_delta" in step else "-"
+        print(f"{step['step']:>3} {step.get('outcome', ''):<5} {step.get('duration_ms', 0):>8} ms  "
+              f"{step.get('page')}.{step.get('method')} {step.get('action')} {step.get('locator') or ''}  "
+              f"[{dom}] {step.get('url') or step.get('snapshot_error') or ''}")
+        for message in step.get("console", []):
+            print(f"      console.{message['level']}: {message['text']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())